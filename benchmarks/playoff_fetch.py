@@ -0,0 +1,83 @@
+"""
+Compare the TeamGameFinder fetch strategies (one box score per game vs. one
+bulk PlayerGameLogs call) on the same teams and seasons.
+
+Responses are replayed from the nba_api disk cache given by --cache-path; run
+once with --record to fill it from stats.nba.com, then benchmark offline:
+
+    python -m benchmarks.playoff_fetch 2023-24 BOS DAL MIN DAL --record
+    python -m benchmarks.playoff_fetch 2023-24 BOS DAL MIN DAL --repeat 5
+"""
+import argparse
+import time
+from pathlib import Path
+
+from nba_playoff_stats_visualizer import playoff_stats_finder
+from nba_playoff_stats_visualizer.playoff_stats_finder import FETCH_STRATEGIES, TeamGameFinder
+from nba_playoff_stats_visualizer.response_cache import CACHE_DIR, ResponseCache
+
+DEFAULT_RECORDING_PATH = CACHE_DIR / "benchmark_responses.sqlite3"
+
+
+def _stat_lines(player_stats) -> set:
+    """(player, date, points, rebounds, assists, threes, minutes) of every game a player got on the floor"""
+    return {(player_name, game.game_date, game.points, game.rebounds, game.assists, game.threes_made,
+             round(game.minutes, 1))
+            for player_name, games in player_stats.items() for game in games
+            if game.points or game.rebounds or game.assists or game.minutes > 0}
+
+
+def _time_strategy(strategy: str, teams: list[str], season: str, repeat: int) -> tuple[float, int, set]:
+    """Best-of-repeat wall time, nba_api calls per run and the stat lines fetched"""
+    calls = 0
+    fetch_nba_api = playoff_stats_finder.fetch_nba_api
+
+    def counting_fetch(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return fetch_nba_api(*args, **kwargs)
+
+    playoff_stats_finder.fetch_nba_api = counting_fetch
+    try:
+        best = float('inf')
+        stat_lines = set()
+        for _ in range(repeat):
+            calls = 0
+            start = time.perf_counter()
+            stat_lines = set().union(*(_stat_lines(TeamGameFinder.get_team_games(team, season, strategy))
+                                       for team in teams))
+            best = min(best, time.perf_counter() - start)
+        return best, calls, stat_lines
+    finally:
+        playoff_stats_finder.fetch_nba_api = fetch_nba_api
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark TeamGameFinder fetch strategies")
+    parser.add_argument("season", help='Season, e.g. 2023-24')
+    parser.add_argument("teams", nargs="+", help="Team abbreviations, e.g. BOS DAL")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cache-path", type=Path, default=DEFAULT_RECORDING_PATH,
+                        help="Disk cache holding the recorded responses")
+    parser.add_argument("--record", action="store_true",
+                        help="Fetch missing responses from stats.nba.com into the cache")
+    args = parser.parse_args()
+
+    playoff_stats_finder.NBA_API_CACHE = ResponseCache(args.cache_path)
+    if args.record:
+        for strategy in FETCH_STRATEGIES:
+            for team in args.teams:
+                TeamGameFinder.get_team_games(team, args.season, strategy)
+        print(f"Recorded responses to {args.cache_path}")
+
+    results = {strategy: _time_strategy(strategy, args.teams, args.season, args.repeat)
+               for strategy in FETCH_STRATEGIES}
+
+    print(f"{len(args.teams)} teams, {args.season} playoffs, best of {args.repeat}")
+    for strategy, (seconds, calls, stat_lines) in results.items():
+        print(f"{strategy:<18} {seconds * 1000:8.1f} ms  {calls:4d} nba_api calls  {len(stat_lines)} stat lines")
+
+    box_score_lines, game_log_lines = (results[strategy][2] for strategy in FETCH_STRATEGIES)
+    if box_score_lines != game_log_lines:
+        print(f"WARNING: {len(box_score_lines - game_log_lines)} stat lines only in box scores, "
+              f"{len(game_log_lines - box_score_lines)} only in game logs")
@@ -0,0 +1,255 @@
+"""
+Query-plan regression check for the hot repository queries.
+
+Loads synthetic data into a scratch schema of a local Postgres, runs the
+real repository methods, EXPLAINs every statement they issue and exits
+with status 1 if any of them falls back to a sequential scan on a hot table,
+or if a query the covering index is meant for does not use an index-only scan:
+
+    python -m benchmarks.query_plans --connection-string postgresql://localhost/odds_dev
+
+The scratch schema is dropped afterwards unless --keep is given.
+"""
+import argparse
+import json
+import random
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, event, insert, text
+
+from betting_odds.data_access.odds_repository import OddsRepository
+from betting_odds.data_access.stats_repository import StatsRepository
+from betting_odds.models.matchup import Matchup
+from betting_odds.models.orm_models import EventORM, GameStatsORM, PlayerORM, PlayerPropORM
+from betting_odds.services.player_stats_service import PlayerStatsService
+from database.database import Database
+from database.migrations import migrate
+
+# Tables that must never be read with a sequential scan by a hot query. players
+# is left out: it holds one row per player, and scanning or hashing it whole is
+# the planner's best choice at any realistic roster size
+HOT_TABLES = {'player_props', 'current_player_props', 'game_stats'}
+
+# Hot queries whose game_stats columns are all carried by the covering index,
+# and which must therefore read it with an index-only scan
+INDEX_ONLY_QUERIES = {'stats for a slate': 'game_stats'}
+
+SEASON_TYPE = 'Regular Season'
+SEASONS = ['2022', '2023', '2024', '2025']
+PROP_TYPES = ['Points', 'Rebounds', 'Assists', 'Three Pointers Made']
+BOOKMAKERS = ['fanduel', 'draftkings', 'betmgm', 'caesars', 'pointsbet']
+
+
+def _insert_chunked(conn, table, rows: list[dict], chunk_size: int = 5000):
+    """Insert rows in executemany batches"""
+    for start in range(0, len(rows), chunk_size):
+        conn.execute(insert(table), rows[start:start + chunk_size])
+
+
+def load_synthetic_data(database: Database, players: int, games: int, events: int, jobs: int):
+    """
+    Fill the scratch schema with a league's worth of players, game logs and
+    odds snapshots
+
+    Args:
+        database: Database routed to the scratch schema
+        players: Number of players
+        games: Games per player per season
+        events: Number of events with props
+        jobs: Collection jobs (snapshots) per event
+    """
+    rnd = random.Random(42)
+    now = datetime.now(timezone.utc)
+
+    player_rows = [{'player_id': i, 'name': f'Player {i}', 'team': f'Team {i % 30}'}
+                   for i in range(1, players + 1)]
+
+    game_rows = []
+    for player in player_rows:
+        for season_index, season in enumerate(SEASONS):
+            season_start = date(2022 + season_index, 5, 1)
+            for game in range(games):
+                game_rows.append({
+                    'player_id': player['player_id'],
+                    'game_id': f'{season}{game:04d}',
+                    'game_date': season_start + timedelta(days=game),
+                    'matchup': f"T{player['player_id'] % 30} {'@' if game % 2 else 'vs.'} OPP",
+                    'season': season,
+                    'season_type': SEASON_TYPE,
+                    'points': rnd.randint(0, 35),
+                    'assists': rnd.randint(0, 10),
+                    'rebounds': rnd.randint(0, 14),
+                    'three_pointers_made': rnd.randint(0, 6),
+                    'minutes': rnd.randint(0, 40),
+                })
+
+    event_rows = []
+    prop_rows = []
+    for event_index in range(events):
+        commence_time = now + timedelta(hours=event_index - events // 2)
+        event_id = f'event_{event_index}'
+        event_rows.append({
+            'id': event_id, 'sport_key': 'basketball', 'commence_time_utc': commence_time,
+            'home_team': 'Home', 'away_team': 'Away', 'derived_game_name': f'Away @ Home {event_index}',
+        })
+        event_players = rnd.sample(player_rows, 16)
+        for job in range(jobs):
+            job_start_time = commence_time - timedelta(hours=6 * (jobs - job))
+            for player in event_players:
+                for prop_type in PROP_TYPES[:2]:
+                    for bookmaker in BOOKMAKERS:
+                        prop_rows.append({
+                            'game_id': event_id,
+                            'game_start_time_utc': commence_time,
+                            'player_name': player['name'],
+                            'prop_type': prop_type,
+                            'line': rnd.choice([4.5, 9.5, 14.5, 19.5, 24.5]),
+                            'over_odds': round(rnd.uniform(1.6, 2.4), 2),
+                            'under_odds': round(rnd.uniform(1.6, 2.4), 2),
+                            'bookmaker': bookmaker,
+                            'odds_collection_time_utc': job_start_time,
+                            'job_start_time_utc': job_start_time,
+                        })
+
+    with database.engine.begin() as conn:
+        _insert_chunked(conn, PlayerORM.__table__, player_rows)
+        _insert_chunked(conn, GameStatsORM.__table__, game_rows)
+        _insert_chunked(conn, EventORM.__table__, event_rows)
+        # Oldest snapshots first, like the collector, so the trigger keeps current_player_props
+        _insert_chunked(conn, PlayerPropORM.__table__,
+                        sorted(prop_rows, key=lambda row: row['job_start_time_utc']))
+
+    with database.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"ANALYZE {database.schema}.player_props"))
+        conn.execute(text(f"ANALYZE {database.schema}.current_player_props"))
+        # VACUUM sets the visibility map, without which index-only scans still visit the heap
+        conn.execute(text(f"VACUUM ANALYZE {database.schema}.game_stats"))
+        conn.execute(text(f"ANALYZE {database.schema}.players"))
+
+    return event_rows, player_rows
+
+
+def hot_queries(database: Database, sample_events: list[dict], sample_players: list[dict]) -> dict:
+    """The repository calls the pages make on every render, by name"""
+    odds_repository = OddsRepository(database)
+    stats_repository = StatsRepository(database)
+    player_stats_service = PlayerStatsService(database)
+    sample_event = sample_events[0]
+    slate_game_ids = [event_row['id'] for event_row in sample_events]
+    matchup = Matchup(game_id=sample_event['id'], commence_time_utc=sample_event['commence_time_utc'],
+                      derived_game_name=sample_event['derived_game_name'],
+                      home_team=sample_event['home_team'], away_team=sample_event['away_team'])
+    player_names = [player['name'] for player in sample_players]
+
+    return {
+        'latest props for game': lambda: odds_repository.get_latest_props_for_game(matchup),
+        'latest odds update time': lambda: odds_repository.get_latest_odds_update_time(matchup),
+        'latest props for slate': lambda: odds_repository.get_latest_props_for_games(slate_game_ids),
+        'best odds for slate': lambda: odds_repository.get_best_odds_for_games(slate_game_ids),
+        'props frame for slate': lambda: odds_repository.get_latest_props_frame(slate_game_ids),
+        'latest job time for slate': lambda: odds_repository.get_latest_job_start_time(slate_game_ids),
+        'stats for a slate': lambda: player_stats_service.query_players_stats_frame(
+            player_names, SEASONS[-1], SEASON_TYPE),
+        'stats for one player': lambda: stats_repository.query_player_stats(
+            player_names[0], SEASONS[-1], SEASON_TYPE, min_minutes=10),
+        'all seasons for one player': lambda: stats_repository.query_all_player_stats(
+            player_names[0], SEASON_TYPE),
+        # Matchups are generated as "T<n> @ OPP", so T1 is one of the synthetic teams
+        'stats for a team': lambda: stats_repository.query_team_stats('T1', SEASONS[-1], SEASON_TYPE),
+    }
+
+
+def _seq_scans(plan: dict) -> list[str]:
+    """Hot tables read with a sequential scan anywhere in an EXPLAIN plan tree"""
+    found = []
+    if plan.get('Node Type') == 'Seq Scan' and plan.get('Relation Name') in HOT_TABLES:
+        found.append(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+def _index_only_scans(plan: dict) -> list[str]:
+    """Tables read with an index-only scan anywhere in an EXPLAIN plan tree"""
+    found = []
+    if plan.get('Node Type') == 'Index Only Scan':
+        found.append(plan.get('Relation Name'))
+    for child in plan.get('Plans', []):
+        found.extend(_index_only_scans(child))
+    return found
+
+
+def check_query_plans(database: Database, queries: dict) -> list[str]:
+    """
+    Run each hot query, EXPLAIN every statement it issued and collect failures
+
+    Returns:
+        Human readable failure messages; empty when every plan uses indexes
+    """
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            captured.append((statement, parameters))
+
+    failures = []
+    for name, run_query in queries.items():
+        captured.clear()
+        event.listen(database.engine, 'before_cursor_execute', capture)
+        try:
+            run_query()
+        finally:
+            event.remove(database.engine, 'before_cursor_execute', capture)
+
+        for statement, parameters in captured:
+            with database.engine.connect() as conn:
+                plan = conn.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            seq_scans = _seq_scans(plan[0]['Plan'])
+            status = 'FAIL' if seq_scans else 'ok'
+            print(f"[{status}] {name}: total cost {plan[0]['Plan']['Total Cost']}")
+            if seq_scans:
+                failures.append(f"{name}: sequential scan on {', '.join(sorted(set(seq_scans)))}")
+            index_only_table = INDEX_ONLY_QUERIES.get(name)
+            if index_only_table and index_only_table not in _index_only_scans(plan[0]['Plan']):
+                print(f"[FAIL] {name}: no index-only scan on {index_only_table}")
+                failures.append(f"{name}: {index_only_table} not read with an index-only scan")
+
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if a hot query uses a sequential scan")
+    parser.add_argument("--connection-string", required=True,
+                        help="Local Postgres to load synthetic data into")
+    parser.add_argument("--schema", default="query_plan_check", help="Scratch schema (dropped first)")
+    parser.add_argument("--players", type=int, default=500)
+    parser.add_argument("--games", type=int, default=40, help="Games per player per season")
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=12, help="Odds snapshots per event")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema afterwards")
+    args = parser.parse_args()
+
+    engine = create_engine(args.connection_string, connect_args={"options": "-c timezone=utc"})
+    scratch_database = Database(engine=engine, schema=args.schema)
+
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {args.schema} CASCADE"))
+    try:
+        migrate(scratch_database)
+        events_loaded, players_loaded = load_synthetic_data(
+            scratch_database, args.players, args.games, args.events, args.jobs)
+        plan_failures = check_query_plans(
+            scratch_database, hot_queries(scratch_database, events_loaded[:10], players_loaded[:30]))
+    finally:
+        if not args.keep:
+            with engine.begin() as connection:
+                connection.execute(text(f"DROP SCHEMA IF EXISTS {args.schema} CASCADE"))
+
+    if plan_failures:
+        print("\n".join(plan_failures))
+        sys.exit(1)
+    print("All hot queries use index access paths")
@@ -0,0 +1,80 @@
+"""
+Compare the columnar StatsRepository fetch with the previous ORM hydration path.
+
+Read-only; runs against the configured database:
+
+    python -m benchmarks.stats_fetch wnba --players 30 --repeat 5
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from betting_odds.data_access.stats_repository import StatsRepository
+from betting_odds.models.orm_models import GameStatsORM, PlayerORM
+from database.utils import get_database
+
+
+def query_all_player_stats_orm(database, player_name: str, season_type: str) -> pd.DataFrame:
+    """The pre-columnar implementation: full ORM objects and one dict per row"""
+    session = database.get_session()
+    try:
+        results = (session.query(GameStatsORM).join(PlayerORM)
+                   .filter(PlayerORM.name == player_name)
+                   .filter(GameStatsORM.season_type == season_type)
+                   .all())
+        data = []
+        for game in results:
+            data.append({
+                'player_name': player_name,
+                'player_id': game.player_id,
+                'game_id': game.game_id,
+                'game_date': game.game_date,
+                'matchup': game.matchup,
+                'season': game.season,
+                'season_type': game.season_type,
+                'points': game.points,
+                'assists': game.assists,
+                'rebounds': game.rebounds,
+                'three_pointers_made': game.three_pointers_made,
+                'minutes': game.minutes,
+            })
+        return pd.DataFrame(data)
+    finally:
+        session.close()
+
+
+def _time_it(fetch, player_names: list[str], repeat: int) -> tuple[float, int]:
+    """Best-of-repeat wall time for fetching every player, and the rows fetched"""
+    best = float('inf')
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = sum(len(fetch(player_name)) for player_name in player_names)
+        best = min(best, time.perf_counter() - start)
+    return best, rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark StatsRepository fetch paths")
+    parser.add_argument("schema", help="League schema, e.g. nba or wnba")
+    parser.add_argument("--season-type", default="Regular Season")
+    parser.add_argument("--players", type=int, default=30, help="Number of players to fetch")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    database = get_database(args.schema)
+    stats_repository = StatsRepository(database)
+    names = sorted(stats_repository.query_team_for_all_players())[:args.players]
+
+    orm_seconds, orm_rows = _time_it(
+        lambda name: query_all_player_stats_orm(database, name, args.season_type), names, args.repeat)
+    columnar_seconds, columnar_rows = _time_it(
+        lambda name: stats_repository.query_all_player_stats(name, args.season_type), names, args.repeat)
+
+    print(f"{len(names)} players, {columnar_rows} rows, best of {args.repeat}")
+    print(f"ORM hydration: {orm_seconds * 1000:8.1f} ms")
+    print(f"Columnar:      {columnar_seconds * 1000:8.1f} ms "
+          f"({orm_seconds / columnar_seconds:.1f}x)")
+    if orm_rows != columnar_rows:
+        print(f"WARNING: row counts differ ({orm_rows} vs {columnar_rows})")
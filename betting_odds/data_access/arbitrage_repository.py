@@ -0,0 +1,72 @@
+import logging
+
+import pandas as pd
+from sqlalchemy import delete, insert, select
+
+from betting_odds.models.orm_models import ArbitrageOpportunityORM
+
+logger = logging.getLogger(__name__)
+
+# Columns written by the scanner and returned to the pages, in DataFrame order
+OPPORTUNITY_COLUMNS = ['game_id', 'player_name', 'prop_type', 'kind',
+                       'over_line', 'over_bookmaker', 'over_odds',
+                       'under_line', 'under_bookmaker', 'under_odds',
+                       'combined_implied_probability', 'job_start_time_utc']
+
+_NUMERIC_COLUMNS = ['over_line', 'over_odds', 'under_line', 'under_odds', 'combined_implied_probability']
+
+
+class ArbitrageRepository:
+    """SQLAlchemy implementation of the arbitrage opportunities repository."""
+
+    def __init__(self, database):
+        self.database = database
+
+    def replace_opportunities(self, opportunities_df: pd.DataFrame) -> None:
+        """
+        Replace all stored opportunities with a new scan, in one transaction
+        so readers never see a half-written table
+
+        Args:
+            opportunities_df: DataFrame with OPPORTUNITY_COLUMNS
+        """
+        records = opportunities_df[OPPORTUNITY_COLUMNS].to_dict('records')
+        session = self.database.get_session()
+
+        try:
+            session.execute(delete(ArbitrageOpportunityORM))
+            if records:
+                session.execute(insert(ArbitrageOpportunityORM), records)
+            session.commit()
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error replacing {len(records)} arbitrage opportunities: {e}")
+            raise
+
+        finally:
+            session.close()
+
+    def get_opportunities(self) -> pd.DataFrame:
+        """
+        Returns:
+            DataFrame with OPPORTUNITY_COLUMNS of the last scan, lowest
+            combined implied probability (best) first
+        """
+        columns = [getattr(ArbitrageOpportunityORM, name) for name in OPPORTUNITY_COLUMNS]
+        query = select(*columns).order_by(ArbitrageOpportunityORM.combined_implied_probability)
+        session = self.database.get_session()
+
+        try:
+            rows = session.execute(query).all()
+            opportunities_df = pd.DataFrame.from_records(rows, columns=OPPORTUNITY_COLUMNS)
+            # Numeric columns come back as Decimal
+            opportunities_df[_NUMERIC_COLUMNS] = opportunities_df[_NUMERIC_COLUMNS].astype(float)
+            return opportunities_df
+
+        except Exception as e:
+            logger.error(f"Error getting arbitrage opportunities: {e}")
+            raise
+
+        finally:
+            session.close()
@@ -2,10 +2,12 @@ import logging
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import func
+import pandas as pd
+from sqlalchemy import Float, cast, func, literal, select, union_all
 
 from betting_odds.models.matchup import Matchup
-from betting_odds.models.orm_models import PlayerPropORM
+from betting_odds.models.matchup_props import BestLineOdds
+from betting_odds.models.orm_models import CurrentPlayerPropORM, PlayerPropORM
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +18,7 @@ class OddsRepository:
     def __init__(self, database):
         self.database = database
 
-    def get_latest_props_for_game(self, game: Matchup) -> list[PlayerPropORM]:
+    def get_latest_props_for_game(self, game: Matchup) -> list[CurrentPlayerPropORM]:
         """
         Args:
             game: a game to get latest props for
@@ -27,15 +29,11 @@ class OddsRepository:
         session = self.database.get_session()
 
         try:
-            results: list[PlayerPropORM] = (
-                session.query(PlayerPropORM)
-                .filter(
-                    PlayerPropORM.game_id == game.game_id,
-                    PlayerPropORM.job_start_time_utc == session.query(
-                        func.max(PlayerPropORM.job_start_time_utc))
-                    .filter(PlayerPropORM.game_id == game.game_id)
-                    .scalar_subquery()
-                )
+            # current_player_props only holds the latest snapshot per game,
+            # so this is an indexed lookup regardless of history size
+            results: list[CurrentPlayerPropORM] = (
+                session.query(CurrentPlayerPropORM)
+                .filter(CurrentPlayerPropORM.game_id == game.game_id)
                 .all())
 
             return results
@@ -48,6 +46,195 @@ class OddsRepository:
         finally:
             session.close()
 
+    def get_latest_props_for_games(self, game_ids: list[str]) -> list[CurrentPlayerPropORM]:
+        """
+        Args:
+            game_ids: ids of the games to get latest props for
+
+        Returns:
+            List of the latest props for all players in all of the games
+        """
+        if not game_ids:
+            return []
+
+        session = self.database.get_session()
+
+        try:
+            results: list[CurrentPlayerPropORM] = (
+                session.query(CurrentPlayerPropORM)
+                .filter(CurrentPlayerPropORM.game_id.in_(game_ids))
+                .all())
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Error getting latest props for {len(game_ids)} games: {e}")
+            raise
+
+        finally:
+            session.close()
+
+    def get_latest_props_frame(self, game_ids: list[str]) -> pd.DataFrame:
+        """
+        Get the latest snapshot of every bookmaker's prices for the games as
+        one DataFrame, without hydrating ORM objects
+
+        Args:
+            game_ids: ids of the games to get latest props for
+
+        Returns:
+            DataFrame with one row per (game, player, prop type, line, bookmaker)
+            and its over and under decimal odds
+        """
+        props = CurrentPlayerPropORM
+        columns = [props.game_id, props.player_name, props.prop_type, props.line,
+                   props.bookmaker, props.over_odds, props.under_odds, props.job_start_time_utc]
+        column_names = [column.key for column in columns]
+        if not game_ids:
+            return pd.DataFrame(columns=column_names)
+
+        session = self.database.get_session()
+
+        try:
+            rows = session.execute(select(*columns).where(props.game_id.in_(game_ids))).all()
+            props_df = pd.DataFrame.from_records(rows, columns=column_names)
+            # Numeric columns come back as Decimal
+            props_df[['line', 'over_odds', 'under_odds']] = props_df[['line', 'over_odds', 'under_odds']].astype(float)
+            return props_df
+
+        except Exception as e:
+            logger.error(f"Error getting latest props frame for {len(game_ids)} games: {e}")
+            raise
+
+        finally:
+            session.close()
+
+    def get_closing_props_frame(self, start_time_from: datetime, start_time_to: datetime) -> pd.DataFrame:
+        """
+        Get the closing snapshot of every game starting in a time range: the
+        props of the last collection job before the game started
+
+        Args:
+            start_time_from: Earliest game start time to include (inclusive)
+            start_time_to: Latest game start time to include (exclusive)
+
+        Returns:
+            DataFrame with one row per (game, player, prop type, line, bookmaker),
+            with the same columns as get_latest_props_frame plus game_start_time_utc
+        """
+        props = PlayerPropORM
+        columns = [props.game_id, props.player_name, props.prop_type, props.line,
+                   props.bookmaker, props.over_odds, props.under_odds, props.job_start_time_utc,
+                   props.game_start_time_utc]
+        column_names = [column.key for column in columns]
+
+        ranked = (
+            select(*columns,
+                   func.dense_rank().over(
+                       partition_by=props.game_id,
+                       order_by=props.job_start_time_utc.desc()).label('job_rank'))
+            .where(props.game_start_time_utc >= start_time_from,
+                   props.game_start_time_utc < start_time_to,
+                   props.job_start_time_utc <= props.game_start_time_utc)
+            .subquery())
+        query = select(*[ranked.c[name] for name in column_names]).where(ranked.c.job_rank == 1)
+
+        session = self.database.get_session()
+
+        try:
+            rows = session.execute(query).all()
+            props_df = pd.DataFrame.from_records(rows, columns=column_names)
+            # Numeric columns come back as Decimal
+            props_df[['line', 'over_odds', 'under_odds']] = props_df[['line', 'over_odds', 'under_odds']].astype(float)
+            return props_df
+
+        except Exception as e:
+            logger.error(f"Error getting closing props for games starting {start_time_from} - {start_time_to}: {e}")
+            raise
+
+        finally:
+            session.close()
+
+    def get_best_odds_for_games(self, game_ids: list[str]) -> list[BestLineOdds]:
+        """
+        Reduce the latest props of the games to the best over and best under
+        price per (player, prop type, line), computed in SQL
+
+        Args:
+            game_ids: ids of the games to get the best odds for
+
+        Returns:
+            One BestLineOdds per side of every offered line, with the winning bookmaker
+        """
+        if not game_ids:
+            return []
+
+        props = CurrentPlayerPropORM
+        line_key = (props.game_id, props.player_name, props.prop_type, props.line)
+
+        def best_side(odds_column, over_under_bet: str):
+            # Rank bookmakers per line by price; the name breaks ties deterministically
+            ranked = (
+                select(*line_key,
+                       literal(over_under_bet).label('over_under_bet'),
+                       props.bookmaker.label('bookie'),
+                       odds_column.label('best_odds'),
+                       props.job_start_time_utc,
+                       func.row_number().over(
+                           partition_by=line_key,
+                           order_by=(odds_column.desc(), props.bookmaker)).label('price_rank'))
+                .where(props.game_id.in_(game_ids), odds_column > 0)
+                .subquery())
+            # Numeric columns come back as Decimal; BestLineOdds holds floats
+            return (select(ranked.c.game_id, ranked.c.player_name, ranked.c.prop_type,
+                           cast(ranked.c.line, Float).label('line'), ranked.c.over_under_bet, ranked.c.bookie,
+                           cast(ranked.c.best_odds, Float).label('best_odds'), ranked.c.job_start_time_utc)
+                    .where(ranked.c.price_rank == 1))
+
+        query = union_all(best_side(props.over_odds, 'over'),
+                          best_side(props.under_odds, 'under'))
+
+        session = self.database.get_session()
+
+        try:
+            return [BestLineOdds(**row) for row in session.execute(query).mappings()]
+
+        except Exception as e:
+            logger.error(f"Error getting best odds for {len(game_ids)} games: {e}")
+            raise
+
+        finally:
+            session.close()
+
+    def get_latest_job_start_time(self, game_ids: list[str]) -> Optional[datetime]:
+        """
+        Get the start time of the newest collection job among the games' latest snapshots
+
+        Args:
+            game_ids: ids of the games to check
+
+        Returns:
+            The latest job_start_time_utc or None if none of the games have props
+        """
+        if not game_ids:
+            return None
+
+        session = self.database.get_session()
+
+        try:
+            return (
+                session.query(func.max(CurrentPlayerPropORM.job_start_time_utc))
+                .filter(CurrentPlayerPropORM.game_id.in_(game_ids))
+                .scalar()
+            )
+
+        except Exception as e:
+            logger.error(f"Error getting latest job start time for {len(game_ids)} games: {e}")
+            return None
+
+        finally:
+            session.close()
+
     def get_latest_odds_update_time(self, game: Matchup) -> Optional[datetime]:
         """
         Get the latest job_start_time_utc for a given game to show when odds were last retrieved
@@ -62,8 +249,8 @@ class OddsRepository:
         
         try:
             latest_time = (
-                session.query(func.max(PlayerPropORM.job_start_time_utc))
-                .filter(PlayerPropORM.game_id == game.game_id)
+                session.query(func.max(CurrentPlayerPropORM.job_start_time_utc))
+                .filter(CurrentPlayerPropORM.game_id == game.game_id)
                 .scalar()
             )
             
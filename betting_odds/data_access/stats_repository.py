@@ -1,11 +1,88 @@
 import logging
+from datetime import date
+from typing import Optional, Union
 
+import numpy as np
 import pandas as pd
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from betting_odds.models.orm_models import GameStatsORM, PlayerORM
 
 logger = logging.getLogger(__name__)
 
+# Columns the game stats queries can project, in DataFrame order
+GAME_STATS_COLUMNS = {
+    'player_name': PlayerORM.name,
+    'player_id': GameStatsORM.player_id,
+    'game_id': GameStatsORM.game_id,
+    'game_date': GameStatsORM.game_date,
+    'matchup': GameStatsORM.matchup,
+    'season': GameStatsORM.season,
+    'season_type': GameStatsORM.season_type,
+    'points': GameStatsORM.points,
+    'assists': GameStatsORM.assists,
+    'rebounds': GameStatsORM.rebounds,
+    'three_pointers_made': GameStatsORM.three_pointers_made,
+    'minutes': GameStatsORM.minutes,
+    'is_away': GameStatsORM.is_away,
+    'team_abbreviation': GameStatsORM.team_abbreviation,
+}
+
+# Columns replace_season_game_stats writes to game_stats, besides season and season_type
+GAME_STATS_WRITE_COLUMNS = ['player_id', 'game_id', 'game_date', 'matchup', 'points', 'assists',
+                            'rebounds', 'three_pointers_made', 'minutes']
+
+_INT_COLUMNS = {'player_id', 'points', 'assists', 'rebounds', 'three_pointers_made'}
+# Nullable in the table, so kept as float with NaN for missing values
+_FLOAT_COLUMNS = {'minutes'}
+_BOOL_COLUMNS = {'is_away'}
+_DATE_COLUMNS = {'game_date'}
+_CATEGORY_COLUMNS = {'player_name', 'matchup', 'season', 'season_type', 'team_abbreviation'}
+
+
+def _to_column(name: str, values: tuple):
+    """Convert the raw values of one result column to its DataFrame dtype"""
+    if name in _INT_COLUMNS:
+        return np.array(values, dtype=np.int64)
+    if name in _FLOAT_COLUMNS:
+        return np.array(values, dtype=np.float64)
+    if name in _BOOL_COLUMNS:
+        return np.array(values, dtype=bool)
+    if name in _DATE_COLUMNS:
+        return pd.to_datetime(pd.Series(values, dtype=object))
+    if name in _CATEGORY_COLUMNS:
+        return pd.Categorical(values)
+    return np.array(values, dtype=object)
+
+
+def _game_filters(date_from: Optional[Union[str, date]] = None,
+                  date_to: Optional[Union[str, date]] = None,
+                  min_minutes: Optional[int] = None,
+                  is_away: Optional[bool] = None) -> list:
+    """
+    Build the optional WHERE clauses shared by the game stats queries
+
+    Args:
+        date_from: Earliest game date to include (inclusive)
+        date_to: Latest game date to include (inclusive)
+        min_minutes: Only include games with at least this many minutes played
+        is_away: True for away games only, False for home games only
+
+    Returns:
+        List of SQLAlchemy criteria
+    """
+    criteria = []
+    if date_from is not None:
+        criteria.append(GameStatsORM.game_date >= date_from)
+    if date_to is not None:
+        criteria.append(GameStatsORM.game_date <= date_to)
+    if min_minutes is not None:
+        criteria.append(GameStatsORM.minutes >= min_minutes)
+    if is_away is not None:
+        criteria.append(GameStatsORM.is_away.is_(is_away))
+    return criteria
+
 
 class StatsRepository:
     def __init__(self, database):
@@ -30,51 +107,181 @@ class StatsRepository:
         finally:
             session.close()
 
-    def query_player_stats(self, player_name: str, season: str, season_type: str) -> pd.DataFrame:
+    def _query_game_stats(self, criteria: list, columns: Optional[list[str]] = None) -> pd.DataFrame:
+        """
+        Run a Core select over game_stats joined to players and build the
+        DataFrame column by column, without hydrating ORM objects
+
+        Args:
+            criteria: WHERE clauses to apply
+            columns: Names from GAME_STATS_COLUMNS to project (all by default)
+
+        Returns:
+        - DataFrame with one typed column per projected name
+        """
+        columns = columns or list(GAME_STATS_COLUMNS)
+        query = (select(*[GAME_STATS_COLUMNS[name].label(name) for name in columns])
+                 .select_from(GameStatsORM)
+                 .join(PlayerORM, GameStatsORM.player_id == PlayerORM.player_id)
+                 .where(*criteria))
+
+        session = self.database.get_session()
+        try:
+            rows = session.execute(query).all()
+        finally:
+            session.close()
+
+        # Transpose the rows into one tuple of values per column
+        column_values = list(zip(*rows)) if rows else [()] * len(columns)
+        return pd.DataFrame({name: _to_column(name, values)
+                             for name, values in zip(columns, column_values)})
+
+    def query_player_stats(self, player_name: str, season: str, season_type: str,
+                           columns: Optional[list[str]] = None,
+                           date_from: Optional[Union[str, date]] = None,
+                           date_to: Optional[Union[str, date]] = None,
+                           min_minutes: Optional[int] = None,
+                           is_away: Optional[bool] = None) -> pd.DataFrame:
         """
         Query player stats from the database with various filters
 
+        Filters left as None are not applied; see _game_filters.
+
         Returns:
         - DataFrame with query results
         """
+        logger.info(f"Querying {player_name} stats for season: {season} and type: {season_type}")
+        return self._query_game_stats([
+            PlayerORM.name == player_name,
+            GameStatsORM.season == season,
+            GameStatsORM.season_type == season_type,
+            *_game_filters(date_from, date_to, min_minutes, is_away),
+        ], columns)
+
+    def query_players_stats(self, player_names: list[str], season: str, season_type: str,
+                            columns: Optional[list[str]] = None,
+                            date_from: Optional[Union[str, date]] = None,
+                            date_to: Optional[Union[str, date]] = None,
+                            min_minutes: Optional[int] = None,
+                            is_away: Optional[bool] = None) -> pd.DataFrame:
+        """
+        Query stats for several players in a single round trip
+
+        Args:
+            player_names: Names of the players to query
+            season: Season identifier (e.g., "2024-25")
+            season_type: The type of season (regular or playoffs)
+            columns: Names from GAME_STATS_COLUMNS to project (all by default)
+            date_from: Earliest game date to include (inclusive)
+            date_to: Latest game date to include (inclusive)
+            min_minutes: Only include games with at least this many minutes played
+            is_away: True for away games only, False for home games only
+
+        Returns:
+        - DataFrame with query results for all players, identified by player_name
+        """
+        if not player_names:
+            return pd.DataFrame()
+
+        logger.info(f"Querying stats of {len(player_names)} players for season: {season} and type: {season_type}")
+        return self._query_game_stats([
+            PlayerORM.name.in_(player_names),
+            GameStatsORM.season == season,
+            GameStatsORM.season_type == season_type,
+            *_game_filters(date_from, date_to, min_minutes, is_away),
+        ], columns)
+
+    def query_season_stats(self, season: str, season_type: str,
+                           columns: Optional[list[str]] = None,
+                           min_minutes: Optional[int] = None) -> pd.DataFrame:
+        """
+        Query the games of every player in a season
+
+        Args:
+            season: Season identifier (e.g., "2024-25")
+            season_type: The type of season (regular or playoffs)
+            columns: Names from GAME_STATS_COLUMNS to project (all by default)
+            min_minutes: Only include games with at least this many minutes played
+
+        Returns:
+        - DataFrame with query results for all players, identified by player_name
+        """
+        logger.info(f"Querying stats of all players for season: {season} and type: {season_type}")
+        return self._query_game_stats([
+            GameStatsORM.season == season,
+            GameStatsORM.season_type == season_type,
+            *_game_filters(min_minutes=min_minutes),
+        ], columns)
+
+    def query_team_stats(self, team_abbreviation: str, season: str, season_type: str,
+                         columns: Optional[list[str]] = None) -> pd.DataFrame:
+        """
+        Query the games every player of a team played for it in a season
+
+        Args:
+            team_abbreviation: Team the players played for (e.g., "DEN"), as in the matchup
+            season: Season identifier (e.g., "2024-25")
+            season_type: The type of season (regular or playoffs)
+            columns: Names from GAME_STATS_COLUMNS to project (all by default)
+
+        Returns:
+        - DataFrame with query results for all the team's players, identified by player_name
+        """
+        logger.info(f"Querying {team_abbreviation} stats for season: {season} and type: {season_type}")
+        return self._query_game_stats([
+            GameStatsORM.team_abbreviation == team_abbreviation,
+            GameStatsORM.season == season,
+            GameStatsORM.season_type == season_type,
+        ], columns)
+
+    def replace_season_game_stats(self, season: str, season_type: str, game_stats_df: pd.DataFrame) -> None:
+        """
+        Store a season's box scores in one transaction: players seen for the
+        first time are added, and the season's rows of the given games are
+        replaced, so the load can be re-run
+
+        Args:
+            season: Season identifier (e.g., "2024-25")
+            season_type: The type of season (regular or playoffs)
+            game_stats_df: DataFrame with GAME_STATS_WRITE_COLUMNS plus
+                player_name and team_abbreviation
+        """
+        # The player's team in their latest game of the season, for new players only
+        players_df = game_stats_df.sort_values('game_date').drop_duplicates('player_id', keep='last')
+        player_records = [{'player_id': int(player_id), 'name': name, 'team': team}
+                          for player_id, name, team in zip(players_df['player_id'], players_df['player_name'],
+                                                           players_df['team_abbreviation'])]
+
+        games_df = game_stats_df[GAME_STATS_WRITE_COLUMNS].assign(
+            game_date=pd.to_datetime(game_stats_df['game_date']).dt.date, season=season, season_type=season_type)
+        # Missing minutes are stored as NULL
+        game_records = games_df.astype(object).where(games_df.notna(), None).to_dict('records')
+        game_ids = games_df['game_id'].unique().tolist()
+
         session = self.database.get_session()
         try:
-            logger.info(f"Querying {player_name} stats for season: {season} and type: {season_type}")
-            query = session.query(GameStatsORM).join(
-                PlayerORM).filter(PlayerORM.name == player_name)
-
-            query = query.filter(GameStatsORM.season == season)
-
-            query = query.filter(GameStatsORM.season_type == season_type)
-
-            # Execute query and get results
-            results = query.all()
-
-            # Convert to dictionary and then to DataFrame
-            data = []
-            for game in results:
-                game_dict = {
-                    'player_name': player_name,
-                    'player_id': game.player_id,
-                    'game_id': game.game_id,
-                    'game_date': game.game_date,
-                    'matchup': game.matchup,
-                    'season': game.season,
-                    'season_type': game.season_type,
-                    'points': game.points,
-                    'assists': game.assists,
-                    'rebounds': game.rebounds,
-                    'three_pointers_made': game.three_pointers_made,
-                    'minutes': game.minutes,
-                }
-                data.append(game_dict)
-
-            return pd.DataFrame(data)
+            if player_records:
+                session.execute(pg_insert(PlayerORM).on_conflict_do_nothing(index_elements=['player_id']),
+                                player_records)
+            session.execute(delete(GameStatsORM).where(GameStatsORM.season == season,
+                                                       GameStatsORM.season_type == season_type,
+                                                       GameStatsORM.game_id.in_(game_ids)))
+            if game_records:
+                session.execute(insert(GameStatsORM), game_records)
+            session.commit()
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error replacing {len(game_records)} game stats of season {season} {season_type}: {e}")
+            raise
 
         finally:
             session.close()
 
-    def query_all_player_stats(self, player_name: str, season_type: str) -> pd.DataFrame:
+    def query_all_player_stats(self, player_name: str, season_type: str,
+                               columns: Optional[list[str]] = None,
+                               min_minutes: Optional[int] = None,
+                               is_away: Optional[bool] = None) -> pd.DataFrame:
         """
         Query all available seasons for a player in a single call
 
@@ -84,41 +291,16 @@ class StatsRepository:
         Args:
             player_name: The player's name
             season_type: The type of season (regular or playoffs)
+            columns: Names from GAME_STATS_COLUMNS to project (all by default)
+            min_minutes: Only include games with at least this many minutes played
+            is_away: True for away games only, False for home games only
 
         Returns:
         - DataFrame with query results for all available seasons
         """
-        session = self.database.get_session()
-        try:
-            logger.info(f"Querying {player_name} all stats for all seasons.")
-            query = session.query(GameStatsORM).join(
-                PlayerORM).filter(PlayerORM.name == player_name)
-
-            query = query.filter(GameStatsORM.season_type == season_type)
-
-            # Execute query and get results
-            results = query.all()
-
-            # Convert to dictionary and then to DataFrame
-            data = []
-            for game in results:
-                game_dict = {
-                    'player_name': player_name,
-                    'player_id': game.player_id,
-                    'game_id': game.game_id,
-                    'game_date': game.game_date,
-                    'matchup': game.matchup,
-                    'season': game.season,
-                    'season_type': game.season_type,
-                    'points': game.points,
-                    'assists': game.assists,
-                    'rebounds': game.rebounds,
-                    'three_pointers_made': game.three_pointers_made,
-                    'minutes': game.minutes,
-                }
-                data.append(game_dict)
-
-            return pd.DataFrame(data)
-
-        finally:
-            session.close()
+        logger.info(f"Querying {player_name} all stats for all seasons.")
+        return self._query_game_stats([
+            PlayerORM.name == player_name,
+            GameStatsORM.season_type == season_type,
+            *_game_filters(min_minutes=min_minutes, is_away=is_away),
+        ], columns)
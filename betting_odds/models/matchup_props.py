@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from betting_odds.models.orm_models import CurrentPlayerPropORM
+
+
+@dataclass
+class MatchupProps:
+    """Latest props snapshot of a matchup, grouped by player name"""
+    # job_start_time_utc of the snapshot, None if no props exist for the matchup
+    latest_update_time_utc: Optional[datetime]
+    player_props_by_name: Dict[str, List[CurrentPlayerPropORM]]
+
+
+@dataclass
+class BestLineOdds:
+    """Best price across bookmakers for one side of a player's prop line"""
+    game_id: str
+    player_name: str
+    prop_type: str  # e.g. Points, Rebounds, Assists
+    line: float
+    over_under_bet: str  # "over" or "under"
+    bookie: str
+    best_odds: float
+    job_start_time_utc: Optional[datetime]
+
+
+@dataclass
+class MatchupBestOdds:
+    """Best odds per line of a matchup's latest snapshot, grouped by player name"""
+    # job_start_time_utc of the snapshot, None if no props exist for the matchup
+    latest_update_time_utc: Optional[datetime]
+    best_odds_by_player_name: Dict[str, List[BestLineOdds]]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, func, Date, Numeric, TIMESTAMP
+from sqlalchemy import Column, Integer, String, ForeignKey, func, Date, Numeric, TIMESTAMP, Boolean, Computed, Index, Float
 from sqlalchemy.orm import relationship
 
 from database.base import Base
@@ -40,6 +40,65 @@ class PlayerPropORM(Base):
     # Relationship with Event
     event = relationship("EventORM", back_populates="player_props")
 
+    __table_args__ = (
+        Index('ix_player_props_game_id_job_start_time_utc',
+              'game_id', 'job_start_time_utc'),
+    )
+
+
+class CurrentPlayerPropORM(Base):
+    """
+    Latest snapshot of player_props for each game.
+
+    Maintained by triggers on player_props (see database.migrations) on every
+    insert, update, delete and truncate, so reading the current board never
+    scans the snapshot history.
+    """
+    __tablename__ = 'current_player_props'
+
+    # Same id as the player_props row it was copied from
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    game_id = Column(String, ForeignKey('events.id'), nullable=False)
+    game_start_time_utc = Column(TIMESTAMP(timezone=True))
+    player_name = Column(String)
+    prop_type = Column(String)  # e.g. Points, Rebounds, Assists
+    line = Column(Numeric(5, 2))
+    over_odds = Column(Numeric(5, 2))
+    under_odds = Column(Numeric(5, 2))
+    bookmaker = Column(String)
+    odds_collection_time_utc = Column(TIMESTAMP(timezone=True))
+    job_start_time_utc = Column(TIMESTAMP(timezone=True))
+
+    __table_args__ = (
+        Index('ix_current_player_props_game_id_job_start_time_utc',
+              'game_id', 'job_start_time_utc'),
+    )
+
+
+class ArbitrageOpportunityORM(Base):
+    """
+    Arbitrage and middle opportunities in the latest snapshot of the upcoming
+    games, rebuilt after every collection job by
+    betting_odds.services.arbitrage_scanner
+    """
+    __tablename__ = 'arbitrage_opportunities'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    game_id = Column(String, ForeignKey('events.id'), index=True, nullable=False)
+    player_name = Column(String)
+    prop_type = Column(String)  # e.g. Points, Rebounds, Assists
+    kind = Column(String)  # arbitrage or middle
+    over_line = Column(Numeric(5, 2))
+    over_bookmaker = Column(String)
+    over_odds = Column(Numeric(5, 2))
+    under_line = Column(Numeric(5, 2))
+    under_bookmaker = Column(String)
+    under_odds = Column(Numeric(5, 2))
+    # 1 / over_odds + 1 / under_odds; below 1 is a guaranteed profit
+    combined_implied_probability = Column(Numeric(6, 4))
+    job_start_time_utc = Column(TIMESTAMP(timezone=True))
+    scanned_at_utc = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
 
 class PlayerORM(Base):
     __tablename__ = 'players'
@@ -71,6 +130,25 @@ class GameStatsORM(Base):
     three_pointers_made = Column(Integer, nullable=False, default=0)
 
     # Additional stats
-    minutes = Column(Integer)
+    minutes = Column(Float)  # decimal minutes, e.g. 40.55
+
+    # Derived from matchup ("LVA @ NYL" is an away game, "LVA vs. NYL" a home game)
+    is_away = Column(Boolean, Computed("matchup LIKE '%@%'", persisted=True))
+    # The player's team in that game ("LVA" of "LVA @ NYL"); players.team is only the current one
+    team_abbreviation = Column(String, Computed("split_part(matchup, ' ', 1)", persisted=True))
 
     player = relationship("PlayerORM", back_populates="games")
+
+    __table_args__ = (
+        Index('ix_game_stats_player_id_season_type_is_away',
+              'player_id', 'season_type', 'is_away'),
+        # Carries every game_stats column of PlayerStatsService.SUMMARY_COLUMNS, so
+        # the slate summary query can read game_stats with an index-only scan;
+        # queries projecting other columns (matchup, game_id, ...) still visit the heap
+        Index('ix_game_stats_player_id_season_type_season_game_date',
+              'player_id', 'season_type', 'season', 'game_date',
+              postgresql_include=['points', 'rebounds', 'assists',
+                                  'three_pointers_made', 'minutes', 'is_away']),
+        Index('ix_game_stats_team_abbreviation_season_type_season',
+              'team_abbreviation', 'season_type', 'season'),
+    )
@@ -1,35 +1,168 @@
-from dataclasses import dataclass
-from typing import Dict
+import threading
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class StatIndex(IntEnum):
+    """Column of each stat in the summary and game arrays"""
+    POINTS = 0
+    REBOUNDS = 1
+    ASSISTS = 2
+    THREE_POINTERS_MADE = 3
+
+
+# Stat column names in StatIndex order, e.g. ['points', 'rebounds', ...]
+STAT_TYPES = [stat.name.lower() for stat in StatIndex]
+_STAT_INDEX_BY_NAME = {stat_type: index for index, stat_type in enumerate(STAT_TYPES)}
+
+
+def prop_stat_type(prop_type: str) -> str:
+    """Stat type a prop type is settled on, e.g. "Three Pointers Made" -> "three_pointers_made" """
+    return prop_type.lower().replace(' ', '_')
+
+
+class SummaryMetric(IntEnum):
+    """Row of each precomputed metric in PlayerStatsSummary.summary_values"""
+    SEASON_AVG = 0
+    SEASON_MEDIAN = 1
+    LAST_5_AVG = 2
+    LAST_10_AVG = 3
+
+
+SUMMARY_METRIC_BY_NAME = {
+    "Season Average": SummaryMetric.SEASON_AVG,
+    "Season Median": SummaryMetric.SEASON_MEDIAN,
+    "Last 5 Games Average": SummaryMetric.LAST_5_AVG,
+    "Last 10 Games Average": SummaryMetric.LAST_10_AVG,
+}
+
+
+class HitRateWindow(IntEnum):
+    """Row of each window in the arrays returned by get_hit_rates"""
+    LAST_5 = 0
+    LAST_10 = 1
+    SEASON = 2
+
+
+# Most recent games in each HitRateWindow, None for all of them
+HIT_RATE_WINDOW_GAMES = (5, 10, None)
 
 
 @dataclass
 class PlayerStatsSummary:
     """Player statistics model"""
-    player_id: str
+    player_id: int
     player_name: str
-    # e.g., {"points": 25.5, "rebounds": 7.5, "assists": 4.5}
-    season_avg_by_stats: Dict[str, float]
-    season_median_by_stats: Dict[str, float]
-    last_5_avg_by_stats: Dict[str, float]
-    last_10_avg_by_stats: Dict[str, float]
+    # (len(SummaryMetric), len(StatIndex)) precomputed metric values
+    summary_values: np.ndarray = field(repr=False, compare=False)
+    # (games, len(StatIndex)) values, minutes and away flags of the player's
+    # games, most recent first; the other registered metrics are computed from them
+    game_values: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    game_minutes: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    game_is_away: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    # Looks up a registered metric by name, e.g. stat_metrics.get_metric
+    get_metric: Optional[Callable[[str], Optional[Callable]]] = field(default=None, repr=False, compare=False)
+    # One (games in window, len(StatIndex)) array per HitRateWindow, each
+    # column sorted ascending, so hit rates are a binary search per line
+    sorted_window_values: Optional[Tuple[np.ndarray, ...]] = field(default=None, repr=False, compare=False)
+    # (stat_type, metric_type) -> value of the metrics evaluated so far; summaries
+    # are shared between sessions, so the memo is guarded by a lock
+    _metric_values: Dict[Tuple[str, str], float] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    _metric_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
 
     def get_stat_summary(self, stat_type: str, metric_type: str) -> float:
         """
         Get the projection value for a specific stat type
 
+        The SummaryMetric values are read from summary_values; any other
+        registered metric is computed from the player's games on first use
+        and memoized.
+
         Args:
             stat_type: The stat type (points, rebounds, assists)
-            metric_type: Which metric to use (season_avg, last_5_avg, last_10_avg, season_median)
+            metric_type: Name of a registered metric (e.g. "Season Average", "Last 5 Games Average")
 
         Returns:
             The metric value or 0 if not available
         """
-        if metric_type == "Season Average":
-            return self.season_avg_by_stats.get(stat_type, 0)
-        elif metric_type == "Last 5 Games Average":
-            return self.last_5_avg_by_stats.get(stat_type, 0)
-        elif metric_type == "Last 10 Games Average":
-            return self.last_10_avg_by_stats.get(stat_type, 0)
-        elif metric_type == "Season Median":
-            return self.season_median_by_stats.get(stat_type, 0)
-        return 0
+        stat_index = _STAT_INDEX_BY_NAME.get(stat_type)
+        if stat_index is None:
+            return 0
+
+        summary_metric = SUMMARY_METRIC_BY_NAME.get(metric_type)
+        if summary_metric is not None:
+            return float(self.summary_values[summary_metric, stat_index])
+
+        key = (stat_type, metric_type)
+        with self._metric_lock:
+            if key not in self._metric_values:
+                self._metric_values[key] = self._evaluate_metric(stat_index, metric_type)
+            return self._metric_values[key]
+
+    def _evaluate_metric(self, stat_index: int, metric_type: str) -> float:
+        """Compute a registered metric from the player's games, 0 if not possible"""
+        metric = self.get_metric(metric_type) if self.get_metric is not None else None
+        if metric is None or self.game_values is None or len(self.game_values) == 0:
+            return 0
+
+        value = metric(self.game_values[:, stat_index], self.game_minutes, self.game_is_away)
+        if np.isnan(value):
+            return 0
+        return round(float(value), 2)
+
+    def get_hit_rates(self, stat_type: str, lines: Sequence[float],
+                      over_under_bet: str = "over") -> np.ndarray:
+        """
+        Fraction of the player's games in each HitRateWindow that went over
+        (or under) each line; a game landing exactly on the line is a push
+        and counts as a miss for both sides
+
+        Args:
+            stat_type: The stat type (points, rebounds, assists)
+            lines: Prop lines to evaluate
+            over_under_bet: "over" or "under"
+
+        Returns:
+            Array of shape (len(HitRateWindow), len(lines)), NaN where the
+            player has no games
+        """
+        lines = np.asarray(lines, dtype=float)
+        hit_rates = np.full((len(HitRateWindow), len(lines)), np.nan)
+        stat_index = _STAT_INDEX_BY_NAME.get(stat_type)
+        if stat_index is None or self.sorted_window_values is None:
+            return hit_rates
+
+        for window, window_values in enumerate(self.sorted_window_values):
+            values = window_values[:, stat_index]
+            if len(values) == 0:
+                continue
+            if over_under_bet == "over":
+                hits = len(values) - np.searchsorted(values, lines, side="right")
+            else:
+                hits = np.searchsorted(values, lines, side="left")
+            hit_rates[window] = hits / len(values)
+        return hit_rates
+
+    def _summary_by_stats(self, summary_metric: SummaryMetric) -> Dict[str, float]:
+        return dict(zip(STAT_TYPES, self.summary_values[summary_metric].tolist()))
+
+    @property
+    def season_avg_by_stats(self) -> Dict[str, float]:
+        # e.g., {"points": 25.5, "rebounds": 7.5, "assists": 4.5}
+        return self._summary_by_stats(SummaryMetric.SEASON_AVG)
+
+    @property
+    def season_median_by_stats(self) -> Dict[str, float]:
+        return self._summary_by_stats(SummaryMetric.SEASON_MEDIAN)
+
+    @property
+    def last_5_avg_by_stats(self) -> Dict[str, float]:
+        return self._summary_by_stats(SummaryMetric.LAST_5_AVG)
+
+    @property
+    def last_10_avg_by_stats(self) -> Dict[str, float]:
+        return self._summary_by_stats(SummaryMetric.LAST_10_AVG)
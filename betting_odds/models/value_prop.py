@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class ValueProp:
+    """One side of a prop line scored against a player's stats baseline"""
+    game_id: str
+    matchup: str  # derived game name, e.g. "Boston Celtics @ New York Knicks"
+    player_name: str
+    prop_type: str  # e.g. Points, Rebounds, Assists
+    line: float
+    over_under_bet: str  # "over" or "under"
+    bookie: str
+    best_odds: float
+    stats_baseline: float
+    # Relative distance of the baseline from the line in the bet's favour,
+    # e.g. 0.12 for an over at 22.5 with a baseline of 25.2
+    edge: float
+    # Direction code from value_prop_indicator.classify_value_directions
+    direction: int
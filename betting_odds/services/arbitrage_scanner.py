@@ -0,0 +1,156 @@
+"""
+Cross-bookmaker arbitrage and middle scanner.
+
+An arbitrage is a line whose best over and best under prices (usually at
+different bookmakers) imply probabilities adding up to less than 1, so
+betting both sides in proportion guarantees a profit. A middle is an over at
+a lower line combined with an under at a higher line of the same player and
+prop; both bets win if the result lands in between.
+
+Run after every odds collection job to rebuild the arbitrage_opportunities
+table the odds pages read from:
+
+    python -m betting_odds.services.arbitrage_scanner nba wnba
+"""
+import argparse
+import logging
+
+import pandas as pd
+
+from betting_odds.data_access.arbitrage_repository import OPPORTUNITY_COLUMNS, ArbitrageRepository
+from betting_odds.data_access.events_repository import EventsRepository
+from betting_odds.data_access.odds_repository import OddsRepository
+from betting_odds.services.fair_odds import best_prices
+
+logger = logging.getLogger(__name__)
+
+# Middles are rarely free; accept paying up to this much combined implied probability
+DEFAULT_MAX_MIDDLE_IMPLIED_PROBABILITY = 1.05
+
+# Columns identifying one player prop, whatever the line
+_PROP_KEY = ['game_id', 'player_name', 'prop_type']
+
+
+def _best_sides(props_df: pd.DataFrame):
+    """Best over and best under price per line, with side-prefixed columns"""
+    best_over = best_prices(props_df, 'over_odds').rename(columns={
+        'line': 'over_line', 'bookie': 'over_bookmaker', 'best_odds': 'over_odds'})
+    best_under = best_prices(props_df, 'under_odds').rename(columns={
+        'line': 'under_line', 'bookie': 'under_bookmaker', 'best_odds': 'under_odds'})
+    return best_over, best_under
+
+
+def _finish(opportunities_df: pd.DataFrame, props_df: pd.DataFrame, kind: str) -> pd.DataFrame:
+    """Add the kind and snapshot time and project OPPORTUNITY_COLUMNS"""
+    job_start_time_by_game_id = props_df.groupby('game_id')['job_start_time_utc'].max()
+    return (opportunities_df
+            .assign(kind=kind, job_start_time_utc=opportunities_df['game_id'].map(job_start_time_by_game_id))
+            [OPPORTUNITY_COLUMNS])
+
+
+def find_arbitrages(props_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Lines whose best over and best under prices imply less than 100% combined
+
+    Args:
+        props_df: Latest snapshot, see OddsRepository.get_latest_props_frame
+
+    Returns:
+        DataFrame with OPPORTUNITY_COLUMNS, kind 'arbitrage'
+    """
+    if props_df.empty:
+        return pd.DataFrame(columns=OPPORTUNITY_COLUMNS)
+
+    best_over, best_under = _best_sides(props_df)
+    lines = best_over.merge(best_under, left_on=_PROP_KEY + ['over_line'],
+                            right_on=_PROP_KEY + ['under_line'])
+    lines['combined_implied_probability'] = 1 / lines['over_odds'] + 1 / lines['under_odds']
+    return _finish(lines[lines['combined_implied_probability'] < 1], props_df, 'arbitrage')
+
+
+def find_middles(props_df: pd.DataFrame,
+                 max_combined_implied_probability: float = DEFAULT_MAX_MIDDLE_IMPLIED_PROBABILITY) -> pd.DataFrame:
+    """
+    Over/under pairs on different lines of the same prop that both win when
+    the result lands between the lines
+
+    Args:
+        props_df: Latest snapshot, see OddsRepository.get_latest_props_frame
+        max_combined_implied_probability: Most combined implied probability
+            (the cost of the middle) to accept
+
+    Returns:
+        DataFrame with OPPORTUNITY_COLUMNS, kind 'middle'
+    """
+    if props_df.empty:
+        return pd.DataFrame(columns=OPPORTUNITY_COLUMNS)
+
+    best_over, best_under = _best_sides(props_df)
+    # Every over line paired with every under line of the same prop
+    pairs = best_over.merge(best_under, on=_PROP_KEY)
+    pairs = pairs[pairs['under_line'] > pairs['over_line']]
+    pairs = pairs.assign(combined_implied_probability=1 / pairs['over_odds'] + 1 / pairs['under_odds'])
+    return _finish(pairs[pairs['combined_implied_probability'] <= max_combined_implied_probability],
+                   props_df, 'middle')
+
+
+def scan_opportunities(props_df: pd.DataFrame,
+                       max_middle_implied_probability: float = DEFAULT_MAX_MIDDLE_IMPLIED_PROBABILITY) -> pd.DataFrame:
+    """
+    Find the arbitrages and middles of a snapshot
+
+    Returns:
+        DataFrame with OPPORTUNITY_COLUMNS, lowest combined implied probability first
+    """
+    opportunities = [find_arbitrages(props_df), find_middles(props_df, max_middle_implied_probability)]
+    opportunities = [frame for frame in opportunities if not frame.empty]
+    if not opportunities:
+        return pd.DataFrame(columns=OPPORTUNITY_COLUMNS)
+
+    return (pd.concat(opportunities, ignore_index=True)
+            .sort_values('combined_implied_probability', ignore_index=True))
+
+
+def refresh_opportunities(database,
+                          max_middle_implied_probability: float = DEFAULT_MAX_MIDDLE_IMPLIED_PROBABILITY) -> int:
+    """
+    Scan the latest snapshot of every upcoming game and replace the stored
+    opportunities with the result
+
+    Args:
+        database: Database routed to a league schema
+        max_middle_implied_probability: See find_middles
+
+    Returns:
+        Number of opportunities stored
+    """
+    game_ids = [matchup.game_id for matchup in EventsRepository(database).get_future_events().values()]
+    props_df = OddsRepository(database).get_latest_props_frame(game_ids)
+    opportunities_df = scan_opportunities(props_df, max_middle_implied_probability)
+
+    ArbitrageRepository(database).replace_opportunities(opportunities_df)
+    logger.info(f"Stored {len(opportunities_df)} arbitrage opportunities for {len(game_ids)} games "
+                f"in schema {database.schema}")
+    return len(opportunities_df)
+
+
+if __name__ == "__main__":
+    from database.database import Database
+    from database.utils import get_engine
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Rebuild the arbitrage_opportunities table")
+    parser.add_argument("schemas", nargs="+", help="League schemas to scan, e.g. nba wnba")
+    parser.add_argument("--max-middle-implied-probability", type=float,
+                        default=DEFAULT_MAX_MIDDLE_IMPLIED_PROBABILITY,
+                        help="Most combined implied probability to accept for a middle")
+    parser.add_argument("--connection-string", default=None,
+                        help="SQLAlchemy connection string (defaults to the secrets file)")
+    args = parser.parse_args()
+
+    engine = get_engine(args.connection_string)
+    for schema_name in args.schemas:
+        stored = refresh_opportunities(Database(engine=engine, schema=schema_name),
+                                       args.max_middle_implied_probability)
+        print(f"Schema {schema_name}: {stored} opportunities")
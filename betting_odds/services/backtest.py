@@ -0,0 +1,330 @@
+"""
+Backtest of the value indicator against historical closing odds.
+
+For every game of a season, the closing snapshot (the last collection job
+before the game started) is joined to the players' actual results. Each
+closing line is classified with the baselines the player had before that
+game, for every backtested metric. Hit rate and return on investment are
+then measured per metric, stat and value direction, betting one unit at
+the best closing price:
+
+    python -m betting_odds.services.backtest nba:2024-25:Playoffs wnba:2024 wnba:2025
+
+Seasons run in parallel across a process pool.
+"""
+import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from betting_odds.data_access.odds_repository import OddsRepository
+from betting_odds.data_access.stats_repository import StatsRepository
+from betting_odds.models.player_stats_summary import STAT_TYPES, prop_stat_type
+from betting_odds.services.fair_odds import best_prices
+from betting_odds.services.value_prop_indicator import VALUE_DIRECTIONS, classify_value_directions
+
+logger = logging.getLogger(__name__)
+
+# game_stats.game_date is the game's date in US Eastern time
+GAME_DATE_TIMEZONE = 'America/New_York'
+
+RESULT_COLUMNS = ['metric_type', 'stat_type', 'value_direction', 'bets', 'wins', 'pushes', 'hit_rate', 'roi']
+
+# (schema, season, season_type)
+BacktestTask = Tuple[str, str, str]
+
+
+def _exclusive_cumsum(values: pd.DataFrame, player_codes: np.ndarray) -> pd.DataFrame:
+    """Per player running sum of the games before each game"""
+    return values.groupby(player_codes).cumsum() - values
+
+
+def _prior_season_average(values: pd.DataFrame, player_codes: np.ndarray, is_away: np.ndarray) -> pd.DataFrame:
+    prior_games = pd.Series(player_codes).groupby(player_codes).cumcount().to_numpy()[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _exclusive_cumsum(values, player_codes) / prior_games
+
+
+def _prior_season_median(values: pd.DataFrame, player_codes: np.ndarray, is_away: np.ndarray) -> pd.DataFrame:
+    medians = values.groupby(player_codes).expanding().median().droplevel(0).sort_index()
+    return medians.groupby(player_codes).shift()
+
+
+def _prior_last_n_average(n: int):
+    def metric(values: pd.DataFrame, player_codes: np.ndarray, is_away: np.ndarray) -> pd.DataFrame:
+        # Sum of the last n earlier games from the difference of running sums
+        running_sum = _exclusive_cumsum(values, player_codes)
+        last_n_sum = running_sum - running_sum.groupby(player_codes).shift(n).fillna(0)
+        prior_games = pd.Series(player_codes).groupby(player_codes).cumcount().to_numpy()[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return last_n_sum / np.minimum(prior_games, n)
+    return metric
+
+
+def _prior_ewma(span: int):
+    def metric(values: pd.DataFrame, player_codes: np.ndarray, is_away: np.ndarray) -> pd.DataFrame:
+        ewma = values.groupby(player_codes).ewm(span=span).mean().droplevel(0).sort_index()
+        return ewma.groupby(player_codes).shift()
+    return metric
+
+
+def _prior_venue_average(away: bool):
+    def metric(values: pd.DataFrame, player_codes: np.ndarray, is_away: np.ndarray) -> pd.DataFrame:
+        at_venue = pd.DataFrame(np.repeat((is_away == away)[:, None], values.shape[1], axis=1),
+                                index=values.index, columns=values.columns)
+        venue_sum = _exclusive_cumsum(values.where(at_venue, 0), player_codes)
+        venue_games = _exclusive_cumsum(at_venue.astype(int), player_codes)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            venue_average = venue_sum / venue_games
+        # No earlier game at this venue: the season average, like venue_average in stat_metrics
+        return venue_average.where(venue_games > 0, _prior_season_average(values, player_codes, is_away))
+    return metric
+
+
+# Registered metrics (see stat_metrics) whose pre-game value the backtest can
+# compute vectorized: (values, player codes, is_away) -> baseline before each game
+PriorMetric = Callable[[pd.DataFrame, np.ndarray, np.ndarray], pd.DataFrame]
+BACKTEST_METRICS: Dict[str, PriorMetric] = {
+    "Last 5 Games Average": _prior_last_n_average(5),
+    "Last 10 Games Average": _prior_last_n_average(10),
+    "Season Average": _prior_season_average,
+    "Season Median": _prior_season_median,
+    "Last 3 Games Average": _prior_last_n_average(3),
+    "Last 15 Games Average": _prior_last_n_average(15),
+    "Weighted Recent Form (EWMA)": _prior_ewma(5),
+    "Home Games Average": _prior_venue_average(False),
+    "Away Games Average": _prior_venue_average(True),
+}
+
+
+@dataclass
+class BacktestData:
+    """
+    Closing lines of a season joined to their outcomes; one entry per side of
+    every line, in flat arrays so many threshold settings can be evaluated
+    without repeating the join
+    """
+    lines: np.ndarray
+    sides: np.ndarray  # "over" or "under"
+    stat_indices: np.ndarray  # index into STAT_TYPES
+    # Profit of one unit staked at the best closing price: odds - 1, -1 or 0 for a push
+    profits: np.ndarray
+    wins: np.ndarray
+    pushes: np.ndarray
+    # metric type -> baseline of each entry before its game, NaN without earlier games
+    baselines_by_metric: Dict[str, np.ndarray]
+
+    def __len__(self):
+        return len(self.lines)
+
+
+def build_backtest_data(stats_df: pd.DataFrame, closing_props_df: pd.DataFrame) -> BacktestData:
+    """
+    Join closing lines to actual results and the baselines known before each game
+
+    Args:
+        stats_df: The season's games of all players, see StatsRepository.query_season_stats
+        closing_props_df: Closing snapshots, see OddsRepository.get_closing_props_frame
+
+    Returns:
+        BacktestData of the lines whose player played in the game
+    """
+    if stats_df.empty or closing_props_df.empty:
+        return BacktestData(lines=np.empty(0), sides=np.empty(0, dtype=str), stat_indices=np.empty(0, dtype=int),
+                            profits=np.empty(0), wins=np.empty(0, dtype=bool), pushes=np.empty(0, dtype=bool),
+                            baselines_by_metric={metric_type: np.empty(0) for metric_type in BACKTEST_METRICS})
+
+    # Oldest game first, so every running computation only sees earlier games
+    stats_df = stats_df.sort_values(['player_name', 'game_date'], ignore_index=True)
+    player_codes = pd.factorize(stats_df['player_name'])[0]
+    values = stats_df[STAT_TYPES].astype(float)
+    is_away = stats_df['is_away'].to_numpy(dtype=bool)
+
+    baseline_matrices = {metric_type: prior_metric(values, player_codes, is_away).to_numpy()
+                         for metric_type, prior_metric in BACKTEST_METRICS.items()}
+
+    sides = []
+    for over_under_bet, odds_column in (('over', 'over_odds'), ('under', 'under_odds')):
+        side_prices = best_prices(closing_props_df, odds_column).assign(over_under_bet=over_under_bet)
+        sides.append(side_prices)
+    lines_df = pd.concat(sides, ignore_index=True)
+
+    # Settle each line on the stat of the player's game on the same (Eastern) date
+    game_start_times = closing_props_df.drop_duplicates('game_id').set_index('game_id')['game_start_time_utc']
+    lines_df['game_date'] = (pd.to_datetime(lines_df['game_id'].map(game_start_times), utc=True)
+                             .dt.tz_convert(GAME_DATE_TIMEZONE).dt.tz_localize(None).dt.normalize())
+    lines_df['stat_index'] = lines_df['prop_type'].map(
+        {prop_type: STAT_TYPES.index(prop_stat_type(prop_type))
+         for prop_type in lines_df['prop_type'].unique() if prop_stat_type(prop_type) in STAT_TYPES})
+    lines_df = lines_df.dropna(subset=['stat_index'])
+
+    games_df = pd.DataFrame({'player_name': stats_df['player_name'].astype(str),
+                             'game_date': stats_df['game_date'].dt.normalize(),
+                             'game_row': np.arange(len(stats_df))})
+    joined = lines_df.merge(games_df, on=['player_name', 'game_date'])
+
+    game_rows = joined['game_row'].to_numpy()
+    stat_indices = joined['stat_index'].to_numpy(dtype=int)
+    lines = joined['line'].to_numpy(dtype=float)
+    best_odds = joined['best_odds'].to_numpy(dtype=float)
+    is_over = (joined['over_under_bet'] == 'over').to_numpy()
+    actuals = values.to_numpy()[game_rows, stat_indices]
+
+    wins = np.where(is_over, actuals > lines, actuals < lines)
+    pushes = actuals == lines
+
+    return BacktestData(
+        lines=lines,
+        sides=np.where(is_over, 'over', 'under'),
+        stat_indices=stat_indices,
+        profits=np.where(wins, best_odds - 1, np.where(pushes, 0.0, -1.0)),
+        wins=wins,
+        pushes=pushes,
+        baselines_by_metric={metric_type: matrix[game_rows, stat_indices]
+                             for metric_type, matrix in baseline_matrices.items()},
+    )
+
+
+def evaluate(data: BacktestData, threshold: float = 0.1, lower_threshold: float = 0.03,
+             metric_types: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Hit rate and ROI per metric, stat and value direction
+
+    Args:
+        data: Joined closing lines and outcomes
+        threshold: Threshold for strong value, see ValueIndicator
+        lower_threshold: Threshold for positive value, see ValueIndicator
+        metric_types: Metrics to evaluate (all of BACKTEST_METRICS by default)
+
+    Returns:
+        DataFrame with RESULT_COLUMNS; hit_rate excludes pushes and roi is the
+        profit per unit staked
+    """
+    bucket_count = len(STAT_TYPES) * len(VALUE_DIRECTIONS)
+    results = []
+    for metric_type in metric_types or list(BACKTEST_METRICS):
+        baselines = data.baselines_by_metric[metric_type]
+        # Without earlier games (or a zero baseline) there is nothing to compare against
+        valid = baselines > 0
+        directions = classify_value_directions(
+            data.lines[valid], baselines[valid], data.sides[valid], threshold, lower_threshold)
+
+        # One bucket per (stat, direction), counted in a single pass
+        buckets = data.stat_indices[valid] * len(VALUE_DIRECTIONS) + directions
+        bets = np.bincount(buckets, minlength=bucket_count)
+        wins = np.bincount(buckets, weights=data.wins[valid], minlength=bucket_count)
+        pushes = np.bincount(buckets, weights=data.pushes[valid], minlength=bucket_count)
+        profits = np.bincount(buckets, weights=data.profits[valid], minlength=bucket_count)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            results.append(pd.DataFrame({
+                'metric_type': metric_type,
+                'stat_type': np.repeat(STAT_TYPES, len(VALUE_DIRECTIONS)),
+                'value_direction': np.tile(VALUE_DIRECTIONS, len(STAT_TYPES)),
+                'bets': bets,
+                'wins': wins.astype(int),
+                'pushes': pushes.astype(int),
+                'hit_rate': wins / (bets - pushes),
+                'roi': profits / bets,
+            }))
+
+    results_df = pd.concat(results, ignore_index=True)
+    return results_df[results_df['bets'] > 0][RESULT_COLUMNS].reset_index(drop=True)
+
+
+def load_backtest_data(database, season: str, season_type: str) -> BacktestData:
+    """
+    Query a season's games and closing odds and join them
+
+    Args:
+        database: Database routed to a league schema
+        season: Season identifier (e.g., "2024-25")
+        season_type: The type of season (regular or playoffs)
+
+    Returns:
+        BacktestData of the season
+    """
+    stats_df = StatsRepository(database).query_season_stats(season, season_type)
+    if stats_df.empty:
+        return build_backtest_data(stats_df, pd.DataFrame())
+
+    # Pad by a day on both sides; the join on Eastern game date does the exact matching
+    start_time_from = (stats_df['game_date'].min() - timedelta(days=1)).tz_localize(GAME_DATE_TIMEZONE)
+    start_time_to = (stats_df['game_date'].max() + timedelta(days=2)).tz_localize(GAME_DATE_TIMEZONE)
+    closing_props_df = OddsRepository(database).get_closing_props_frame(
+        start_time_from.to_pydatetime(), start_time_to.to_pydatetime())
+
+    logger.info(f"Backtesting {len(closing_props_df)} closing props against "
+                f"{len(stats_df)} games of {database.schema} {season} {season_type}")
+    return build_backtest_data(stats_df, closing_props_df)
+
+
+def _run_task(task: BacktestTask, connection_string: Optional[str],
+              threshold: float, lower_threshold: float) -> pd.DataFrame:
+    """Backtest one league season; runs in a worker process with its own engine"""
+    from database.database import Database
+    from database.utils import get_engine
+
+    schema, season, season_type = task
+    data = load_backtest_data(Database(engine=get_engine(connection_string), schema=schema), season, season_type)
+    if len(data) == 0:
+        return pd.DataFrame(columns=['league', 'season', 'season_type'] + RESULT_COLUMNS)
+
+    return evaluate(data, threshold, lower_threshold).assign(
+        league=schema, season=season, season_type=season_type)
+
+
+def run_backtests(tasks: List[BacktestTask], connection_string: Optional[str] = None,
+                  threshold: float = 0.1, lower_threshold: float = 0.03,
+                  max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Backtest several league seasons in parallel processes
+
+    Args:
+        tasks: (schema, season, season_type) to backtest
+        connection_string: SQLAlchemy connection string (defaults to the secrets file)
+        threshold: Threshold for strong value, see ValueIndicator
+        lower_threshold: Threshold for positive value, see ValueIndicator
+        max_workers: Worker processes (one per CPU by default)
+
+    Returns:
+        DataFrame with league, season, season_type and RESULT_COLUMNS
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_run_task, tasks, [connection_string] * len(tasks),
+                                    [threshold] * len(tasks), [lower_threshold] * len(tasks)))
+
+    return pd.concat(results, ignore_index=True)[['league', 'season', 'season_type'] + RESULT_COLUMNS]
+
+
+def parse_task(spec: str) -> BacktestTask:
+    """Parse "schema:season[:season type]", e.g. "nba:2024-25:Playoffs" or "wnba:2025" """
+    schema, season, *season_type = spec.split(':', 2)
+    return schema, season, season_type[0] if season_type else 'Regular Season'
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Backtest the value indicator on closing odds")
+    parser.add_argument("seasons", nargs="+", type=parse_task,
+                        help='schema:season[:season type], e.g. nba:2024-25:Playoffs wnba:2025')
+    parser.add_argument("--threshold", type=float, default=0.1)
+    parser.add_argument("--lower-threshold", type=float, default=0.03)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--output", default=None, help="Also write the results to this CSV file")
+    parser.add_argument("--connection-string", default=None,
+                        help="SQLAlchemy connection string (defaults to the secrets file)")
+    args = parser.parse_args()
+
+    backtest_df = run_backtests(args.seasons, args.connection_string,
+                                args.threshold, args.lower_threshold, args.workers)
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(backtest_df)
+    if args.output:
+        backtest_df.to_csv(args.output, index=False)
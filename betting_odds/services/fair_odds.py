@@ -0,0 +1,101 @@
+"""
+No-vig fair prices and expected value across bookmakers.
+
+Every bookmaker quoting both sides of a line implies an over and an under
+probability that add up to more than 1 (the vig). Scaling them back to 1
+gives that bookmaker's fair over probability; the mean over all bookmakers
+is the consensus fair probability of the line. The expected value of the
+best available price is then measured against that consensus.
+"""
+import numpy as np
+import pandas as pd
+
+# Columns identifying one offered line across bookmakers
+LINE_KEY = ['game_id', 'player_name', 'prop_type', 'line']
+
+FAIR_ODDS_COLUMNS = LINE_KEY + ['over_under_bet', 'bookie', 'best_odds', 'fair_probability',
+                                'fair_odds', 'expected_value', 'bookmakers']
+
+
+def implied_probability(decimal_odds) -> np.ndarray:
+    """Implied probability of decimal odds, NaN where the odds are not a valid price"""
+    decimal_odds = np.asarray(decimal_odds, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(decimal_odds > 1, 1 / decimal_odds, np.nan)
+
+
+def remove_vig(over_odds, under_odds) -> np.ndarray:
+    """
+    Fair over probability of over/under price pairs, removing the vig
+    multiplicatively (each side's implied probability divided by their sum)
+
+    Args:
+        over_odds: Decimal over odds
+        under_odds: Decimal under odds of the same lines
+
+    Returns:
+        Fair over probabilities; the fair under probability is one minus it.
+        NaN where either side is missing
+    """
+    over_probability = implied_probability(over_odds)
+    return over_probability / (over_probability + implied_probability(under_odds))
+
+
+def best_prices(props_df: pd.DataFrame, odds_column: str) -> pd.DataFrame:
+    """
+    Best price per line for one side across bookmakers
+
+    Args:
+        props_df: Snapshot with LINE_KEY, bookmaker and the odds columns
+        odds_column: over_odds or under_odds
+
+    Returns:
+        DataFrame with LINE_KEY, bookie and best_odds, one row per line; the
+        bookmaker name breaks ties like OddsRepository.get_best_odds_for_games
+    """
+    return (props_df[props_df[odds_column] > 0]
+            .sort_values([odds_column, 'bookmaker'], ascending=[False, True])
+            .drop_duplicates(LINE_KEY)
+            [LINE_KEY + ['bookmaker', odds_column]]
+            .rename(columns={'bookmaker': 'bookie', odds_column: 'best_odds'}))
+
+
+def compute_fair_odds(props_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Consensus fair probability and expected value of the best price for
+    every side of every line in a snapshot
+
+    Args:
+        props_df: One row per (game, player, prop type, line, bookmaker) with
+            over_odds and under_odds, see OddsRepository.get_latest_props_frame
+
+    Returns:
+        DataFrame with FAIR_ODDS_COLUMNS, one row per line and side, sorted by
+        expected value (best first). expected_value is the profit per unit
+        staked at best_odds; bookmakers is the number of two-sided quotes in
+        the consensus. Lines no bookmaker quotes on both sides get NaN
+        probabilities and expected value
+    """
+    if props_df.empty:
+        return pd.DataFrame(columns=FAIR_ODDS_COLUMNS)
+
+    props_df = props_df.assign(fair_over_probability=remove_vig(props_df['over_odds'], props_df['under_odds']))
+    consensus = (props_df.groupby(LINE_KEY, sort=False, dropna=False)['fair_over_probability']
+                 .agg(['mean', 'count'])
+                 .rename(columns={'mean': 'fair_over_probability', 'count': 'bookmakers'}))
+
+    sides = []
+    for over_under_bet, odds_column in (('over', 'over_odds'), ('under', 'under_odds')):
+        side_prices = best_prices(props_df, odds_column).join(consensus, on=LINE_KEY)
+
+        fair_probability = side_prices['fair_over_probability'].to_numpy()
+        if over_under_bet == 'under':
+            fair_probability = 1 - fair_probability
+        sides.append(side_prices.assign(over_under_bet=over_under_bet, fair_probability=fair_probability))
+
+    fair_odds_df = pd.concat(sides, ignore_index=True)
+    fair_odds_df['fair_odds'] = 1 / fair_odds_df['fair_probability']
+    fair_odds_df['expected_value'] = fair_odds_df['fair_probability'] * fair_odds_df['best_odds'] - 1
+
+    return (fair_odds_df.sort_values('expected_value', ascending=False, na_position='last')
+            [FAIR_ODDS_COLUMNS].reset_index(drop=True))
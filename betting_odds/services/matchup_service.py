@@ -1,10 +1,14 @@
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable
 from datetime import datetime
 
+import pandas as pd
+
 from betting_odds.data_access.odds_repository import OddsRepository
 from betting_odds.models.matchup import Matchup
-from betting_odds.models.orm_models import PlayerPropORM
+from betting_odds.models.matchup_props import BestLineOdds, MatchupBestOdds, MatchupProps
+from betting_odds.models.orm_models import CurrentPlayerPropORM
+from betting_odds.services.fair_odds import compute_fair_odds
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +25,7 @@ class MatchupService:
         """
         self.odds_repository = OddsRepository(database)
 
-    def get_player_props_for_matchup(self, matchup: Matchup) -> Dict[str, List[PlayerPropORM]]:
+    def get_player_props_for_matchup(self, matchup: Matchup) -> Dict[str, List[CurrentPlayerPropORM]]:
         """
         Get all player props for a specific matchup, grouped by player name
 
@@ -34,7 +38,106 @@ class MatchupService:
         # Fetch all props for the game
         props = self.odds_repository.get_latest_props_for_game(matchup)
 
-        # Group by player name
+        return self._group_props_by_player_name(props)
+
+    def get_matchup_props(self, matchup: Matchup) -> MatchupProps:
+        """
+        Get the latest props of a matchup together with the time they were retrieved,
+        using a single query
+
+        Args:
+            matchup: The matchup to get props for
+
+        Returns:
+            MatchupProps with the snapshot time and the props grouped by player name
+        """
+        props = self.odds_repository.get_latest_props_for_game(matchup)
+
+        # Every row of the latest snapshot shares the same job_start_time_utc
+        latest_update_time_utc = max(
+            (prop.job_start_time_utc for prop in props if prop.job_start_time_utc), default=None)
+
+        return MatchupProps(
+            latest_update_time_utc=latest_update_time_utc,
+            player_props_by_name=self._group_props_by_player_name(props)
+        )
+
+    def get_matchups_props(self, game_ids: Iterable[str]) -> Dict[str, MatchupProps]:
+        """
+        Get the latest props of several matchups (e.g. the whole slate) with a single query
+
+        Args:
+            game_ids: Game ids of the matchups to get props for
+
+        Returns:
+            Dictionary mapping game ids to their MatchupProps; games without
+            props get an empty MatchupProps
+        """
+        game_ids = list(game_ids)
+        props = self.odds_repository.get_latest_props_for_games(game_ids)
+
+        props_by_game_id: Dict[str, List[CurrentPlayerPropORM]] = {
+            game_id: [] for game_id in game_ids}
+        for prop in props:
+            props_by_game_id[prop.game_id].append(prop)
+
+        return {
+            game_id: MatchupProps(
+                latest_update_time_utc=max(
+                    (prop.job_start_time_utc for prop in game_props if prop.job_start_time_utc),
+                    default=None),
+                player_props_by_name=self._group_props_by_player_name(game_props)
+            )
+            for game_id, game_props in props_by_game_id.items()
+        }
+
+    def get_matchups_best_odds(self, game_ids: Iterable[str]) -> Dict[str, MatchupBestOdds]:
+        """
+        Get the best over/under odds per line for several matchups, reduced in SQL
+
+        Args:
+            game_ids: Game ids of the matchups to get odds for
+
+        Returns:
+            Dictionary mapping game ids to their MatchupBestOdds; games without
+            props get an empty MatchupBestOdds
+        """
+        game_ids = list(game_ids)
+        best_odds = self.odds_repository.get_best_odds_for_games(game_ids)
+
+        best_odds_by_game_id: Dict[str, List[BestLineOdds]] = {
+            game_id: [] for game_id in game_ids}
+        for line_odds in best_odds:
+            best_odds_by_game_id[line_odds.game_id].append(line_odds)
+
+        return {
+            game_id: MatchupBestOdds(
+                latest_update_time_utc=max(
+                    (line_odds.job_start_time_utc for line_odds in game_odds if line_odds.job_start_time_utc),
+                    default=None),
+                best_odds_by_player_name=self._group_props_by_player_name(game_odds)
+            )
+            for game_id, game_odds in best_odds_by_game_id.items()
+        }
+
+    def get_matchups_fair_odds(self, game_ids: Iterable[str]) -> pd.DataFrame:
+        """
+        Get the no-vig consensus probability and expected value of the best
+        price for every line of several matchups
+
+        Args:
+            game_ids: Game ids of the matchups to get odds for
+
+        Returns:
+            DataFrame with one row per game, player, prop type, line and side,
+            best expected value first; see fair_odds.compute_fair_odds
+        """
+        props_df = self.odds_repository.get_latest_props_frame(list(game_ids))
+        return compute_fair_odds(props_df)
+
+    @staticmethod
+    def _group_props_by_player_name(props: list) -> Dict[str, list]:
+        """Group props (or anything else with a player_name) by player name"""
         player_props_by_player_name = {}
         for prop in props:
             if prop.player_name not in player_props_by_player_name:
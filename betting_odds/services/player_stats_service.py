@@ -1,13 +1,19 @@
 import logging
 from typing import Dict, Optional
 
+import numpy as np
 import pandas as pd
 
 from betting_odds.data_access.stats_repository import StatsRepository
-from betting_odds.models.player_stats_summary import PlayerStatsSummary
+from betting_odds.models.player_stats_summary import HIT_RATE_WINDOW_GAMES, STAT_TYPES, PlayerStatsSummary
+from betting_odds.services.stat_metrics import get_metric
 
 logger = logging.getLogger(__name__)
 
+# Columns summarize_player_stats_frame reads; all carried by the covering
+# game_stats index, so the slate query can be answered by an index-only scan
+SUMMARY_COLUMNS = ['player_name', 'player_id', 'game_date', *STAT_TYPES, 'minutes', 'is_away']
+
 
 class PlayerStatsService:
     """Service for querying and summarizing player statistics"""
@@ -36,6 +42,41 @@ class PlayerStatsService:
             return {}
 
 
+    def query_players_stats_frame(self, player_names: list, season: str,
+                                  season_type: str, date_from: Optional[str] = None,
+                                  date_to: Optional[str] = None,
+                                  columns: Optional[list[str]] = SUMMARY_COLUMNS) -> pd.DataFrame:
+        """
+        Query stats for multiple players as a single long-format dataframe
+
+        Args:
+            player_names: List of player names to query
+            season: Season identifier (e.g., "2024-2025")
+            season_type: Type of season ("regular", "playoffs")
+            date_from: Optional start date for filtering (inclusive, applied in SQL)
+            date_to: Optional end date for filtering (inclusive, applied in SQL)
+            columns: Names from GAME_STATS_COLUMNS to project, None for all;
+                the columns the summaries need by default
+
+        Returns:
+            Dataframe with one row per player game, identified by player_name;
+            empty if the query fails
+        """
+        logger.info(f"Querying all player stats for season: {season} and type: {season_type}")
+
+        try:
+            return self.stats_repository.query_players_stats(
+                player_names=player_names,
+                season=season,
+                season_type=season_type,
+                columns=columns,
+                date_from=date_from,
+                date_to=date_to
+            )
+        except Exception as e:
+            logger.error(f"Error querying stats for {len(player_names)} players: {str(e)}")
+            return pd.DataFrame()
+
     def query_player_stats(self, player_names: list, season: str,
                            season_type: str, date_from: Optional[str] = None,
                            date_to: Optional[str] = None) -> Dict[str, pd.DataFrame]:
@@ -46,27 +87,24 @@ class PlayerStatsService:
             player_names: List of player names to query
             season: Season identifier (e.g., "2024-2025")
             season_type: Type of season ("regular", "playoffs")
-            date_from: Optional start date for filtering
-            date_to: Optional end date for filtering
+            date_from: Optional start date for filtering (inclusive, applied in SQL)
+            date_to: Optional end date for filtering (inclusive, applied in SQL)
 
         Returns:
             Dictionary with player names as keys and their stats dataframes as values
         """
-        logger.info(f"Querying all player stats for season: {season} and type: {season_type}")
+        stats_df = self.query_players_stats_frame(
+            player_names, season, season_type, date_from, date_to, columns=None)
+
+        # Split the single result set by player in memory
         player_stats_by_name = {}
+        if not stats_df.empty:
+            for player_name, player_df in stats_df.groupby('player_name', sort=False, observed=True):
+                player_stats_by_name[player_name] = player_df.reset_index(drop=True)
 
+        # Players without any games (or a failed query) still get an (empty) entry
         for player_name in player_names:
-            try:
-                stats_df = self.stats_repository.query_player_stats(
-                    player_name=player_name,
-                    season=season,
-                    season_type=season_type
-                )
-                player_stats_by_name[player_name] = stats_df
-            except Exception as e:
-                logger.error(
-                    f"Error querying stats for {player_name}: {str(e)}")
-                # Empty dataframe if error
+            if player_name not in player_stats_by_name:
                 player_stats_by_name[player_name] = pd.DataFrame()
 
         return player_stats_by_name
@@ -81,66 +119,127 @@ class PlayerStatsService:
         Returns:
             Dictionary with player names as keys and PlayerStatsSummary objects as values
         """
-        player_summaries = {}
+        frames = [stats_df for stats_df in player_stats_by_name.values() if not stats_df.empty]
+        if not frames:
+            return {}
 
-        for player_name, stats_df in player_stats_by_name.items():
-            if stats_df.empty:
-                continue
+        return self.summarize_player_stats_frame(pd.concat(frames, ignore_index=True))
 
-            # Get basic info
-            try:
+    def summarize_player_stats_frame(self, stats_df: pd.DataFrame) -> Dict[str, PlayerStatsSummary]:
+        """
+        Summarize a long-format dataframe of many players' games in one grouped pass
 
-                player_id = stats_df.iloc[0]['player_id']
+        Season average, season median and last 5/10 game averages are computed
+        for every player and stat at once. Players with fewer than N games get
+        their season average as last N average. Each player's stats are also
+        kept sorted per HitRateWindow for PlayerStatsSummary.get_hit_rates.
 
-                stat_types = ['points', 'rebounds', 'assists', 'three_pointers_made']
+        Args:
+            stats_df: One row per player game with player_name, player_id,
+                game_date and the STAT_TYPES columns
 
-                # Calculate season averages
-                season_avg_by_stats = {}
-                season_median_by_stats = {}
+        Returns:
+            Dictionary with player names as keys and PlayerStatsSummary objects as values
+        """
+        if stats_df.empty:
+            return {}
 
-                # Sort by date to get recent games
+        try:
+            # Most recent game first within each player
+            stats_df = stats_df.sort_values(['player_name', 'game_date'], ascending=[True, False])
+            grouped = stats_df.groupby('player_name', sort=False, observed=True)
+
+            # 0 for each player's most recent game, 1 for the one before, ...
+            recency = grouped.cumcount().to_numpy()
+            games_count = grouped.size()
+            player_ids = grouped['player_id'].first()
+
+            season_avg = grouped[STAT_TYPES].mean()
+            season_median = grouped[STAT_TYPES].median()
+
+            metric_frames = [season_avg, season_median]
+            for last_n in (5, 10):
+                last_n_avg = (stats_df[recency < last_n]
+                              .groupby('player_name', sort=False, observed=True)[STAT_TYPES].mean()
+                              .reindex(season_avg.index))
+                # Not enough games: fall back to the season average
+                has_enough_games = (games_count >= last_n).to_numpy()[:, None]
+                metric_frames.append(pd.DataFrame(
+                    np.where(has_enough_games, last_n_avg.to_numpy(), season_avg.to_numpy()),
+                    index=season_avg.index, columns=STAT_TYPES))
+
+            # (metrics, players, stats), metrics in SummaryMetric order
+            summary_values = np.stack([metric_frame.round(2).to_numpy(dtype=np.float64)
+                                       for metric_frame in metric_frames])
+
+            # Per-game arrays for the other registered metrics; stats are whole
+            # numbers, so float32 holds them exactly, and decimal minutes closely
+            game_values = stats_df[STAT_TYPES].to_numpy(dtype=np.float32)
+            game_minutes = (stats_df['minutes'].to_numpy(dtype=np.float32)
+                            if 'minutes' in stats_df else None)
+            game_is_away = stats_df['is_away'].to_numpy(dtype=bool) if 'is_away' in stats_df else None
+
+            sorted_window_values, window_block_ends = self._sort_window_values(
+                game_values, recency, games_count.to_numpy())
 
+        except Exception as e:
+            logger.error(f"Error summarizing stats: {str(e)}")
+            return {}
 
-                stats_df = stats_df.sort_values('game_date', ascending=False)
+        # Each player's games are a contiguous block of the sorted frame
+        game_block_ends = games_count.cumsum().to_numpy()
+        game_block_starts = game_block_ends - games_count.to_numpy()
 
-                for stat in stat_types:
-                    season_avg_by_stats[stat] = round(float(stats_df[stat].mean()), 2)
-                    season_median_by_stats[stat] = round(float(stats_df[stat].median()), 2)
+        player_summaries = {}
+        for index, player_name in enumerate(season_avg.index):
+            games = slice(game_block_starts[index], game_block_ends[index])
+            player_summaries[player_name] = PlayerStatsSummary(
+                player_id=int(player_ids[player_name]),
+                player_name=player_name,
+                summary_values=np.ascontiguousarray(summary_values[:, index, :]),
+                game_values=game_values[games],
+                game_minutes=game_minutes[games] if game_minutes is not None else None,
+                game_is_away=game_is_away[games] if game_is_away is not None else None,
+                get_metric=get_metric,
+                sorted_window_values=tuple(
+                    window_values[(block_ends[index - 1] if index else 0):block_ends[index]]
+                    for window_values, block_ends in zip(sorted_window_values, window_block_ends)),
+            )
 
-                # Calculate recent game averages (last 5 and last 10)
-                last_5_avg_by_stats = {}
-                last_10_avg_by_stats = {}
+        return player_summaries
 
-                for stat in stat_types:
-                    # Handle cases where there aren't 5 or 10 games
-                    games_count = len(stats_df)
+    @staticmethod
+    def _sort_window_values(game_values: np.ndarray, recency: np.ndarray, games_count: np.ndarray):
+        """
+        Sort every player's stats within each HitRateWindow
 
-                    if games_count >= 5:
-                        last_5_avg_by_stats[stat] = round(float(
-                            stats_df.iloc[:5][stat].mean()), 2)
-                    else:
-                        last_5_avg_by_stats[stat] = season_avg_by_stats[stat]
+        Args:
+            game_values: (games, stats) values, grouped by player, most recent first
+            recency: 0 for each player's most recent game, 1 for the one before, ...
+            games_count: Number of games of each player, in block order
 
-                    if games_count >= 10:
-                        last_10_avg_by_stats[stat] = round(float(
-                            stats_df.iloc[:10][stat].mean()),2)
-                    else:
-                        last_10_avg_by_stats[stat] = season_avg_by_stats[stat]
+        Returns:
+            Tuple of (sorted values, block ends) per window; sorted values hold
+            each player's games in the window as a contiguous block whose
+            columns are sorted ascending, and block ends are the cumulative
+            block sizes
+        """
+        player_codes = np.repeat(np.arange(len(games_count)), games_count)
 
-                # Create the PlayerStatsSummary
-                summary = PlayerStatsSummary(
-                    player_id=player_id,
-                    player_name=player_name,
-                    season_avg_by_stats=season_avg_by_stats,
-                    season_median_by_stats=season_median_by_stats,
-                    last_5_avg_by_stats=last_5_avg_by_stats,
-                    last_10_avg_by_stats=last_10_avg_by_stats
-                )
+        sorted_window_values = []
+        window_block_ends = []
+        for window_games in HIT_RATE_WINDOW_GAMES:
+            in_window = recency < window_games if window_games is not None else slice(None)
+            window_values = game_values[in_window]
+            window_codes = player_codes[in_window]
 
-                player_summaries[player_name] = summary
+            # Sort by value within each player's block, one stat column at a time
+            sorted_values = np.empty_like(window_values)
+            for column in range(window_values.shape[1]):
+                order = np.lexsort((window_values[:, column], window_codes))
+                sorted_values[:, column] = window_values[order, column]
 
-            except Exception as e:
-                logger.error(
-                    f"Error summarizing stats for {player_name}: {str(e)}")
+            sorted_window_values.append(sorted_values)
+            window_block_ends.append(np.bincount(window_codes, minlength=len(games_count)).cumsum())
 
-        return player_summaries
+        return sorted_window_values, window_block_ends
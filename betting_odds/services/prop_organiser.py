@@ -2,7 +2,7 @@ import logging
 from dataclasses import dataclass
 from typing import List, Dict
 
-from betting_odds.models.orm_models import PlayerPropORM
+from betting_odds.models.matchup_props import BestLineOdds
 
 logger = logging.getLogger(__name__)
 
@@ -20,57 +20,27 @@ class BestBookieOdds:
     best_odds: float
 
 
-def get_best_bookie_odds_for_each_prop_type_for_a_player(selected_props_type: List[PlayerPropORM]) -> tuple[Dict[float, BestBookieOdds], Dict[float, BestBookieOdds]]:
+def get_best_bookie_odds_for_each_prop_type_for_a_player(selected_best_odds: List[BestLineOdds]) -> tuple[Dict[float, BestBookieOdds], Dict[float, BestBookieOdds]]:
     """
-    Get the best odds for each prop type for each player
+    Split a player's best odds for one prop type into over and under lines
+
+    The best price per line is already picked in SQL
+    (OddsRepository.get_best_odds_for_games), so this is a single pass.
 
     Args:
-        selected_props_type_by_player_name: Dictionary mapping player names to their props
+        selected_best_odds: Best line odds of one player for one prop type
 
     Returns:
-        Dictionary mapping player names to their best odds
+        Tuple of (best over odds by line, best under odds by line)
     """
-    line_to_over_odds: dict[float, list[PlayerPropORM]] = {}
-    line_to_under_odds: dict[float, list[PlayerPropORM]] = {}
-
-    for prop in selected_props_type:
-        if prop.over_odds:
-            if prop.line not in line_to_over_odds:
-                line_to_over_odds[prop.line] = []
-            line_to_over_odds[prop.line].append(prop)
-        if prop.under_odds:
-            if prop.line not in line_to_under_odds:
-                line_to_under_odds[prop.line] = []
-            line_to_under_odds[prop.line].append(prop)
-
     best_over_odds_by_line = {}
-    for line, props in line_to_over_odds.items():
-        # Find the best over odds for each line
-        best_over_odds = 0
-        best_over_odds_object = None
-        for prop in props:
-            if prop.over_odds and prop.over_odds > best_over_odds:
-                best_over_odds = prop.over_odds
-                best_over_odds_object = prop
-        if best_over_odds_object:
-            best_over_odds_by_line[line] = BestBookieOdds(
-                bookie=best_over_odds_object.bookmaker,
-                best_odds=best_over_odds
-            )
-
     best_under_odds_by_line = {}
-    for line, props in line_to_under_odds.items():
-        # Find the best under odds for each line
-        best_under_odds = 0
-        best_under_odds_object = None
-        for prop in props:
-            if prop.under_odds and prop.under_odds > best_under_odds:
-                best_under_odds = prop.under_odds
-                best_under_odds_object = prop
-        if best_under_odds_object:
-            best_under_odds_by_line[line] = BestBookieOdds(
-                bookie=best_under_odds_object.bookmaker,
-                best_odds=best_under_odds
-            )
+
+    for line_odds in selected_best_odds:
+        best_odds = BestBookieOdds(bookie=line_odds.bookie, best_odds=line_odds.best_odds)
+        if line_odds.over_under_bet == "over":
+            best_over_odds_by_line[line_odds.line] = best_odds
+        else:
+            best_under_odds_by_line[line_odds.line] = best_odds
 
     return (best_over_odds_by_line, best_under_odds_by_line)
@@ -0,0 +1,112 @@
+"""
+Registry of the baseline metrics a PlayerStatsSummary can hold.
+
+A metric takes one player's values of a stat, minutes and home/away flags
+as arrays (one entry per game, most recent first) and returns a single
+baseline value. Metrics are looked up by the name shown in the odds pages'
+"Metrics Type" selectbox and evaluated lazily: a PlayerStatsSummary computes
+a metric for a stat the first time it is requested and memoizes it.
+"""
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# (stat values, minutes, is_away), all ordered most recent game first -> baseline value
+StatMetric = Callable[[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]], float]
+
+_METRICS: Dict[str, StatMetric] = {}
+
+
+def register_metric(name: str, metric: StatMetric) -> None:
+    """
+    Register a metric under the name the pages display
+
+    Args:
+        name: Display name, e.g. "Last 5 Games Average"
+        metric: Function computing the baseline from a player's games
+    """
+    _METRICS[name] = metric
+
+
+def get_metric(name: str) -> Optional[StatMetric]:
+    """Get a registered metric by name, or None if it does not exist"""
+    return _METRICS.get(name)
+
+
+def metric_names() -> List[str]:
+    """Names of all registered metrics, in registration order"""
+    return list(_METRICS)
+
+
+def season_average(values: np.ndarray, minutes=None, is_away=None) -> float:
+    return values.mean()
+
+
+def season_median(values: np.ndarray, minutes=None, is_away=None) -> float:
+    return np.median(values)
+
+
+def last_n_average(n: int) -> StatMetric:
+    """Average of the last n games; the season average if fewer were played"""
+    def metric(values: np.ndarray, minutes=None, is_away=None) -> float:
+        return values[:n].mean()
+    return metric
+
+
+def ewma(span: int) -> StatMetric:
+    """Exponentially weighted average that favours recent games"""
+    decay = 1 - 2 / (span + 1)
+
+    def metric(values: np.ndarray, minutes=None, is_away=None) -> float:
+        # Same weights as pandas' ewm(span=span, adjust=True) over the games oldest first
+        weights = decay ** np.arange(len(values))
+        return np.dot(weights, values) / weights.sum()
+    return metric
+
+
+def trimmed_mean(proportion: float) -> StatMetric:
+    """Season average ignoring the given proportion of highest and lowest games"""
+    def metric(values: np.ndarray, minutes=None, is_away=None) -> float:
+        values = np.sort(values)
+        cut = int(len(values) * proportion)
+        return values[cut:len(values) - cut].mean()
+    return metric
+
+
+def per_minute_rate(minutes_window: int) -> StatMetric:
+    """Season per-minute rate scaled by the average minutes of the last games"""
+    def metric(values: np.ndarray, minutes=None, is_away=None) -> float:
+        if minutes is None:
+            return np.nan
+        played = minutes > 0
+        if not played.any():
+            return np.nan
+        played_minutes = minutes[played]
+        rate = values[played].sum() / played_minutes.sum()
+        return rate * played_minutes[:minutes_window].mean()
+    return metric
+
+
+def venue_average(away: bool) -> StatMetric:
+    """Average over home or away games only; the season average if there are none"""
+    def metric(values: np.ndarray, minutes=None, is_away=None) -> float:
+        if is_away is None:
+            return values.mean()
+        venue_values = values[is_away == away]
+        if len(venue_values) == 0:
+            return values.mean()
+        return venue_values.mean()
+    return metric
+
+
+register_metric("Last 5 Games Average", last_n_average(5))
+register_metric("Last 10 Games Average", last_n_average(10))
+register_metric("Season Average", season_average)
+register_metric("Season Median", season_median)
+register_metric("Last 3 Games Average", last_n_average(3))
+register_metric("Last 15 Games Average", last_n_average(15))
+register_metric("Weighted Recent Form (EWMA)", ewma(5))
+register_metric("Trimmed Season Average (10%)", trimmed_mean(0.1))
+register_metric("Per-Minute Rate x Last 5 Minutes", per_minute_rate(5))
+register_metric("Home Games Average", venue_average(False))
+register_metric("Away Games Average", venue_average(True))
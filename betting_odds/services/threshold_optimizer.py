@@ -0,0 +1,278 @@
+"""
+Grid search of the value indicator thresholds and baseline metric per league
+and stat, on the same closing odds and outcomes as the backtest.
+
+For every (metric, threshold, lower threshold) on the grid, the bets the
+indicator flags as positive or strong positive are settled at the best
+closing price. The latest season of each league is held out: the
+combination with the highest ROI on the earlier seasons (with at least
+--min-bets flagged bets) wins for each league and stat, and its hit rate
+and ROI on the held-out season are what the config the odds pages load at
+startup reports. The config holds one setting per league and stat, so all
+seasons of a league must be of the same season type:
+
+    python -m betting_odds.services.threshold_optimizer nba:2023-24:Playoffs nba:2024-25:Playoffs wnba:2024 wnba:2025
+
+The joined season data is cached on disk (--cache-dir), so repeated runs
+only query the database for seasons not seen before (or with --refresh).
+"""
+import argparse
+import json
+import logging
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from betting_odds.models.player_stats_summary import STAT_TYPES
+from betting_odds.services.backtest import BACKTEST_METRICS, BacktestData, BacktestTask, load_backtest_data, parse_task
+from betting_odds.services.value_prop_indicator import POSITIVE, VALUE_THRESHOLDS_PATH, classify_value_directions
+
+logger = logging.getLogger(__name__)
+
+THRESHOLD_GRID = (0.05, 0.075, 0.1, 0.125, 0.15, 0.2, 0.25)
+LOWER_THRESHOLD_GRID = (0.0, 0.01, 0.02, 0.03, 0.04, 0.05)
+DEFAULT_MIN_BETS = 100
+DEFAULT_CACHE_DIR = Path(".backtest_cache")
+
+GRID_COLUMNS = ['metric_type', 'threshold', 'lower_threshold', 'stat_type', 'bets', 'wins', 'pushes', 'profit']
+
+SETTING_KEY = ['league', 'stat_type', 'metric_type', 'threshold', 'lower_threshold']
+
+CHOSEN_COLUMNS = ['league', 'stat_type', 'metric_type', 'threshold', 'lower_threshold', 'train_bets', 'train_roi',
+                  'holdout_season', 'bets', 'hit_rate', 'roi']
+
+
+def threshold_pairs(thresholds: Sequence[float] = THRESHOLD_GRID,
+                    lower_thresholds: Sequence[float] = LOWER_THRESHOLD_GRID) -> List[Tuple[float, float]]:
+    """(threshold, lower_threshold) combinations of the grid, lower below upper"""
+    return [(threshold, lower_threshold) for threshold, lower_threshold in product(thresholds, lower_thresholds)
+            if lower_threshold < threshold]
+
+
+def evaluate_grid(data: BacktestData, pairs: List[Tuple[float, float]]) -> pd.DataFrame:
+    """
+    Settle the bets flagged positive or strong positive for every metric and
+    threshold pair
+
+    Args:
+        data: Joined closing lines and outcomes of one season
+        pairs: (threshold, lower_threshold) combinations to evaluate
+
+    Returns:
+        DataFrame with GRID_COLUMNS; counts and profit are summed per stat
+        so seasons can be added up
+    """
+    results = []
+    for metric_type in BACKTEST_METRICS:
+        baselines = data.baselines_by_metric[metric_type]
+        valid = baselines > 0
+        lines, baselines, sides = data.lines[valid], baselines[valid], data.sides[valid]
+        stat_indices = data.stat_indices[valid]
+        wins, pushes, profits = data.wins[valid], data.pushes[valid], data.profits[valid]
+
+        for threshold, lower_threshold in pairs:
+            flagged = classify_value_directions(lines, baselines, sides, threshold, lower_threshold) <= POSITIVE
+            flagged_stats = stat_indices[flagged]
+            results.append(pd.DataFrame({
+                'metric_type': metric_type,
+                'threshold': threshold,
+                'lower_threshold': lower_threshold,
+                'stat_type': STAT_TYPES,
+                'bets': np.bincount(flagged_stats, minlength=len(STAT_TYPES)),
+                'wins': np.bincount(flagged_stats, weights=wins[flagged], minlength=len(STAT_TYPES)),
+                'pushes': np.bincount(flagged_stats, weights=pushes[flagged], minlength=len(STAT_TYPES)),
+                'profit': np.bincount(flagged_stats, weights=profits[flagged], minlength=len(STAT_TYPES)),
+            }))
+
+    return pd.concat(results, ignore_index=True)[GRID_COLUMNS]
+
+
+def load_backtest_data_cached(task: BacktestTask, connection_string: Optional[str],
+                              cache_dir: Optional[Path], refresh: bool = False) -> BacktestData:
+    """
+    Load the joined data of a season, from the disk cache when available
+
+    Args:
+        task: (schema, season, season_type)
+        connection_string: SQLAlchemy connection string (defaults to the secrets file)
+        cache_dir: Directory of the pickled joins, None to disable caching
+        refresh: Rebuild the cached join from the database
+
+    Returns:
+        BacktestData of the season
+    """
+    from database.database import Database
+    from database.utils import get_engine
+
+    schema, season, season_type = task
+    cache_path = cache_dir / f"{schema}_{season}_{season_type}.pkl".replace(' ', '_') if cache_dir else None
+    if cache_path and cache_path.exists() and not refresh:
+        with open(cache_path, 'rb') as cache_file:
+            return pickle.load(cache_file)
+
+    data = load_backtest_data(Database(engine=get_engine(connection_string), schema=schema), season, season_type)
+    if cache_path:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'wb') as cache_file:
+            pickle.dump(data, cache_file)
+    return data
+
+
+def _run_task(task: BacktestTask, connection_string: Optional[str], cache_dir: Optional[Path],
+              refresh: bool, pairs: List[Tuple[float, float]]) -> pd.DataFrame:
+    """Evaluate the grid on one league season; runs in a worker process"""
+    data = load_backtest_data_cached(task, connection_string, cache_dir, refresh)
+    logger.info(f"Evaluating {len(pairs) * len(BACKTEST_METRICS)} settings on {len(data)} lines of {task}")
+    return evaluate_grid(data, pairs).assign(league=task[0], season=task[1], season_type=task[2])
+
+
+def _check_season_types(seasons_df: pd.DataFrame) -> None:
+    """
+    Raise ValueError if a league mixes season types: their lines and outcomes
+    differ, and a regular season must not be held out against playoffs
+    """
+    season_types_by_league = seasons_df.groupby('league')['season_type'].unique()
+    mixed = {league: sorted(season_types) for league, season_types in season_types_by_league.items()
+             if len(season_types) > 1}
+    if mixed:
+        raise ValueError(f"Each league must be tuned on a single season type, got {mixed}")
+
+
+def _sum_settings(grid_df: pd.DataFrame) -> pd.DataFrame:
+    """Add up the seasons of each setting and compute its hit rate and ROI"""
+    grid_df = grid_df.groupby(SETTING_KEY, as_index=False)[['bets', 'wins', 'pushes', 'profit']].sum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return grid_df.assign(hit_rate=grid_df['wins'] / (grid_df['bets'] - grid_df['pushes']),
+                              roi=grid_df['profit'] / grid_df['bets'])
+
+
+def select_thresholds(grid_df: pd.DataFrame, min_bets: int = DEFAULT_MIN_BETS) -> pd.DataFrame:
+    """
+    Pick the best setting per league and stat on all but the latest season
+    and measure it on the latest one
+
+    Args:
+        grid_df: evaluate_grid results of every season, with league, season
+            and season_type
+        min_bets: Fewest flagged training bets a setting needs to be considered
+
+    Returns:
+        DataFrame with CHOSEN_COLUMNS; bets, hit_rate and roi are measured on
+        holdout_season, which played no part in the choice. Leagues with a
+        single season are left out
+
+    Raises:
+        ValueError: If a league's seasons are of different season types
+    """
+    _check_season_types(grid_df)
+    holdout_season_by_league = grid_df.groupby('league')['season'].max()
+    holdout_season = grid_df['league'].map(holdout_season_by_league)
+    is_holdout = grid_df['season'] == holdout_season
+
+    single_season_leagues = sorted(set(grid_df['league']) - set(grid_df.loc[~is_holdout, 'league']))
+    if single_season_leagues:
+        logger.warning(f"Leagues {single_season_leagues} have a single season to hold out, not tuning them")
+
+    train_df = _sum_settings(grid_df[~is_holdout])
+    train_df = train_df[train_df['bets'] >= min_bets]
+    best_df = train_df.loc[train_df.groupby(['league', 'stat_type'])['roi'].idxmax()]
+    best_df = best_df[SETTING_KEY + ['bets', 'roi']].rename(columns={'bets': 'train_bets', 'roi': 'train_roi'})
+
+    holdout_df = _sum_settings(grid_df[is_holdout])[SETTING_KEY + ['bets', 'hit_rate', 'roi']]
+    chosen_df = best_df.merge(holdout_df, on=SETTING_KEY, how='left').assign(
+        holdout_season=lambda chosen: chosen['league'].map(holdout_season_by_league))
+    return chosen_df[CHOSEN_COLUMNS].reset_index(drop=True)
+
+
+def optimize_thresholds(tasks: List[BacktestTask], connection_string: Optional[str] = None,
+                        cache_dir: Optional[Path] = DEFAULT_CACHE_DIR, refresh: bool = False,
+                        min_bets: int = DEFAULT_MIN_BETS, max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Pick the best metric and thresholds per league and stat, see select_thresholds
+
+    Args:
+        tasks: (schema, season, season_type) to optimize on, one season type
+            per league; the latest season of each league is held out and the
+            earlier ones are pooled
+        connection_string: SQLAlchemy connection string (defaults to the secrets file)
+        cache_dir: Directory of the pickled joins, None to disable caching
+        refresh: Rebuild the cached joins from the database
+        min_bets: Fewest flagged bets a setting needs to be considered
+        max_workers: Worker processes (one per CPU by default)
+
+    Returns:
+        DataFrame with CHOSEN_COLUMNS of the chosen settings
+
+    Raises:
+        ValueError: If a league's seasons are of different season types
+    """
+    # Fail before loading any season
+    _check_season_types(pd.DataFrame(tasks, columns=['league', 'season', 'season_type']))
+    pairs = threshold_pairs()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        grid_results = list(executor.map(
+            _run_task, tasks, [connection_string] * len(tasks), [cache_dir] * len(tasks),
+            [refresh] * len(tasks), [pairs] * len(tasks)))
+
+    return select_thresholds(pd.concat(grid_results, ignore_index=True), min_bets)
+
+
+def write_value_thresholds(best_df: pd.DataFrame, path: Path = VALUE_THRESHOLDS_PATH) -> None:
+    """
+    Write the chosen settings as {league: {stat_type: settings}}, keeping the
+    leagues of an existing config that were not optimized this time; the
+    reported bets, hit_rate and roi are out of sample (holdout_season)
+    """
+    config = {}
+    if path.exists():
+        with open(path) as config_file:
+            config = json.load(config_file)
+
+    for league, league_df in best_df.groupby('league'):
+        config[league] = {
+            row.stat_type: {
+                'metric_type': row.metric_type,
+                'threshold': float(row.threshold),
+                'lower_threshold': float(row.lower_threshold),
+                'train_bets': int(row.train_bets),
+                'train_roi': round(float(row.train_roi), 4),
+                'holdout_season': row.holdout_season,
+                # No bet flagged in the held-out season: nothing to report
+                'bets': 0 if pd.isna(row.bets) else int(row.bets),
+                'hit_rate': None if pd.isna(row.hit_rate) else round(float(row.hit_rate), 4),
+                'roi': None if pd.isna(row.roi) else round(float(row.roi), 4),
+            }
+            for row in league_df.itertuples()
+        }
+
+    with open(path, 'w') as config_file:
+        json.dump(config, config_file, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Tune the value indicator thresholds per league and stat")
+    parser.add_argument("seasons", nargs="+", type=parse_task,
+                        help='schema:season[:season type], e.g. nba:2024-25:Playoffs wnba:2025')
+    parser.add_argument("--min-bets", type=int, default=DEFAULT_MIN_BETS,
+                        help="Fewest flagged bets on the training seasons a setting needs to be considered")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR,
+                        help="Directory of the cached season joins")
+    parser.add_argument("--refresh", action="store_true", help="Rebuild the cached season joins")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--output", type=Path, default=VALUE_THRESHOLDS_PATH, help="Config file to write")
+    parser.add_argument("--connection-string", default=None,
+                        help="SQLAlchemy connection string (defaults to the secrets file)")
+    args = parser.parse_args()
+
+    chosen_df = optimize_thresholds(args.seasons, args.connection_string, args.cache_dir,
+                                    args.refresh, args.min_bets, args.workers)
+    print(chosen_df.to_string(index=False))
+    write_value_thresholds(chosen_df, args.output)
+    print(f"Wrote {args.output}")
@@ -0,0 +1,93 @@
+import heapq
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from betting_odds.models.matchup import Matchup
+from betting_odds.models.matchup_props import MatchupBestOdds
+from betting_odds.models.player_stats_summary import PlayerStatsSummary, prop_stat_type
+from betting_odds.models.value_prop import ValueProp
+from betting_odds.services.value_prop_indicator import (
+    ValueThresholds, classify_value_directions, get_value_thresholds)
+
+logger = logging.getLogger(__name__)
+
+
+def top_value_props(matchup_by_game_id: Dict[str, Matchup],
+                    matchup_best_odds_by_game_id: Dict[str, MatchupBestOdds],
+                    stats_summary_by_name: Dict[str, PlayerStatsSummary],
+                    metric_type: str,
+                    top_k: int,
+                    value_thresholds_by_stat: Optional[Dict[str, ValueThresholds]] = None) -> List[ValueProp]:
+    """
+    Score every side of every line on the slate against the players' baselines
+    and keep the top K
+
+    Lines are classified in one classify_value_directions pass; the ranking
+    keeps a bounded heap of K entries rather than sorting the whole slate.
+
+    Args:
+        matchup_by_game_id: Upcoming matchups by game id
+        matchup_best_odds_by_game_id: Best odds per line of each matchup
+        stats_summary_by_name: Stats summaries of the slate's players
+        metric_type: Name of a registered metric to use as the baseline
+        top_k: Number of props to keep
+        value_thresholds_by_stat: Thresholds per stat type, see
+            load_value_thresholds; stats without an entry, or tuned with
+            another metric than metric_type, use the defaults
+
+    Returns:
+        Up to top_k ValueProp, largest edge first; lines of players without
+        stats (or a zero baseline) are skipped
+    """
+    candidates = []
+    baselines = []
+    for game_id, matchup_best_odds in matchup_best_odds_by_game_id.items():
+        for player_name, best_odds in matchup_best_odds.best_odds_by_player_name.items():
+            stats_summary = stats_summary_by_name.get(player_name)
+            if stats_summary is None:
+                continue
+            for line_odds in best_odds:
+                candidates.append(line_odds)
+                baselines.append(stats_summary.get_stat_summary(
+                    prop_stat_type(line_odds.prop_type), metric_type))
+
+    if not candidates:
+        return []
+
+    lines = np.array([line_odds.line for line_odds in candidates], dtype=float)
+    baselines = np.array(baselines, dtype=float)
+    is_over = np.array([line_odds.over_under_bet == "over" for line_odds in candidates])
+
+    value_thresholds_by_stat = value_thresholds_by_stat or {}
+    value_thresholds = [get_value_thresholds(value_thresholds_by_stat, prop_stat_type(line_odds.prop_type),
+                                             metric_type)
+                        for line_odds in candidates]
+    directions = classify_value_directions(
+        lines, baselines, np.where(is_over, "over", "under"),
+        np.array([thresholds.threshold for thresholds in value_thresholds]),
+        np.array([thresholds.lower_threshold for thresholds in value_thresholds]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        edges = np.where(is_over, baselines - lines, lines - baselines) / baselines
+
+    scored = (index for index in np.flatnonzero(baselines > 0))
+    top_indices = heapq.nlargest(top_k, scored, key=edges.__getitem__)
+
+    logger.info(f"Scored {len(candidates)} lines, keeping the top {len(top_indices)}")
+    return [
+        ValueProp(
+            game_id=candidates[index].game_id,
+            matchup=matchup_by_game_id[candidates[index].game_id].derived_game_name,
+            player_name=candidates[index].player_name,
+            prop_type=candidates[index].prop_type,
+            line=candidates[index].line,
+            over_under_bet=candidates[index].over_under_bet,
+            bookie=candidates[index].bookie,
+            best_odds=candidates[index].best_odds,
+            stats_baseline=float(baselines[index]),
+            edge=float(edges[index]),
+            direction=int(directions[index]),
+        )
+        for index in top_indices
+    ]
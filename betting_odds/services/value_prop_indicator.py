@@ -1,5 +1,120 @@
+import json
+import logging
 from dataclasses import dataclass
-from typing import Optional
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Direction codes returned by classify_value_directions, best value first so
+# they can also be used to sort props
+STRONG_POSITIVE, POSITIVE, NEUTRAL, NEGATIVE = 0, 1, 2, 3
+# Lookup arrays indexed by direction code
+VALUE_DIRECTIONS = np.array(["strong positive", "positive", "neutral", "negative"])
+VALUE_EMOJIS = np.array(["🔥", "👍", "🔮", "❌"])
+
+
+DEFAULT_THRESHOLD = 0.1
+DEFAULT_LOWER_THRESHOLD = 0.03
+
+# Tuned thresholds per league and stat, written by services/threshold_optimizer.py
+VALUE_THRESHOLDS_PATH = Path(__file__).resolve().parent.parent / "value_thresholds.json"
+
+
+@dataclass(frozen=True)
+class ValueThresholds:
+    """Value indicator thresholds for one league and stat"""
+    threshold: float = DEFAULT_THRESHOLD
+    lower_threshold: float = DEFAULT_LOWER_THRESHOLD
+    # Baseline metric the thresholds were tuned with, None for the defaults
+    metric_type: Optional[str] = None
+
+
+def load_value_thresholds(league: str, path: Path = VALUE_THRESHOLDS_PATH) -> Dict[str, ValueThresholds]:
+    """
+    Load the tuned thresholds of a league
+
+    Args:
+        league: League schema, e.g. "nba"
+        path: Config written by the threshold optimizer
+
+    Returns:
+        Dictionary mapping stat types to their thresholds; stats (or a
+        missing config) not in it should use ValueThresholds()
+    """
+    try:
+        with open(path) as config_file:
+            config = json.load(config_file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not read value thresholds from {path}: {e}")
+        return {}
+
+    return {
+        stat_type: ValueThresholds(threshold=stat_config["threshold"],
+                                   lower_threshold=stat_config["lower_threshold"],
+                                   metric_type=stat_config.get("metric_type"))
+        for stat_type, stat_config in config.get(league, {}).items()
+    }
+
+
+def get_value_thresholds(value_thresholds_by_stat: Dict[str, ValueThresholds], stat_type: str,
+                         metric_type: str) -> ValueThresholds:
+    """
+    Thresholds to classify a stat's lines against a baseline metric
+
+    Args:
+        value_thresholds_by_stat: Tuned thresholds, see load_value_thresholds
+        stat_type: The stat type, e.g. "points"
+        metric_type: Baseline metric the lines are compared against
+
+    Returns:
+        The tuned thresholds if they were tuned with this metric, the
+        defaults otherwise
+    """
+    value_thresholds = value_thresholds_by_stat.get(stat_type)
+    if value_thresholds is None or value_thresholds.metric_type != metric_type:
+        return ValueThresholds()
+    return value_thresholds
+
+
+def classify_value_directions(lines, baselines, sides, threshold: float,
+                              lower_threshold: float = DEFAULT_LOWER_THRESHOLD) -> np.ndarray:
+    """
+    Classify many props at once, see ValueIndicator.value_direction for the bands
+
+    Args:
+        lines: Prop lines
+        baselines: Stats baseline of each prop, or a single baseline for all of them
+        sides: "over" or "under" for each prop, or a single side for all of them
+        threshold: Threshold for strong value, or one per line
+        lower_threshold: Threshold for positive value, or one per line
+
+    Returns:
+        Array of direction codes (STRONG_POSITIVE, POSITIVE, NEUTRAL, NEGATIVE),
+        one per line; index VALUE_DIRECTIONS or VALUE_EMOJIS with it for display
+    """
+    lines = np.asarray(lines, dtype=float)
+    baselines = np.asarray(baselines, dtype=float)
+    sides = np.asarray(sides)
+
+    over_directions = np.select(
+        [lines < baselines * (1 - threshold),
+         lines < baselines * (1 - lower_threshold),
+         lines <= baselines * (1 + lower_threshold)],
+        [STRONG_POSITIVE, POSITIVE, NEUTRAL], default=NEGATIVE)
+    under_directions = np.select(
+        [lines > baselines * (1 + threshold),
+         lines > baselines * (1 + lower_threshold),
+         lines >= baselines * (1 - lower_threshold)],
+        [STRONG_POSITIVE, POSITIVE, NEUTRAL], default=NEGATIVE)
+
+    directions = np.where(sides == "over", over_directions,
+                          np.where(sides == "under", under_directions, NEUTRAL))
+    return directions.astype(np.int8)
 
 
 @dataclass
@@ -12,7 +127,7 @@ class ValueIndicator:
     # Threshold for indicating strong value (percentage or fixed)
     threshold: float
     # Lower threshold for indicating positive value (default 3%)
-    lower_threshold: float = 0.03
+    lower_threshold: float = DEFAULT_LOWER_THRESHOLD
 
     @property
     def value_direction(self) -> Optional[str]:
@@ -52,27 +167,10 @@ class ValueIndicator:
         Returns:
             "strong positive", "positive", "neutral", or "negative"
         """
-        if self.over_under_bet == "over":
-            if self.line < self.stats_baseline * (1 - self.threshold):
-                return "strong positive"  # Line significantly below baseline
-            elif self.line < self.stats_baseline * (1 - self.lower_threshold):
-                return "positive"  # Line moderately below baseline
-            elif self.line <= self.stats_baseline * (1 + self.lower_threshold):
-                return "neutral"  # Line close to baseline
-            else:
-                return "negative"  # Line above baseline + lower threshold
-
-        elif self.over_under_bet == "under":
-            if self.line > self.stats_baseline * (1 + self.threshold):
-                return "strong positive"  # Line significantly above baseline
-            elif self.line > self.stats_baseline * (1 + self.lower_threshold):
-                return "positive"  # Line moderately above baseline
-            elif self.line >= self.stats_baseline * (1 - self.lower_threshold):
-                return "neutral"  # Line close to baseline
-            else:
-                return "negative"  # Line below baseline - lower threshold
-
-        return "neutral"
+        direction = classify_value_directions(
+            self.line, self.stats_baseline, self.over_under_bet,
+            self.threshold, self.lower_threshold)
+        return str(VALUE_DIRECTIONS[direction])
 
     @property
     def emoji_indicator(self) -> str:
@@ -82,11 +180,7 @@ class ValueIndicator:
         Returns:
             Emoji string
         """
-        direction = self.value_direction
-        if direction == "strong positive":
-            return "🔥"  # Fire for strong positive value
-        elif direction == "positive":
-            return "👍"  # Thumbs up for positive value
-        elif direction == "negative":
-            return "❌"  # Red cross for negative value
-        return "🔮"  # Crystal ball for neutral/uncertain value
+        direction = classify_value_directions(
+            self.line, self.stats_baseline, self.over_under_bet,
+            self.threshold, self.lower_threshold)
+        return str(VALUE_EMOJIS[direction])
@@ -0,0 +1,154 @@
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+import pandas as pd
+import streamlit as st
+from nba_api.stats.library.parameters import SeasonTypeAllStar
+
+from betting_odds.data_access.events_repository import EventsRepository
+from betting_odds.data_access.odds_repository import OddsRepository
+from betting_odds.models.matchup import Matchup
+from betting_odds.models.value_prop import ValueProp
+from betting_odds.services.matchup_service import MatchupService
+from betting_odds.services.player_stats_service import PlayerStatsService
+from betting_odds.services.stat_metrics import metric_names
+from betting_odds.services.value_leaderboard import top_value_props
+from betting_odds.services.value_prop_indicator import VALUE_DIRECTIONS, VALUE_EMOJIS, load_value_thresholds
+from database.utils import get_database
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Hide the st.markdown anchor icon
+st.markdown(
+    "<style>[data-testid='stHeaderActionElements'] {display: none;}</style>",
+    unsafe_allow_html=True
+)
+
+# League -> (database schema, stats season, stats season type), as on the odds pages
+LEAGUE_SETTINGS = {
+    "NBA": ("nba", "2024-25", SeasonTypeAllStar.playoffs),
+    "WNBA": ("wnba", "2025", SeasonTypeAllStar.regular),
+}
+
+
+def main():
+    st.title("Top Value Props of the Day", anchor=False)
+    st.markdown("""
+    <div style="font-size: 18px;">
+    <p>Every prop line of every upcoming game, scored against the player's statistical baseline.
+    The edge is how far the baseline sits from the line in the bet's favour.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        selected_league = st.selectbox("League", options=LEAGUE_SETTINGS.keys())
+    with col2:
+        selected_metric_type = st.selectbox("Metrics Type", options=metric_names())
+    with col3:
+        top_k = st.slider("Number of Props", min_value=10, max_value=100, value=25, step=5)
+
+    matchup_by_derived_name = get_future_matchups(selected_league)
+    if not matchup_by_derived_name:
+        st.warning("No upcoming matchups available.")
+        return
+
+    slate_game_ids = tuple(matchup.game_id for matchup in matchup_by_derived_name.values())
+    latest_job_start_time_utc = get_latest_job_start_time(selected_league, slate_game_ids)
+    if latest_job_start_time_utc is None:
+        st.warning("⚠️ No odds data available for the upcoming matchups")
+        return
+
+    odds_time_str = latest_job_start_time_utc.strftime("%A, %B %d, %Y, %I:%M %p")
+    st.info(f"❗ **Odds Last Retrieved:** {odds_time_str} UTC | Odds refresh every 6 hours before the game starts")
+
+    value_props = calculate_top_value_props(
+        selected_league, slate_game_ids, latest_job_start_time_utc, selected_metric_type, top_k)
+    if not value_props:
+        st.info("No props with player stats available")
+        return
+
+    render_value_props(value_props, selected_metric_type)
+
+
+@st.cache_data(ttl=3600)
+def get_future_matchups(league: str) -> Optional[dict[str, Matchup]]:
+    """Get the upcoming events of a league."""
+    schema, _, _ = LEAGUE_SETTINGS[league]
+    return EventsRepository(get_database(schema)).get_future_events()
+
+
+@st.cache_data(ttl=300)
+def get_latest_job_start_time(league: str, game_ids: tuple[str, ...]) -> Optional[datetime]:
+    """Get the start time of the odds job behind the current snapshot of the slate."""
+    schema, _, _ = LEAGUE_SETTINGS[league]
+    return OddsRepository(get_database(schema)).get_latest_job_start_time(list(game_ids))
+
+
+@st.cache_resource(ttl=6 * 3600, max_entries=20)
+def calculate_top_value_props(league: str, game_ids: tuple[str, ...], latest_job_start_time_utc: datetime,
+                              metric_type: str, top_k: int) -> List[ValueProp]:
+    """
+    Score the whole slate of a league; keyed on the latest odds job so a new
+    snapshot is picked up as soon as it lands
+    """
+    schema, season, season_type = LEAGUE_SETTINGS[league]
+    database = get_database(schema)
+    logger.info(f"Scoring {league} slate of {len(game_ids)} games for odds job {latest_job_start_time_utc}")
+
+    matchup_best_odds_by_game_id = MatchupService(database).get_matchups_best_odds(game_ids)
+    player_names = list({player_name
+                         for matchup_best_odds in matchup_best_odds_by_game_id.values()
+                         for player_name in matchup_best_odds.best_odds_by_player_name})
+
+    player_stats_service = PlayerStatsService(database)
+    stats_summary_by_name = player_stats_service.summarize_player_stats_frame(
+        player_stats_service.query_players_stats_frame(player_names, season, season_type))
+
+    matchup_by_game_id = {matchup.game_id: matchup for matchup in get_future_matchups(league).values()}
+    return top_value_props(matchup_by_game_id, matchup_best_odds_by_game_id, stats_summary_by_name,
+                           metric_type, top_k, load_value_thresholds(schema))
+
+
+def render_value_props(value_props: List[ValueProp], metric_type: str) -> None:
+    """
+    Render the leaderboard table
+
+    Args:
+        value_props: Scored props, best first
+        metric_type: Name of the metric used as baseline
+    """
+    df = pd.DataFrame({
+        "Rank": range(1, len(value_props) + 1),
+        "Matchup": [value_prop.matchup for value_prop in value_props],
+        "Player": [value_prop.player_name for value_prop in value_props],
+        "Prop": [value_prop.prop_type for value_prop in value_props],
+        "Line": [value_prop.line for value_prop in value_props],
+        "Over/Under": [value_prop.over_under_bet.capitalize() for value_prop in value_props],
+        "Best Bookie": [value_prop.bookie for value_prop in value_props],
+        "Best Odds": [value_prop.best_odds for value_prop in value_props],
+        metric_type: [value_prop.stats_baseline for value_prop in value_props],
+        "Edge %": [value_prop.edge * 100 for value_prop in value_props],
+        "Value Indicator": [f"{VALUE_EMOJIS[value_prop.direction]} "
+                            f"{VALUE_DIRECTIONS[value_prop.direction].capitalize()}"
+                            for value_prop in value_props],
+    })
+
+    st.dataframe(
+        df,
+        column_config={
+            "Line": st.column_config.NumberColumn("Line", format="%.1f"),
+            "Best Odds": st.column_config.NumberColumn("Best Odds", format="%.2f"),
+            metric_type: st.column_config.NumberColumn(metric_type, format="%.1f"),
+            "Edge %": st.column_config.NumberColumn("Edge %", format="%+.1f%%"),
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+
+
+# Run the main function
+if __name__ == "__main__":
+    main()
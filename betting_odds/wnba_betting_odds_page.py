@@ -1,19 +1,24 @@
 import logging
 from typing import Optional, Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 from nba_api.stats.library.parameters import SeasonTypeAllStar
 
+from betting_odds.data_access.arbitrage_repository import ArbitrageRepository
 from betting_odds.data_access.events_repository import EventsRepository
 from betting_odds.data_access.stats_repository import StatsRepository
 from betting_odds.models.matchup import Matchup
-from betting_odds.services.value_prop_indicator import ValueIndicator
-from betting_odds.models.orm_models import PlayerPropORM
-from betting_odds.models.player_stats_summary import PlayerStatsSummary
+from betting_odds.models.matchup_props import BestLineOdds, MatchupBestOdds
+from betting_odds.services.value_prop_indicator import (
+    VALUE_DIRECTIONS, VALUE_EMOJIS, ValueThresholds, classify_value_directions, get_value_thresholds,
+    load_value_thresholds)
+from betting_odds.models.player_stats_summary import HitRateWindow, PlayerStatsSummary, prop_stat_type
 from betting_odds.services.matchup_service import MatchupService
 from betting_odds.services.player_stats_service import PlayerStatsService
 from betting_odds.services.prop_organiser import get_best_bookie_odds_for_each_prop_type_for_a_player
+from betting_odds.services.stat_metrics import metric_names
 from database.utils import get_database
 from ui_component.style_utils import load_css
 
@@ -36,6 +41,10 @@ matchup_service = MatchupService(database)
 player_stats_service = PlayerStatsService(database)
 event_repository = EventsRepository(database)
 stats_repository = StatsRepository(database)
+arbitrage_repository = ArbitrageRepository(database)
+
+# Value indicator thresholds tuned per stat by the threshold optimizer
+value_thresholds_by_stat = load_value_thresholds('wnba')
 
 
 def main():
@@ -130,6 +139,11 @@ def main():
         st.warning("No upcoming matchups available.")
         return
 
+    # Prefetch the best odds of the whole slate so switching matchups does not hit the database
+    slate_game_ids = tuple(matchup.game_id for matchup in matchup_by_derived_name.values())
+    matchup_best_odds_by_game_id = get_wnba_slate_best_odds(slate_game_ids)
+    slate_fair_odds_df = get_wnba_slate_fair_odds(slate_game_ids)
+
     # Create columns for the selection options
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -148,12 +162,13 @@ def main():
         )
 
     with col3:
+        # Default to the baseline the thresholds of this stat were tuned with
+        tuned_metric_type = value_thresholds_by_stat.get(
+            prop_stat_type(selected_prop_type), ValueThresholds()).metric_type
         selected_metric_type = st.selectbox(
             "Metrics Type",
-            options=[
-                "Last 5 Games Average", "Last 10 Games Average",
-                "Season Average", "Season Median"
-            ]
+            options=metric_names(),
+            index=metric_names().index(tuned_metric_type) if tuned_metric_type in metric_names() else 0
         )
 
     # Main content area - display odds value indicators
@@ -166,9 +181,23 @@ def main():
             "%A, %B %d, %Y, %I:%M %p")
         st.subheader(f"Game Date: {game_date_str} UTC")
 
-        # Get and display odds update information
-        latest_odds_time = matchup_service.get_latest_odds_update_time(
-            selected_matchup)
+        # Best odds per line and the odds update time come from the slate prefetch
+        matchup_best_odds = matchup_best_odds_by_game_id.get(
+            selected_matchup.game_id, MatchupBestOdds(latest_update_time_utc=None, best_odds_by_player_name={}))
+        player_props_by_name = matchup_best_odds.best_odds_by_player_name
+
+        # No-vig consensus probability and expected value of each line's best price
+        matchup_fair_odds_df = slate_fair_odds_df[slate_fair_odds_df['game_id'] == selected_matchup.game_id]
+        fair_odds_by_line = {
+            (player_name, prop_type, line, over_under_bet): (fair_probability, expected_value)
+            for player_name, prop_type, line, over_under_bet, fair_probability, expected_value in zip(
+                matchup_fair_odds_df['player_name'], matchup_fair_odds_df['prop_type'],
+                matchup_fair_odds_df['line'], matchup_fair_odds_df['over_under_bet'],
+                matchup_fair_odds_df['fair_probability'], matchup_fair_odds_df['expected_value'])
+        }
+
+        # Display odds update information
+        latest_odds_time = matchup_best_odds.latest_update_time_utc
         if latest_odds_time:
             odds_time_str = latest_odds_time.strftime(
                 "%A, %B %d, %Y, %I:%M %p")
@@ -177,9 +206,8 @@ def main():
         else:
             st.warning("⚠️ No odds data available for this matchup")
 
-        # Fetch player props for the matchup
-        player_props_by_name = matchup_service.get_player_props_for_matchup(
-            selected_matchup)
+        # Arbitrages and middles found by the scanner run after each odds job
+        render_arbitrage_opportunities(get_wnba_arbitrage_opportunities(), selected_matchup.game_id)
 
         # Get stats for all players for the selected matchup
         list_of_players = list(player_props_by_name.keys())
@@ -207,7 +235,8 @@ def main():
                 team_players=home_team_players,
                 selected_prop_type=selected_prop_type,
                 selected_metric_type=selected_metric_type,
-                stats_summary_by_name=stats_summary_by_name
+                stats_summary_by_name=stats_summary_by_name,
+                fair_odds_by_line=fair_odds_by_line
             )
 
         # Away team tab
@@ -217,7 +246,8 @@ def main():
                 team_players=away_team_players,
                 selected_prop_type=selected_prop_type,
                 selected_metric_type=selected_metric_type,
-                stats_summary_by_name=stats_summary_by_name
+                stats_summary_by_name=stats_summary_by_name,
+                fair_odds_by_line=fair_odds_by_line
             )
 
     # Add floating button at the bottom (after all content)
@@ -240,12 +270,31 @@ def get_wnba_future_matchup() -> Optional[dict[str, Matchup]]:
     return matchup_by_derived_name
 
 
+@st.cache_resource(ttl=900)
+def get_wnba_slate_best_odds(game_ids: tuple[str, ...]) -> dict[str, MatchupBestOdds]:
+    """Get the best odds per line of every upcoming WNBA game, keyed by game id."""
+    return matchup_service.get_matchups_best_odds(game_ids)
+
+
+@st.cache_resource(ttl=900)
+def get_wnba_slate_fair_odds(game_ids: tuple[str, ...]) -> pd.DataFrame:
+    """Get the no-vig fair probability and expected value of every upcoming WNBA line."""
+    return matchup_service.get_matchups_fair_odds(game_ids)
+
+
+@st.cache_data(ttl=900)
+def get_wnba_arbitrage_opportunities() -> pd.DataFrame:
+    """Get the arbitrages and middles of the upcoming WNBA games from the last scan."""
+    return arbitrage_repository.get_opportunities()
+
+
 @st.cache_resource(ttl=3600)
 def calculate_wnba_summary_stats_for_players(list_of_players: list[str], season, season_type) -> dict[str, PlayerStatsSummary]:
-    player_stats_by_name = player_stats_service.query_player_stats(
+    # One long-format frame for all players, summarized in a single grouped pass
+    player_stats_df = player_stats_service.query_players_stats_frame(
         list_of_players, season, season_type)
-    stats_summary_by_name = player_stats_service.summarize_player_stats(
-        player_stats_by_name)
+    stats_summary_by_name = player_stats_service.summarize_player_stats_frame(
+        player_stats_df)
     return stats_summary_by_name
 
 
@@ -254,12 +303,12 @@ def filter_player_props_by_team(
         team_by_player_name: Dict[str, str],
         home_team: str,
         away_team: str
-) -> Tuple[Dict[str, List[PlayerPropORM]], Dict[str, List[PlayerPropORM]]]:
+) -> Tuple[Dict[str, List[BestLineOdds]], Dict[str, List[BestLineOdds]]]:
     """
     Filter players by team and create separate dictionaries for home and away teams
 
     Args:
-        player_props_by_name: Dictionary mapping player names to their props
+        player_props_by_name: Dictionary mapping player names to their best line odds
         team_by_player_name: Dictionary mapping player names to their team
         home_team: Name of the home team
         away_team: Name of the away team
@@ -284,22 +333,66 @@ def filter_player_props_by_team(
     return home_team_players, away_team_players
 
 
+def render_arbitrage_opportunities(opportunities_df: pd.DataFrame, game_id: str) -> None:
+    """
+    Render the arbitrage and middle opportunities of a game
+
+    Args:
+        opportunities_df: Opportunities of the whole slate, see ArbitrageRepository
+        game_id: Game to show the opportunities of
+    """
+    game_opportunities_df = opportunities_df[opportunities_df['game_id'] == game_id]
+
+    with st.expander(f"🔀 **Arbitrage & Middles ({len(game_opportunities_df)})**"):
+        if game_opportunities_df.empty:
+            st.info("No arbitrage or middle opportunities in the latest odds")
+            return
+
+        st.dataframe(
+            pd.DataFrame({
+                "Type": game_opportunities_df['kind'].str.capitalize(),
+                "Player": game_opportunities_df['player_name'],
+                "Prop": game_opportunities_df['prop_type'],
+                "Over Line": game_opportunities_df['over_line'],
+                "Over Bookie": game_opportunities_df['over_bookmaker'],
+                "Over Odds": game_opportunities_df['over_odds'],
+                "Under Line": game_opportunities_df['under_line'],
+                "Under Bookie": game_opportunities_df['under_bookmaker'],
+                "Under Odds": game_opportunities_df['under_odds'],
+                # Guaranteed return for an arbitrage, cost of the bet if a middle misses
+                "Margin %": (1 - game_opportunities_df['combined_implied_probability']) * 100,
+            }),
+            column_config={
+                "Over Line": st.column_config.NumberColumn("Over Line", format="%.1f"),
+                "Over Odds": st.column_config.NumberColumn("Over Odds", format="%.2f"),
+                "Under Line": st.column_config.NumberColumn("Under Line", format="%.1f"),
+                "Under Odds": st.column_config.NumberColumn("Under Odds", format="%.2f"),
+                "Margin %": st.column_config.NumberColumn("Margin %", format="%+.1f%%"),
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+
+
 def render_team_props(
         team_name: str,
         team_players: Dict[str, List],
         selected_prop_type: str,
         selected_metric_type: str,
-        stats_summary_by_name: Dict[str, PlayerStatsSummary]
+        stats_summary_by_name: Dict[str, PlayerStatsSummary],
+        fair_odds_by_line: Dict[Tuple[str, str, float, str], Tuple[float, float]]
 ) -> None:
     """
     Render player props for a given team
 
     Args:
         team_name: Name of the team
-        team_players: Dictionary mapping player names to their props
+        team_players: Dictionary mapping player names to their best line odds
         selected_prop_type: Type of prop (points, assists, etc.)
-        selected_metric_type: Type of metric (last_5_avg, season_avg, etc.)
+        selected_metric_type: Name of a registered metric (Last 5 Games Average, Season Average, etc.)
         stats_summary_by_name: Dictionary mapping player names to their stats summary
+        fair_odds_by_line: (player name, prop type, line, over/under) mapped to the
+            no-vig fair probability and expected value of the best price
     """
     if not team_players:
         st.info(f"No player props available for {team_name}")
@@ -332,83 +425,50 @@ def render_team_props(
             best_over_odds_by_line, best_under_odds_by_line = get_best_bookie_odds_for_each_prop_type_for_a_player(
                 selected_props)
 
-            # Create table data with value indicators
-            table_data = []
-
-            # Add over bets with value indicators
-            for line, best_odds in best_over_odds_by_line.items():
-                value_indicator = ValueIndicator(
-                    prop_type=selected_prop_type.lower(),
-                    line=line,
-                    over_under_bet="over",
-                    stats_baseline=stats_baseline,
-                    threshold=0.1  # 10% threshold for value indication
-                )
-
-                # Get the emoji indicator
-                emoji = value_indicator.emoji_indicator
-                direction = value_indicator.value_direction
-                direction_display = direction.capitalize() if direction else "Neutral"
-                value_hint = f"{emoji} {direction_display}"
-
-                # Define value priority for sorting (Strong positive -> Positive -> Neutral -> Negative)
-                value_priority = {
-                    "strong positive": 1,
-                    "positive": 2,
-                    "neutral": 3,
-                    "negative": 4
-                }
-
-                # Add numerical sort value for proper sorting
-                sort_value = value_priority.get(
-                    direction, 5)  # Default to 5 if not found
-
-                # Add row to table
-                table_data.append({
-                    "Line": line,
-                    "Over/Under": "Over",
-                    "Best Bookie": best_odds.bookie,
-                    "Best Odds": best_odds.best_odds,
-                    "Value Indicator": value_hint,
-                    "value_sort": sort_value
-                })
-
-            # Add under bets with value indicators
-            for line, best_odds in best_under_odds_by_line.items():
-                value_indicator = ValueIndicator(
-                    prop_type=selected_prop_type.lower(),
-                    line=line,
-                    over_under_bet="under",
-                    stats_baseline=stats_baseline,
-                    threshold=0.1  # 10% threshold for value indication
-                )
-
-                # Get the emoji indicator
-                emoji = value_indicator.emoji_indicator
-                direction = value_indicator.value_direction
-                direction_display = direction.capitalize() if direction else "Neutral"
-                value_hint = f"{emoji} {direction_display}"
-
-                # Add numerical sort value for proper sorting
-                sort_value = value_priority.get(
-                    direction, 5)  # Default to 5 if not found
-
-                # Add row to table
-                table_data.append({
-                    "Line": line,
-                    "Over/Under": "Under",
-                    "Best Bookie": best_odds.bookie,
-                    "Best Odds": best_odds.best_odds,
-                    "Value Indicator": value_hint,
-                    "value_sort": sort_value
-                })
+            # One row per line and side, classified against the baseline in a single pass
+            rows = ([(line, "Over", best_odds) for line, best_odds in best_over_odds_by_line.items()]
+                    + [(line, "Under", best_odds) for line, best_odds in best_under_odds_by_line.items()])
+            # Tuned thresholds only hold for the metric they were tuned with
+            value_thresholds = get_value_thresholds(
+                value_thresholds_by_stat, prop_stat_type(selected_prop_type), selected_metric_type)
+            directions = classify_value_directions(
+                [line for line, _, _ in rows],
+                stats_baseline,
+                [side.lower() for _, side, _ in rows],
+                threshold=value_thresholds.threshold,
+                lower_threshold=value_thresholds.lower_threshold
+            )
+            # Share of the last 5, last 10 and season games that went the row's way
+            hit_rates = np.concatenate([
+                player_stats.get_hit_rates(selected_prop_type.lower(), list(best_over_odds_by_line), "over"),
+                player_stats.get_hit_rates(selected_prop_type.lower(), list(best_under_odds_by_line), "under"),
+            ], axis=1) * 100
+            # Fair probability and expected value of the best price, NaN without a two-sided consensus
+            fair_odds = [fair_odds_by_line.get((player_name, selected_props[0].prop_type, line, side.lower()),
+                                               (np.nan, np.nan))
+                         for line, side, _ in rows]
+
+            # Direction codes run from strong positive to negative, so they break EV ties
+            table_data = [{
+                "Line": line,
+                "Over/Under": side,
+                "Best Bookie": best_odds.bookie,
+                "Best Odds": best_odds.best_odds,
+                "Value Indicator": f"{VALUE_EMOJIS[direction]} {VALUE_DIRECTIONS[direction].capitalize()}",
+                "Hit L5": hit_rates[HitRateWindow.LAST_5, index],
+                "Hit L10": hit_rates[HitRateWindow.LAST_10, index],
+                "Hit Season": hit_rates[HitRateWindow.SEASON, index],
+                "Fair %": fair_odds[index][0] * 100,
+                "EV %": fair_odds[index][1] * 100,
+                "value_sort": direction
+            } for index, ((line, side, best_odds), direction) in enumerate(zip(rows, directions))]
 
             if table_data:
                 # Convert data to DataFrame
                 df = pd.DataFrame(table_data)
 
-                # Sort the dataframe by value priority (Strong positive first)
-                df = df.sort_values(by="value_sort")
+                # Rank by expected value of the best price, then by value priority (Strong positive first)
+                df = df.sort_values(by=["EV %", "value_sort"], ascending=[False, True], na_position="last")
 
                 # Drop the value_sort column before displaying
                 df = df.drop(columns=["value_sort"])
@@ -442,13 +502,19 @@ def render_team_props(
                         "Best Bookie": st.column_config.TextColumn("Best Bookie"),
                         "Best Odds": st.column_config.NumberColumn("Best Odds", format="%.2f"),
                         "Value Indicator": st.column_config.TextColumn("Value Indicator"),
+                        "Hit L5": st.column_config.NumberColumn("Hit L5", format="%.0f%%"),
+                        "Hit L10": st.column_config.NumberColumn("Hit L10", format="%.0f%%"),
+                        "Hit Season": st.column_config.NumberColumn("Hit Season", format="%.0f%%"),
+                        "Fair %": st.column_config.NumberColumn("Fair %", format="%.1f%%"),
+                        "EV %": st.column_config.NumberColumn("EV %", format="%+.1f%%"),
                         "Notes": st.column_config.TextColumn("(Upcoming Feature) Your Notes", width="medium"),
                     },
                     hide_index=True,
                     use_container_width=True,
                     num_rows="fixed",
                     disabled=["Line", "Over/Under",
-                              "Best Bookie", "Best Odds", "Value Indicator", "Notes"]
+                              "Best Bookie", "Best Odds", "Value Indicator",
+                              "Hit L5", "Hit L10", "Hit Season", "Fair %", "EV %", "Notes"]
                 )
 
                 # Add ID column back to edited dataframe for reference when saving notes
@@ -3,5 +3,18 @@ Shared database configuration to ensure consistent database connections across s
 """
 import streamlit as st
 
-# read connection from local file
-DEFAULT_DB_CONNECTION_STRING = st.secrets["database"]["connection_string"]
+# read connection from local file; command line jobs can pass --connection-string instead
+try:
+    _DATABASE_SECRETS = st.secrets["database"]
+except FileNotFoundError:
+    _DATABASE_SECRETS = {}
+
+DEFAULT_DB_CONNECTION_STRING = _DATABASE_SECRETS.get("connection_string")
+
+# Connection pool settings for the engine shared by every league schema.
+# Each one can be overridden from the [database] section of the secrets file.
+DB_POOL_SIZE = int(_DATABASE_SECRETS.get("pool_size", 5))
+DB_MAX_OVERFLOW = int(_DATABASE_SECRETS.get("max_overflow", 5))
+DB_POOL_PRE_PING = bool(_DATABASE_SECRETS.get("pool_pre_ping", True))
+# Seconds after which a pooled connection is replaced (-1 disables recycling)
+DB_POOL_RECYCLE = int(_DATABASE_SECRETS.get("pool_recycle", 1800))
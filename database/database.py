@@ -2,9 +2,37 @@
 Shared Database class for managing connections to the database.
 """
 
-from sqlalchemy import create_engine, text, MetaData
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
-from database.base import Base
+
+
+def create_shared_engine(connection_string: str, echo: bool = False, pool_size: int = 5,
+                         max_overflow: int = 5, pool_pre_ping: bool = True,
+                         pool_recycle: int = 1800) -> Engine:
+    """
+    Create the single pooled engine that every league schema shares.
+
+    Args:
+        connection_string: SQLAlchemy database connection string
+        echo: Whether to echo SQL queries (useful for debugging)
+        pool_size: Number of connections kept open in the pool
+        max_overflow: Extra connections allowed above pool_size under load
+        pool_pre_ping: Whether to test connections for liveness on checkout
+        pool_recycle: Seconds after which a pooled connection is replaced
+
+    Returns:
+        Engine with no schema pinned; schemas are routed per Database instance
+    """
+    return create_engine(
+        connection_string,
+        connect_args={"options": "-c timezone=utc"},
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=pool_pre_ping,
+        pool_recycle=pool_recycle,
+        echo=echo
+    )
 
 
 class Database:
@@ -12,41 +40,21 @@ class Database:
     Shared database class to handle connections and sessions across services.
     """
 
-    def __init__(self, connection_string: str, schema: str = "public", echo: bool = False):
+    def __init__(self, engine: Engine, schema: str = "public"):
         """
         Initialize the database connection.
 
         Args:
-            connection_string: SQLAlchemy database connection string
+            engine: Shared engine created by create_shared_engine
             schema: PostgreSQL schema name (e.g., 'nba', 'wnba')
-            echo: Whether to echo SQL queries (useful for debugging)
         """
         self.schema = schema
-        self.engine = create_engine(
-            connection_string,
-            connect_args={
-                "options": f"-c timezone=utc -c search_path={schema},public"},
-            echo=echo
-        )
+        # Unqualified tables are rendered as "<schema>.<table>", so every
+        # league reuses the same connection pool
+        self.engine = engine.execution_options(
+            schema_translate_map={None: schema})
         self.Session = sessionmaker(bind=self.engine)
 
-    def create_tables(self):
-        """Create all tables defined in models in the specified schema."""
-        # Create schema if it doesn't exist
-        with self.engine.connect() as conn:
-            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {self.schema}"))
-            conn.commit()
-
-        # Create a schema-specific metadata object
-        schema_metadata = MetaData(schema=self.schema)
-
-        # Copy all tables from Base.metadata to schema_metadata
-        for table in Base.metadata.tables.values():
-            table.tometadata(schema_metadata)
-
-        # Create all tables in the specified schema
-        schema_metadata.create_all(self.engine)
-
     def get_session(self):
         """Get a new session"""
         return self.Session()
@@ -0,0 +1,439 @@
+"""
+Versioned schema migrations, applied out of band before the app is deployed:
+
+    python -m database.migrations nba wnba
+
+The app itself never runs DDL; at startup it only reads the version recorded
+in each schema's schema_version table (see verify_schema_version).
+"""
+import argparse
+import logging
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, TIMESTAMP, func, insert, select, text
+from sqlalchemy.exc import ProgrammingError
+
+from database.database import Database
+
+logger = logging.getLogger(__name__)
+
+# SQLSTATE of "relation does not exist"
+UNDEFINED_TABLE = '42P01'
+
+# Unqualified, so it is routed to each league schema like the ORM tables
+schema_version_table = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String),
+    Column("applied_at_utc", TIMESTAMP(timezone=True), server_default=func.now()),
+)
+
+
+# DDL of each table as its migration created it; frozen rather than read from
+# the ORM models, so a fresh schema goes through the same steps as an old one.
+# IF NOT EXISTS adopts schemas whose tables predate the migrations.
+_BASE_TABLES_DDL = """
+CREATE TABLE IF NOT EXISTS {schema}.events (
+    id varchar NOT NULL PRIMARY KEY,
+    sport_key varchar NOT NULL,
+    commence_time_utc timestamp with time zone,
+    home_team varchar,
+    away_team varchar,
+    derived_game_name varchar,
+    created_at_utc timestamp with time zone DEFAULT now(),
+    updated_at_utc timestamp with time zone DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS ix_events_sport_key ON {schema}.events (sport_key);
+CREATE INDEX IF NOT EXISTS ix_events_commence_time_utc ON {schema}.events (commence_time_utc);
+CREATE INDEX IF NOT EXISTS ix_events_home_team ON {schema}.events (home_team);
+CREATE INDEX IF NOT EXISTS ix_events_away_team ON {schema}.events (away_team);
+
+CREATE TABLE IF NOT EXISTS {schema}.player_props (
+    id serial NOT NULL PRIMARY KEY,
+    game_id varchar NOT NULL REFERENCES {schema}.events (id),
+    game_start_time_utc timestamp with time zone,
+    player_name varchar,
+    prop_type varchar,
+    line numeric(5, 2),
+    over_odds numeric(5, 2),
+    under_odds numeric(5, 2),
+    bookmaker varchar,
+    odds_collection_time_utc timestamp with time zone,
+    job_start_time_utc timestamp with time zone
+);
+CREATE INDEX IF NOT EXISTS ix_player_props_game_id ON {schema}.player_props (game_id);
+CREATE INDEX IF NOT EXISTS ix_player_props_game_start_time_utc ON {schema}.player_props (game_start_time_utc);
+CREATE INDEX IF NOT EXISTS ix_player_props_player_name ON {schema}.player_props (player_name);
+CREATE INDEX IF NOT EXISTS ix_player_props_prop_type ON {schema}.player_props (prop_type);
+CREATE INDEX IF NOT EXISTS ix_player_props_bookmaker ON {schema}.player_props (bookmaker);
+
+CREATE TABLE IF NOT EXISTS {schema}.players (
+    player_id serial NOT NULL PRIMARY KEY,
+    name varchar,
+    team varchar,
+    UNIQUE (player_id)
+);
+CREATE INDEX IF NOT EXISTS ix_players_name ON {schema}.players (name);
+CREATE INDEX IF NOT EXISTS ix_players_team ON {schema}.players (team);
+
+CREATE TABLE IF NOT EXISTS {schema}.game_stats (
+    id serial NOT NULL PRIMARY KEY,
+    player_id integer NOT NULL REFERENCES {schema}.players (player_id),
+    game_id varchar,
+    game_date date,
+    matchup varchar,
+    season varchar,
+    season_type varchar,
+    points integer NOT NULL,
+    assists integer NOT NULL,
+    rebounds integer NOT NULL,
+    three_pointers_made integer NOT NULL,
+    minutes integer
+);
+CREATE INDEX IF NOT EXISTS ix_game_stats_game_id ON {schema}.game_stats (game_id);
+CREATE INDEX IF NOT EXISTS ix_game_stats_game_date ON {schema}.game_stats (game_date);
+CREATE INDEX IF NOT EXISTS ix_game_stats_matchup ON {schema}.game_stats (matchup);
+CREATE INDEX IF NOT EXISTS ix_game_stats_season ON {schema}.game_stats (season);
+CREATE INDEX IF NOT EXISTS ix_game_stats_season_type ON {schema}.game_stats (season_type);
+"""
+
+_CURRENT_PLAYER_PROPS_DDL = """
+CREATE TABLE IF NOT EXISTS {schema}.current_player_props (
+    id integer NOT NULL PRIMARY KEY,
+    game_id varchar NOT NULL REFERENCES {schema}.events (id),
+    game_start_time_utc timestamp with time zone,
+    player_name varchar,
+    prop_type varchar,
+    line numeric(5, 2),
+    over_odds numeric(5, 2),
+    under_odds numeric(5, 2),
+    bookmaker varchar,
+    odds_collection_time_utc timestamp with time zone,
+    job_start_time_utc timestamp with time zone
+);
+CREATE INDEX IF NOT EXISTS ix_current_player_props_game_id_job_start_time_utc
+    ON {schema}.current_player_props (game_id, job_start_time_utc);
+"""
+
+_ARBITRAGE_OPPORTUNITIES_DDL = """
+CREATE TABLE IF NOT EXISTS {schema}.arbitrage_opportunities (
+    id serial NOT NULL PRIMARY KEY,
+    game_id varchar NOT NULL REFERENCES {schema}.events (id),
+    player_name varchar,
+    prop_type varchar,
+    kind varchar,
+    over_line numeric(5, 2),
+    over_bookmaker varchar,
+    over_odds numeric(5, 2),
+    under_line numeric(5, 2),
+    under_bookmaker varchar,
+    under_odds numeric(5, 2),
+    combined_implied_probability numeric(6, 4),
+    job_start_time_utc timestamp with time zone,
+    scanned_at_utc timestamp with time zone DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS ix_arbitrage_opportunities_game_id ON {schema}.arbitrage_opportunities (game_id);
+"""
+
+
+def _execute_ddl(conn, schema: str, ddl: str):
+    """Run each statement of a frozen DDL script in the schema."""
+    for statement in ddl.format(schema=schema).split(";"):
+        if statement.strip():
+            conn.execute(text(statement))
+
+
+def _create_base_tables(conn, schema: str):
+    """Create the events, player_props, players and game_stats tables."""
+    _execute_ddl(conn, schema, _BASE_TABLES_DDL)
+
+
+def _add_game_stats_is_away(conn, schema: str):
+    """Store the home/away flag on game_stats so splits can be filtered in SQL."""
+    conn.execute(text(
+        f"ALTER TABLE {schema}.game_stats ADD COLUMN IF NOT EXISTS is_away boolean "
+        f"GENERATED ALWAYS AS (matchup LIKE '%@%') STORED"))
+    conn.execute(text(
+        f"CREATE INDEX IF NOT EXISTS ix_game_stats_player_id_season_type_is_away "
+        f"ON {schema}.game_stats (player_id, season_type, is_away)"))
+
+
+_PLAYER_PROP_COLUMNS = ("id, game_id, game_start_time_utc, player_name, prop_type, line, "
+                        "over_odds, under_odds, bookmaker, odds_collection_time_utc, job_start_time_utc")
+
+
+def _create_current_player_props(conn, schema: str):
+    """
+    Keep the latest player_props snapshot per game in current_player_props.
+
+    An AFTER INSERT trigger on player_props replaces a game's rows as soon as
+    a newer collection job lands, so no collector changes are needed. Updates
+    and deletes are handled by the triggers of migration 7.
+    """
+    _execute_ddl(conn, schema, _CURRENT_PLAYER_PROPS_DDL)
+
+    new_values = ", ".join(f"NEW.{column}" for column in _PLAYER_PROP_COLUMNS.split(", "))
+    conn.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {schema}.sync_current_player_props() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.job_start_time_utc IS NULL THEN
+                RETURN NEW;
+            END IF;
+            -- A newer collection job supersedes the game's previous snapshot
+            DELETE FROM {schema}.current_player_props
+             WHERE game_id = NEW.game_id
+               AND job_start_time_utc < NEW.job_start_time_utc;
+            -- Rows from a job older than the current snapshot are history only
+            IF NOT EXISTS (SELECT 1 FROM {schema}.current_player_props
+                            WHERE game_id = NEW.game_id
+                              AND job_start_time_utc > NEW.job_start_time_utc) THEN
+                INSERT INTO {schema}.current_player_props ({_PLAYER_PROP_COLUMNS})
+                VALUES ({new_values});
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+    conn.execute(text(
+        f"DROP TRIGGER IF EXISTS player_props_sync_current ON {schema}.player_props"))
+    conn.execute(text(
+        f"CREATE TRIGGER player_props_sync_current AFTER INSERT ON {schema}.player_props "
+        f"FOR EACH ROW EXECUTE FUNCTION {schema}.sync_current_player_props()"))
+
+    # Backfill from the snapshots collected so far
+    conn.execute(text(f"""
+        INSERT INTO {schema}.current_player_props ({_PLAYER_PROP_COLUMNS})
+        SELECT {_PLAYER_PROP_COLUMNS}
+          FROM {schema}.player_props p
+         WHERE p.job_start_time_utc = (SELECT max(job_start_time_utc)
+                                         FROM {schema}.player_props
+                                        WHERE game_id = p.game_id)
+        ON CONFLICT (id) DO NOTHING
+    """))
+
+
+def _add_composite_indexes(conn, schema: str):
+    """Index the column combinations the odds and stats queries filter on."""
+    conn.execute(text(
+        f"CREATE INDEX IF NOT EXISTS ix_player_props_game_id_job_start_time_utc "
+        f"ON {schema}.player_props (game_id, job_start_time_utc)"))
+    conn.execute(text(
+        f"CREATE INDEX IF NOT EXISTS ix_game_stats_player_id_season_type_season_game_date "
+        f"ON {schema}.game_stats (player_id, season_type, season, game_date) "
+        f"INCLUDE (points, rebounds, assists, three_pointers_made, minutes)"))
+
+
+def _create_arbitrage_opportunities(conn, schema: str):
+    """Create the table the arbitrage scanner job writes its results to."""
+    _execute_ddl(conn, schema, _ARBITRAGE_OPPORTUNITIES_DDL)
+
+
+def _add_game_stats_team_abbreviation(conn, schema: str):
+    """Store the player's team per game so a team's box scores can be filtered in SQL."""
+    conn.execute(text(
+        f"ALTER TABLE {schema}.game_stats ADD COLUMN IF NOT EXISTS team_abbreviation varchar "
+        f"GENERATED ALWAYS AS (split_part(matchup, ' ', 1)) STORED"))
+    conn.execute(text(
+        f"CREATE INDEX IF NOT EXISTS ix_game_stats_team_abbreviation_season_type_season "
+        f"ON {schema}.game_stats (team_abbreviation, season_type, season)"))
+
+
+def _sync_current_player_props_on_change(conn, schema: str):
+    """
+    Keep current_player_props in step with updates and deletes of player_props.
+
+    The insert trigger of migration 3 only ever moves a game's snapshot
+    forward. Pruning history, or deleting and re-collecting a job, must
+    instead fall back to the latest job still stored, so statement-level
+    triggers recompute the snapshot of every game the statement touched.
+    """
+    conn.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {schema}.refresh_current_player_props(game_ids text[]) RETURNS void AS $$
+        BEGIN
+            DELETE FROM {schema}.current_player_props WHERE game_id = ANY(game_ids);
+            INSERT INTO {schema}.current_player_props ({_PLAYER_PROP_COLUMNS})
+            SELECT {_PLAYER_PROP_COLUMNS}
+              FROM {schema}.player_props p
+             WHERE p.game_id = ANY(game_ids)
+               AND p.job_start_time_utc = (SELECT max(job_start_time_utc)
+                                             FROM {schema}.player_props
+                                            WHERE game_id = p.game_id);
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+    conn.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {schema}.sync_current_player_props_on_delete() RETURNS trigger AS $$
+        BEGIN
+            PERFORM {schema}.refresh_current_player_props(
+                ARRAY(SELECT DISTINCT game_id FROM old_rows));
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+    conn.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {schema}.sync_current_player_props_on_update() RETURNS trigger AS $$
+        BEGIN
+            -- A row moved to another game changes the snapshot of both
+            PERFORM {schema}.refresh_current_player_props(
+                ARRAY(SELECT game_id FROM old_rows UNION SELECT game_id FROM new_rows));
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+    conn.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {schema}.sync_current_player_props_on_truncate() RETURNS trigger AS $$
+        BEGIN
+            TRUNCATE {schema}.current_player_props;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+
+    for operation, transition_tables in (
+            ("delete", "OLD TABLE AS old_rows"),
+            ("update", "OLD TABLE AS old_rows NEW TABLE AS new_rows")):
+        conn.execute(text(
+            f"DROP TRIGGER IF EXISTS player_props_sync_current_on_{operation} ON {schema}.player_props"))
+        conn.execute(text(
+            f"CREATE TRIGGER player_props_sync_current_on_{operation} AFTER {operation.upper()} "
+            f"ON {schema}.player_props REFERENCING {transition_tables} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {schema}.sync_current_player_props_on_{operation}()"))
+    conn.execute(text(
+        f"DROP TRIGGER IF EXISTS player_props_sync_current_on_truncate ON {schema}.player_props"))
+    conn.execute(text(
+        f"CREATE TRIGGER player_props_sync_current_on_truncate AFTER TRUNCATE ON {schema}.player_props "
+        f"FOR EACH STATEMENT EXECUTE FUNCTION {schema}.sync_current_player_props_on_truncate()"))
+
+
+def _include_is_away_in_covering_index(conn, schema: str):
+    """Carry is_away in the covering game_stats index, the last column the summaries read."""
+    conn.execute(text(
+        f"DROP INDEX IF EXISTS {schema}.ix_game_stats_player_id_season_type_season_game_date"))
+    conn.execute(text(
+        f"CREATE INDEX ix_game_stats_player_id_season_type_season_game_date "
+        f"ON {schema}.game_stats (player_id, season_type, season, game_date) "
+        f"INCLUDE (points, rebounds, assists, three_pointers_made, minutes, is_away)"))
+
+
+def _store_fractional_game_stats_minutes(conn, schema: str):
+    """Store game_stats.minutes as decimal minutes, as the stats endpoints report them."""
+    # Rewrites the table and rebuilds the indexes carrying minutes
+    conn.execute(text(
+        f"ALTER TABLE {schema}.game_stats ALTER COLUMN minutes TYPE double precision"))
+
+
+# (version, description, function(conn, schema)); append only, never reorder
+MIGRATIONS = [
+    (1, "create base tables", _create_base_tables),
+    (2, "add game_stats.is_away", _add_game_stats_is_away),
+    (3, "add current_player_props", _create_current_player_props),
+    (4, "add composite indexes", _add_composite_indexes),
+    (5, "add arbitrage_opportunities", _create_arbitrage_opportunities),
+    (6, "add game_stats.team_abbreviation", _add_game_stats_team_abbreviation),
+    (7, "sync current_player_props on update and delete", _sync_current_player_props_on_change),
+    (8, "include game_stats.is_away in the covering index", _include_is_away_in_covering_index),
+    (9, "store game_stats.minutes as decimal minutes", _store_fractional_game_stats_minutes),
+]
+
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def migrate(database: Database) -> int:
+    """
+    Apply every pending migration to the database's schema.
+
+    Each migration runs in its own transaction together with its
+    schema_version row, so a failed step can simply be re-run.
+
+    Args:
+        database: Database routed to the schema to migrate
+
+    Returns:
+        The schema version after migrating
+    """
+    schema = database.schema
+    with database.engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+        schema_version_table.create(conn, checkfirst=True)
+
+    for version, description, apply_migration in MIGRATIONS:
+        with database.engine.begin() as conn:
+            # Serialise concurrent runs against the same schema
+            conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:schema))"),
+                         {"schema": schema})
+            current_version = conn.execute(
+                select(func.max(schema_version_table.c.version))).scalar() or 0
+            if version <= current_version:
+                continue
+
+            logger.info(f"Applying migration {version} ({description}) to schema {schema}")
+            apply_migration(conn, schema)
+            conn.execute(insert(schema_version_table).values(
+                version=version, description=description))
+
+    return LATEST_SCHEMA_VERSION
+
+
+def get_schema_version(database: Database) -> int:
+    """
+    Read the schema version recorded in the database.
+
+    Args:
+        database: Database routed to the schema to check
+
+    Returns:
+        The applied schema version, or 0 if the schema was never migrated
+
+    Raises:
+        DBAPIError: If the database cannot be read for any other reason
+            (unreachable, bad credentials, missing permissions)
+    """
+    try:
+        with database.engine.connect() as conn:
+            return conn.execute(
+                select(func.max(schema_version_table.c.version))).scalar() or 0
+    except ProgrammingError as e:
+        # Only a missing schema_version table means "never migrated"
+        if getattr(e.orig, 'pgcode', None) != UNDEFINED_TABLE:
+            raise
+        logger.info(f"No schema_version table in schema {database.schema}")
+        return 0
+
+
+def verify_schema_version(database: Database) -> int:
+    """
+    Check that the schema has been migrated to the version this code expects.
+
+    Args:
+        database: Database routed to the schema to check
+
+    Returns:
+        The applied schema version
+
+    Raises:
+        RuntimeError: If the schema is behind LATEST_SCHEMA_VERSION
+    """
+    version = get_schema_version(database)
+    if version < LATEST_SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Schema '{database.schema}' is at version {version} but version "
+            f"{LATEST_SCHEMA_VERSION} is required; run "
+            f"'python -m database.migrations {database.schema}'")
+    return version
+
+
+if __name__ == "__main__":
+    from database.utils import get_engine
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Apply schema migrations")
+    parser.add_argument("schemas", nargs="+", help="Schemas to migrate, e.g. nba wnba")
+    parser.add_argument("--connection-string", default=None,
+                        help="SQLAlchemy connection string (defaults to the secrets file)")
+    args = parser.parse_args()
+
+    engine = get_engine(args.connection_string)
+    for schema_name in args.schemas:
+        migrated_version = migrate(Database(engine=engine, schema=schema_name))
+        print(f"Schema {schema_name} is at version {migrated_version}")
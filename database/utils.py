@@ -1,16 +1,79 @@
 """
 Utility functions for database access.
 """
-from database.database import Database
+import threading
+
+from sqlalchemy.engine import make_url
+
+from database.database import Database, create_shared_engine
+from database.migrations import verify_schema_version
+
+# Single engine (and connection pool) shared by every schema
+_engine = None
 
 # Singleton database instances for each schema
 _db_instances = {}
 
+# Guard creation of the engine and of the per-schema instances
+_engine_lock = threading.Lock()
+_db_lock = threading.Lock()
+
+
+def get_engine(connection_string=None, echo=False):
+    """
+    Get the engine shared by all schemas, creating it on first use.
+
+    Args:
+        connection_string: SQLAlchemy connection string (defaults to the config
+            value); None reuses the shared engine whatever it was created with
+        echo: Whether to echo SQL (useful for debugging)
+
+    Returns:
+        The process-wide pooled engine
+
+    Raises:
+        ValueError: If the shared engine was already created for another connection
+            string, or there is no connection string to create it with
+    """
+    global _engine
+
+    with _engine_lock:
+        if _engine is None:
+            from database.config import (DB_MAX_OVERFLOW, DB_POOL_PRE_PING, DB_POOL_RECYCLE,
+                                         DB_POOL_SIZE, DEFAULT_DB_CONNECTION_STRING)
+
+            # Use default connection string if none provided
+            if connection_string is None:
+                connection_string = DEFAULT_DB_CONNECTION_STRING
+            if connection_string is None:
+                raise ValueError("No connection string given and no [database] connection_string "
+                                 "in the secrets file")
+
+            _engine = create_shared_engine(
+                connection_string,
+                echo=echo,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_pre_ping=DB_POOL_PRE_PING,
+                pool_recycle=DB_POOL_RECYCLE
+            )
+        elif connection_string is not None and make_url(connection_string) != _engine.url:
+            # Silently reusing the first engine would send a CLI's queries to another database
+            raise ValueError(
+                f"The shared engine is already connected to "
+                f"{_engine.url.render_as_string(hide_password=True)}; cannot switch to "
+                f"{make_url(connection_string).render_as_string(hide_password=True)}")
+
+    return _engine
+
 
 def get_database(schema: str, connection_string=None, echo=False):
     """
     Get a database instance for a specific schema.
 
+    All schemas share one engine; each instance only routes its queries to
+    its own schema. Safe to call from concurrent Streamlit sessions.
+
     Args:
         schema: Database schema identifier
         connection_string: SQLAlchemy connection string (defaults to the config value)
@@ -18,21 +81,31 @@ def get_database(schema: str, connection_string=None, echo=False):
 
     Returns:
         Database instance configured for the specified schema
+
+    Raises:
+        ValueError: If the shared engine was already created for another connection
+            string, or there is no connection string to create it with
     """
-    global _db_instances
-
-    # Use default connection string if none provided
-    if connection_string is None:
-        from database.config import DEFAULT_DB_CONNECTION_STRING
-        connection_string = DEFAULT_DB_CONNECTION_STRING
-
-    # Create new instance if needed for this schema
-    if schema not in _db_instances:
-        _db_instances[schema] = Database(
-            connection_string=connection_string,
-            schema=schema,
-            echo=echo
-        )
-        _db_instances[schema].create_tables()
-
-    return _db_instances[schema]
+    if connection_string is not None:
+        # Fails instead of handing out an instance bound to another database
+        get_engine(connection_string, echo)
+
+    # Fast path: no locking once the schema has been initialised
+    database = _db_instances.get(schema)
+    if database is not None:
+        return database
+
+    with _db_lock:
+        # Another session may have initialised it while we waited
+        database = _db_instances.get(schema)
+        if database is None:
+            database = Database(
+                engine=get_engine(connection_string, echo),
+                schema=schema
+            )
+            # Only reads the migrated version; tables are created out of band
+            # by `python -m database.migrations`
+            verify_schema_version(database)
+            _db_instances[schema] = database
+
+    return database
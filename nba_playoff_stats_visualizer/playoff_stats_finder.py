@@ -1,13 +1,112 @@
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List
+from datetime import date
+from typing import Callable, Dict, List, Optional, Union
 
+import requests
+from nba_api.library.http import NBAHTTP
 from nba_api.live.nba.endpoints import BoxScore
-from nba_api.stats.endpoints import LeagueGameFinder
+from nba_api.stats.endpoints import LeagueGameFinder, PlayerGameLogs
 from nba_api.stats.library.parameters import SeasonTypePlayoffs
+from requests.exceptions import RequestException
+
+from nba_playoff_stats_visualizer.rate_limiter import TokenBucket, call_with_retry
+from nba_playoff_stats_visualizer.response_cache import ResponseCache, Ttl
+from nba_playoff_stats_visualizer.result_sets import decode_result_set
 
 logger = logging.getLogger(__name__)
 
+# stats.nba.com starts refusing connections well before ~10 requests per
+# second; stay comfortably below that across all threads of the process
+MAX_FETCH_WORKERS = 4
+NBA_API_RATE_LIMITER = TokenBucket(rate=3.0, capacity=4)
+NBA_API_TIMEOUT_SECONDS = 30
+NBA_API_MAX_ATTEMPTS = 4
+NBA_API_BACKOFF_SECONDS = 1.0
+
+# Box scores of finished games and game lists of past seasons never change and
+# are cached until evicted; the rest is refreshed after these many seconds
+NBA_API_CACHE = ResponseCache()
+LIVE_GAME_TTL_SECONDS = 60
+CURRENT_SEASON_GAMES_TTL_SECONDS = 15 * 60
+GAME_STATUS_FINAL = 3
+
+BOX_SCORE_STRATEGY = 'box_score'
+PLAYER_GAME_LOGS_STRATEGY = 'player_game_logs'
+FETCH_STRATEGIES = (BOX_SCORE_STRATEGY, PLAYER_GAME_LOGS_STRATEGY)
+
+GAME_FINDER_DTYPES = {'GAME_ID': str, 'GAME_DATE': str, 'MATCHUP': str}
+PLAYER_GAME_LOGS_DTYPES = {
+    'PLAYER_NAME': str,
+    'GAME_DATE': 'datetime64[ns]',
+    'MATCHUP': str,
+    'PTS': 'int32',
+    'REB': 'int32',
+    'AST': 'int32',
+    'FG3M': 'int32',
+    'MIN': 'float64',
+}
+
+# Live box score minutes, an ISO 8601 duration such as "PT32M10.00S"
+ISO_DURATION_PATTERN = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:([\d.]+)S)?')
+
+
+def _raise_for_retryable_status(response: requests.Response, *args, **kwargs) -> None:
+    """Session hook: nba_api returns throttled (429) and server error (5xx) responses as if they were data"""
+    if response.status_code == 429 or response.status_code >= 500:
+        response.raise_for_status()
+
+
+# Shared by the stats and live endpoints, which otherwise never look at the status code
+NBA_API_SESSION = requests.Session()
+NBA_API_SESSION.hooks['response'].append(_raise_for_retryable_status)
+NBAHTTP.set_session(NBA_API_SESSION)
+
+
+def fetch_nba_api(endpoint: str, params: dict, request: Callable[[], dict],
+                  ttl_seconds: Union[Ttl, Callable[[dict], Ttl]] = None) -> dict:
+    """
+    Returns an nba_api response from the disk cache, or requests it under the
+    shared rate limit with retries and caches it.
+
+    Args:
+        endpoint (str): Endpoint name, part of the cache key
+        params (dict): Parameters of the request, part of the cache key
+        request (Callable[[], dict]): Makes the request and returns the response dictionary
+        ttl_seconds: Seconds the response stays cached (None for ever), or a function of the response
+
+    Returns:
+        dict: The response dictionary
+    """
+    return NBA_API_CACHE.get_or_fetch(
+        endpoint, params,
+        lambda: call_with_retry(request, NBA_API_RATE_LIMITER, NBA_API_MAX_ATTEMPTS, NBA_API_BACKOFF_SECONDS,
+                                retry_on=(RequestException, ValueError)),
+        ttl_seconds)
+
+
+def parse_iso_minutes(duration: Optional[str]) -> float:
+    """Decimal minutes of a live box score duration, e.g. "PT32M10.00S" -> 32.1667; 0 when missing"""
+    match = ISO_DURATION_PATTERN.fullmatch(duration or '')
+    if match is None:
+        return 0.0
+    hours, minutes, seconds = (float(part) if part else 0.0 for part in match.groups())
+    return hours * 60 + minutes + seconds / 60
+
+
+def season_games_ttl(season: str, today: Optional[date] = None) -> Ttl:
+    """Game lists of the season in progress (which starts in October) are refreshed, past ones kept"""
+    today = today or date.today()
+    current_season_start_year = today.year if today.month >= 10 else today.year - 1
+    return CURRENT_SEASON_GAMES_TTL_SECONDS if int(season[:4]) >= current_season_start_year else None
+
+
+def box_score_ttl(box_score: dict) -> Ttl:
+    """Box scores of finished games are kept, those of scheduled or live games refreshed"""
+    return None if box_score['game']['gameStatus'] == GAME_STATUS_FINAL else LIVE_GAME_TTL_SECONDS
+
 
 TEAM_IDS_BY_TEAM_ABBRV = {
     'ATL': '1610612737',
@@ -54,7 +153,7 @@ class PlayerGameStats:
         points (int): Points scored
         rebounds (int): Total rebounds
         assists (int): Total assists
-        minutes (str): Minutes played
+        minutes (float): Minutes played, in decimal minutes
         threes_made (int): 3-point field goals made
     """
     game_date: str
@@ -62,24 +161,50 @@ class PlayerGameStats:
     points: int
     rebounds: int
     assists: int
-    minutes: str
+    minutes: float
     threes_made: int
 
 
 class TeamGameFinder:
     """
     A class to fetch game statistics for all players from a team against a specific opponent.
-    Makes direct API calls without caching.
+    Responses are cached on disk and shared across processes; box scores that are
+    not cached yet are fetched concurrently under a shared rate limit.
     """
 
     @staticmethod
-    def get_team_games(team_abbreviation: str, season: str) -> Dict[str, List[PlayerGameStats]]:
+    def fetch_box_scores(game_ids: List[str], max_workers: int = MAX_FETCH_WORKERS) -> List[dict]:
+        """
+        Fetches the live box score of every game on a bounded thread pool.
+
+        Args:
+            game_ids (List[str]): NBA game IDs
+            max_workers (int): Concurrent requests at most
+
+        Returns:
+            List[dict]: Box score payloads, in the order of game_ids
+        """
+        def fetch_box_score(game_id: str) -> dict:
+            return fetch_nba_api(
+                'BoxScore', {'game_id': game_id},
+                lambda: BoxScore(game_id=game_id, timeout=NBA_API_TIMEOUT_SECONDS).get_dict(),
+                box_score_ttl)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fetch_box_score, game_ids))
+
+    @staticmethod
+    def get_team_games(team_abbreviation: str, season: str,
+                       strategy: str = BOX_SCORE_STRATEGY) -> Dict[str, List[PlayerGameStats]]:
         """
         Retrieves game statistics for all players from a team against a specific opponent.
 
         Args:
             team_abbreviation (str): NBA API team ID
             season (str): Season in format "YYYY-YY" (e.g., "2022-23")
+            strategy (str): How to fetch the statistics, one of FETCH_STRATEGIES:
+                'box_score' looks up the team's games and fetches one box score per game,
+                'player_game_logs' fetches the game logs of all the team's players in one call
 
         Returns:
             Dict[str, List[PlayerGameStats]]: Dictionary mapping player names to their game stats
@@ -90,75 +215,122 @@ class TeamGameFinder:
         try:
 
             team_id = TEAM_IDS_BY_TEAM_ABBRV[team_abbreviation]
-            # Find games between the two teams
-            game_finder = LeagueGameFinder(
-                team_id_nullable=team_id,
-                season_nullable=season,
-                season_type_nullable=SeasonTypePlayoffs.playoffs
-            )
-
-            games_dict = game_finder.get_dict()
-
-            if not games_dict.get('resultSets', []):
-                logger.info(
-                    f"No games found for team {team_abbreviation} in season {season}")
-                return {}
-
-            # Get game IDs and dates
-            games = {}
-            for row in games_dict['resultSets'][0]['rowSet']:
-                game_id = row[games_dict['resultSets']
-                              [0]['headers'].index('GAME_ID')]
-                game_date = row[games_dict['resultSets']
-                                [0]['headers'].index('GAME_DATE')]
-                matchup = row[games_dict['resultSets']
-                              [0]['headers'].index('MATCHUP')]
-                games[game_id] = {'date': game_date, 'matchup': matchup}
-
-            # Get player stats for each game
-            player_stats: Dict[str, List[PlayerGameStats]] = {}
-
-            for game_id, game_info in games.items():
-                box_score = BoxScore(game_id=game_id)
-                game_data = box_score.get_dict()
-
-                # Determine which team we're looking for
-                home_team_id = game_data['game']['homeTeam']['teamId']
-                target_team_data = (game_data['game']['homeTeam']
-                                    if str(home_team_id) == team_id
-                                    else game_data['game']['awayTeam'])
-
-                # Process each player's stats
-                for player in target_team_data['players']:
-                    player_name = player['name']
-                    stats = player['statistics']
-
-                    game_stat = PlayerGameStats(
-                        game_date=game_info['date'],
-                        matchup=game_info['matchup'],
-                        points=int(
-                            stats['points']) if stats['points'] is not None else 0,
-                        rebounds=int(
-                            stats['reboundsTotal']) if stats['reboundsTotal'] is not None else 0,
-                        assists=int(
-                            stats['assists']) if stats['assists'] is not None else 0,
-                        minutes=str(
-                            stats['minutes']) if stats['minutes'] is not None else '0',
-                        threes_made=int(
-                            stats['threePointersMade']) if stats.get('threePointersMade') is not None else 0
-                    )
-
-                    if player_name in player_stats:
-                        player_stats[player_name].append(game_stat)
-                    else:
-                        player_stats[player_name] = [game_stat]
-
-            return player_stats
+            if strategy == BOX_SCORE_STRATEGY:
+                return TeamGameFinder._get_team_games_from_box_scores(team_abbreviation, team_id, season)
+            if strategy == PLAYER_GAME_LOGS_STRATEGY:
+                return TeamGameFinder._get_team_games_from_player_game_logs(team_abbreviation, team_id, season)
+            raise ValueError(f"Unknown fetch strategy {strategy}, expected one of {FETCH_STRATEGIES}")
 
         except Exception as e:
             logger.error(f"Error fetching team stats: {str(e)}")
             raise
 
+    @staticmethod
+    def _get_team_games_from_box_scores(team_abbreviation: str, team_id: str,
+                                        season: str) -> Dict[str, List[PlayerGameStats]]:
+        """One LeagueGameFinder call, then one live box score per game"""
+        # Find games between the two teams
+        games_dict = fetch_nba_api(
+            'LeagueGameFinder',
+            {'team_id': team_id, 'season': season, 'season_type': SeasonTypePlayoffs.playoffs},
+            lambda: LeagueGameFinder(
+                team_id_nullable=team_id,
+                season_nullable=season,
+                season_type_nullable=SeasonTypePlayoffs.playoffs,
+                timeout=NBA_API_TIMEOUT_SECONDS
+            ).get_dict(),
+            season_games_ttl(season))
+
+        games = decode_result_set(games_dict, GAME_FINDER_DTYPES).drop_duplicates('GAME_ID')
+        if games.empty:
+            logger.info(
+                f"No games found for team {team_abbreviation} in season {season}")
+            return {}
+
+        # Get player stats for each game
+        player_stats: Dict[str, List[PlayerGameStats]] = {}
+
+        box_scores = TeamGameFinder.fetch_box_scores(games['GAME_ID'].tolist())
+
+        for game_date, matchup, game_data in zip(games['GAME_DATE'], games['MATCHUP'], box_scores):
+
+            # Determine which team we're looking for
+            home_team_id = game_data['game']['homeTeam']['teamId']
+            target_team_data = (game_data['game']['homeTeam']
+                                if str(home_team_id) == team_id
+                                else game_data['game']['awayTeam'])
+
+            # Process each player's stats
+            for player in target_team_data['players']:
+                player_name = player['name']
+                stats = player['statistics']
+
+                game_stat = PlayerGameStats(
+                    game_date=game_date,
+                    matchup=matchup,
+                    points=int(
+                        stats['points']) if stats['points'] is not None else 0,
+                    rebounds=int(
+                        stats['reboundsTotal']) if stats['reboundsTotal'] is not None else 0,
+                    assists=int(
+                        stats['assists']) if stats['assists'] is not None else 0,
+                    minutes=parse_iso_minutes(stats['minutes']),
+                    threes_made=int(
+                        stats['threePointersMade']) if stats.get('threePointersMade') is not None else 0
+                )
+
+                if player_name in player_stats:
+                    player_stats[player_name].append(game_stat)
+                else:
+                    player_stats[player_name] = [game_stat]
+
+        return player_stats
+
+    @staticmethod
+    def _get_team_games_from_player_game_logs(team_abbreviation: str, team_id: str,
+                                              season: str) -> Dict[str, List[PlayerGameStats]]:
+        """
+        One PlayerGameLogs call covering every player of the team in the season.
+
+        Unlike box scores, game logs only list players who got on the floor.
+        """
+        logs_dict = fetch_nba_api(
+            'PlayerGameLogs',
+            {'team_id': team_id, 'season': season, 'season_type': SeasonTypePlayoffs.playoffs},
+            lambda: PlayerGameLogs(
+                team_id_nullable=team_id,
+                season_nullable=season,
+                season_type_nullable=SeasonTypePlayoffs.playoffs,
+                timeout=NBA_API_TIMEOUT_SECONDS
+            ).get_dict(),
+            season_games_ttl(season))
+
+        logs = decode_result_set(logs_dict, PLAYER_GAME_LOGS_DTYPES)
+        if logs.empty:
+            logger.info(
+                f"No games found for team {team_abbreviation} in season {season}")
+            return {}
+
+        # GAME_DATE is "2024-04-20T00:00:00", LeagueGameFinder's "2024-04-20"
+        game_dates = logs['GAME_DATE'].dt.strftime('%Y-%m-%d')
+        minutes = logs['MIN'].fillna(0).tolist()
+
+        player_stats: Dict[str, List[PlayerGameStats]] = {}
+        for player_name, game_date, matchup, points, rebounds, assists, minutes_played, threes_made in zip(
+                logs['PLAYER_NAME'], game_dates, logs['MATCHUP'], logs['PTS'].tolist(), logs['REB'].tolist(),
+                logs['AST'].tolist(), minutes, logs['FG3M'].tolist()):
+            player_stats.setdefault(player_name, []).append(PlayerGameStats(
+                game_date=game_date,
+                matchup=matchup,
+                points=points,
+                rebounds=rebounds,
+                assists=assists,
+                minutes=minutes_played,
+                threes_made=threes_made
+            ))
+
+        return player_stats
+
 
 if __name__ == "__main__":
     # Example: Get Denver Nuggets vs Miami Heat playoff games (2022-23 season)
@@ -0,0 +1,113 @@
+"""
+Load NBA playoff box scores into the league schema's players and game_stats
+tables, which the playoff visualizer page reads instead of the live API.
+
+One league-wide PlayerGameLogs call per season covers every team, goes
+through the shared nba_api disk cache and rate limiter, and each season is
+replaced in its own transaction, so the job can be re-run at any time:
+
+    python -m nba_playoff_stats_visualizer.playoff_stats_ingestion
+    python -m nba_playoff_stats_visualizer.playoff_stats_ingestion 2024-25
+"""
+import argparse
+import logging
+from typing import List
+
+import pandas as pd
+from nba_api.stats.endpoints import PlayerGameLogs
+from nba_api.stats.library.parameters import SeasonTypePlayoffs
+
+from betting_odds.data_access.stats_repository import StatsRepository
+from nba_playoff_stats_visualizer.playoff_stats_finder import (
+    NBA_API_TIMEOUT_SECONDS, fetch_nba_api, season_games_ttl)
+from nba_playoff_stats_visualizer.result_sets import decode_result_set
+from nba_playoff_stats_visualizer.seasons import PLAYOFF_SEASONS
+
+logger = logging.getLogger(__name__)
+
+# PlayerGameLogs headers and the game_stats columns they are stored as
+GAME_LOG_COLUMNS = {
+    'PLAYER_ID': ('player_id', 'int64'),
+    'PLAYER_NAME': ('player_name', str),
+    'TEAM_ABBREVIATION': ('team_abbreviation', str),
+    'GAME_ID': ('game_id', str),
+    'GAME_DATE': ('game_date', 'datetime64[ns]'),
+    'MATCHUP': ('matchup', str),
+    'PTS': ('points', 'int32'),
+    'AST': ('assists', 'int32'),
+    'REB': ('rebounds', 'int32'),
+    'FG3M': ('three_pointers_made', 'int32'),
+    'MIN': ('minutes', 'float64'),
+}
+
+
+def fetch_season_playoff_stats(season: str) -> pd.DataFrame:
+    """
+    Fetch the playoff game logs of every player in a season
+
+    Args:
+        season: Season in format "YYYY-YY" (e.g., "2022-23")
+
+    Returns:
+        DataFrame with the game_stats columns plus player_name and
+        team_abbreviation; minutes in decimal minutes, NaN when the
+        player did not play
+    """
+    logs_dict = fetch_nba_api(
+        'PlayerGameLogs',
+        {'season': season, 'season_type': SeasonTypePlayoffs.playoffs},
+        lambda: PlayerGameLogs(
+            season_nullable=season,
+            season_type_nullable=SeasonTypePlayoffs.playoffs,
+            timeout=NBA_API_TIMEOUT_SECONDS
+        ).get_dict(),
+        season_games_ttl(season))
+
+    logs = decode_result_set(logs_dict, {header: dtype for header, (_, dtype) in GAME_LOG_COLUMNS.items()})
+    return logs.rename(columns={header: column for header, (column, _) in GAME_LOG_COLUMNS.items()})
+
+
+def ingest_playoff_stats(database, seasons: List[str]) -> int:
+    """
+    Replace the playoff box scores of the given seasons in the database
+
+    Args:
+        database: Database routed to the league schema (e.g. nba)
+        seasons: Seasons in format "YYYY-YY"
+
+    Returns:
+        Number of player games stored
+    """
+    stats_repository = StatsRepository(database)
+    stored_games = 0
+    for season in seasons:
+        game_stats_df = fetch_season_playoff_stats(season)
+        if game_stats_df.empty:
+            logger.info(f"No playoff games found for season {season}, keeping stored rows")
+            continue
+
+        stats_repository.replace_season_game_stats(season, SeasonTypePlayoffs.playoffs, game_stats_df)
+        logger.info(f"Stored {len(game_stats_df)} player games of {game_stats_df['game_id'].nunique()} "
+                    f"playoff games for season {season}")
+        stored_games += len(game_stats_df)
+
+    return stored_games
+
+
+if __name__ == "__main__":
+    from database.database import Database
+    from database.utils import get_engine
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Load NBA playoff box scores into the database")
+    parser.add_argument("seasons", nargs="*", default=PLAYOFF_SEASONS,
+                        help='Seasons to load, e.g. 2023-24 2024-25 (all seasons of the page by default)')
+    parser.add_argument("--schema", default="nba", help="League schema to load into")
+    parser.add_argument("--connection-string", default=None,
+                        help="SQLAlchemy connection string (defaults to the secrets file)")
+    args = parser.parse_args()
+
+    ingested = ingest_playoff_stats(Database(engine=get_engine(args.connection_string), schema=args.schema),
+                                    args.seasons)
+    print(f"Stored {ingested} player games in schema {args.schema}")
@@ -3,7 +3,33 @@ import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
-from nba_playoff_stats_visualizer.playoff_stats_finder import TeamGameFinder
+from betting_odds.data_access.stats_repository import StatsRepository
+from database.utils import get_database
+from nba_playoff_stats_visualizer.seasons import PLAYOFF_SEASONS
+
+stats_repository = StatsRepository(get_database('nba'))
+
+# game_stats columns loaded by nba_playoff_stats_visualizer.playoff_stats_ingestion
+PLAYOFF_STATS_COLUMNS = {
+    'player_name': 'Player',
+    'game_date': 'Game Date',
+    'matchup': 'Matchup',
+    'points': 'Points',
+    'rebounds': 'Rebounds',
+    'assists': 'Assists',
+    'three_pointers_made': 'Threes Made',
+    'minutes': 'Minutes',
+}
+
+
+@st.cache_data(ttl=3600)
+def get_team_playoff_stats(team_abbreviation: str, season: str) -> pd.DataFrame:
+    """Get the playoff games of every player of a team in a season."""
+    team_stats_df = stats_repository.query_team_stats(
+        team_abbreviation, season, 'Playoffs', list(PLAYOFF_STATS_COLUMNS))
+    # Plain strings, so the groupbys and pivots below only see the team's own players
+    return (team_stats_df.astype({'player_name': str, 'matchup': str})
+            .rename(columns=PLAYOFF_STATS_COLUMNS))
 
 # Hide the st.markdown anchor icon
 st.html(
@@ -44,10 +70,9 @@ st.header("Selection Options", anchor=False)
 col1, col2 = st.columns(2)
 
 with col1:
-    # Season selection - NBA seasons typically span two years
-    seasons = [f"{year}-{str(year + 1)[-2:]}" for year in range(2015, 2025)]
+    # Season selection - the seasons loaded by playoff_stats_ingestion
     selected_season = st.selectbox(
-        "Select Season", seasons, index=len(seasons) - 1)
+        "Select Season", PLAYOFF_SEASONS, index=len(PLAYOFF_SEASONS) - 1)
 
 with col2:
     # Team selection
@@ -70,29 +95,10 @@ with col2:
 # Add loading indicator
 with st.spinner("Fetching playoff statistics..."):
     try:
-        # Get data using the existing TeamGameFinder
-        finder = TeamGameFinder()
-        team_stats = finder.get_team_games(selected_team, selected_season)
-
-        if team_stats:
-            # Convert player stats to DataFrame for easier manipulation
-            all_player_games = []
-            for player_name, games in team_stats.items():
-                for game in games:
-                    game_data = {
-                        'Player': player_name,
-                        'Game Date': game.game_date,
-                        'Matchup': game.matchup,
-                        'Points': game.points,
-                        'Rebounds': game.rebounds,
-                        'Assists': game.assists,
-                        'Threes Made': game.threes_made,
-                        'Minutes': game.minutes
-                    }
-                    all_player_games.append(game_data)
-
-            df = pd.DataFrame(all_player_games)
+        # Box scores loaded into the database by the playoff stats ingestion job
+        df = get_team_playoff_stats(selected_team, selected_season)
 
+        if not df.empty:
             # Extract opponent from matchup
             df['Home Team'] = df['Matchup'].apply(
                 lambda x: x.split(' ')[0])
@@ -0,0 +1,70 @@
+import logging
+import random
+import threading
+import time
+from typing import Callable, Tuple, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting how often the NBA endpoints are called.
+
+    Holds up to `capacity` tokens, refilled at `rate` tokens per second; every
+    request takes one token and blocks until one is available, so a burst of
+    `capacity` requests goes out at once and the rest are spread at `rate`.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        if rate <= 0 or capacity < 1:
+            raise ValueError(f"Invalid token bucket rate {rate} or capacity {capacity}")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until the bucket has refilled enough"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+def call_with_retry(fetch: Callable[[], T], rate_limiter: TokenBucket, max_attempts: int = 4,
+                    backoff_seconds: float = 1.0,
+                    retry_on: Tuple[Type[BaseException], ...] = (Exception,)) -> T:
+    """
+    Call `fetch` under the rate limiter, retrying failures with exponential
+    backoff and jitter
+
+    Args:
+        fetch: The request to make
+        rate_limiter: Bucket every attempt (retries included) takes a token from
+        max_attempts: Attempts before the last error is raised
+        backoff_seconds: Wait before the first retry, doubled after each attempt
+        retry_on: Exception types worth retrying
+
+    Returns:
+        The result of the first successful call
+    """
+    for attempt in range(1, max_attempts + 1):
+        rate_limiter.acquire()
+        try:
+            return fetch()
+        except retry_on as e:
+            if attempt == max_attempts:
+                raise
+            wait_seconds = backoff_seconds * 2 ** (attempt - 1) * random.uniform(1, 1.5)
+            logger.warning(f"Attempt {attempt}/{max_attempts} failed ({e}), retrying in {wait_seconds:.1f}s")
+            time.sleep(wait_seconds)
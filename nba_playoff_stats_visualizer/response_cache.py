@@ -0,0 +1,154 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import closing
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Next to the package rather than the working directory, unless configured
+CACHE_DIR = Path(os.environ.get("NBA_API_CACHE_DIR", Path(__file__).resolve().parent.parent / ".nba_api_cache"))
+DEFAULT_CACHE_PATH = CACHE_DIR / "responses.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Seconds a response stays fresh; None keeps it until evicted
+Ttl = Optional[float]
+
+
+class ResponseCache:
+    """
+    On-disk cache of nba_api responses, shared by every process on the host.
+
+    Entries are content-addressed by the sha256 of the endpoint name and its
+    parameters, and stored zlib-compressed in SQLite (WAL mode, so Streamlit
+    sessions and ingestion jobs can read and write concurrently). Once the
+    stored payloads exceed `max_bytes`, the least recently read entries are
+    evicted. Nothing is created on disk until the cache is first used.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _initialize(self) -> None:
+        """Create the cache directory and table on first use"""
+        with self._init_lock:
+            if self._initialized:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(self.path, timeout=30, isolation_level=None)) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        endpoint TEXT NOT NULL,
+                        payload BLOB NOT NULL,
+                        size INTEGER NOT NULL,
+                        expires_at REAL,
+                        last_accessed_at REAL NOT NULL
+                    )""")
+                conn.execute("CREATE INDEX IF NOT EXISTS ix_responses_last_accessed_at "
+                             "ON responses (last_accessed_at)")
+            self._initialized = True
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per operation keeps the cache thread-safe
+        if not self._initialized:
+            self._initialize()
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    @staticmethod
+    def cache_key(endpoint: str, params: dict) -> str:
+        """sha256 of the endpoint and its parameters, independent of their order"""
+        content = json.dumps([endpoint, params], sort_keys=True, default=str)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get(self, endpoint: str, params: dict) -> Optional[dict]:
+        """
+        Returns the cached response, or None when missing or expired
+        """
+        key = self.cache_key(endpoint, params)
+        now = time.time()
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT payload, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                return None
+            conn.execute("UPDATE responses SET last_accessed_at = ? WHERE key = ?", (now, key))
+            return json.loads(zlib.decompress(row[0]))
+        finally:
+            conn.close()
+
+    def put(self, endpoint: str, params: dict, payload: dict, ttl_seconds: Ttl = None) -> None:
+        """
+        Stores a response, then evicts the least recently read entries over the size cap
+
+        Args:
+            endpoint: nba_api endpoint name
+            params: Parameters the endpoint was called with
+            payload: The response dictionary
+            ttl_seconds: Seconds the response stays fresh, None to keep it until evicted
+        """
+        key = self.cache_key(endpoint, params)
+        blob = zlib.compress(json.dumps(payload).encode())
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds is not None else None
+        conn = self._connect()
+        try:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                         (key, endpoint, blob, len(blob), expires_at, now))
+            # Keep the most recently read entries that fit under the cap
+            evicted = conn.execute("""
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (
+                            ORDER BY last_accessed_at DESC, key
+                        ) AS cumulative_size
+                        FROM responses
+                    ) WHERE cumulative_size > ?
+                )""", (self.max_bytes,)).rowcount
+            if evicted:
+                logger.info(f"Evicted {evicted} cached responses over {self.max_bytes} bytes")
+        finally:
+            conn.close()
+
+    def get_or_fetch(self, endpoint: str, params: dict, fetch: Callable[[], dict],
+                     ttl_seconds: Union[Ttl, Callable[[dict], Ttl]] = None) -> dict:
+        """
+        Returns the cached response, calling `fetch` and caching its result on a miss
+
+        Args:
+            endpoint: nba_api endpoint name
+            params: Parameters the endpoint is called with
+            fetch: Makes the request and returns the response dictionary
+            ttl_seconds: Seconds the response stays fresh, None to keep it until
+                evicted, or a function of the response returning either
+
+        Returns:
+            dict: The response
+        """
+        # A busy, corrupt or unwritable cache must not fail the request itself
+        try:
+            payload = self.get(endpoint, params)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Could not read cached {endpoint} response: {str(e)}")
+            payload = None
+        if payload is not None:
+            return payload
+
+        payload = fetch()
+        if callable(ttl_seconds):
+            ttl_seconds = ttl_seconds(payload)
+        try:
+            self.put(endpoint, params, payload, ttl_seconds)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Could not cache {endpoint} response: {str(e)}")
+        return payload
@@ -0,0 +1,82 @@
+import logging
+from typing import List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def _result_sets(payload: dict) -> List[dict]:
+    """Result sets of a stats.nba.com payload; some endpoints return a single 'resultSet'"""
+    result_sets = payload.get('resultSets', payload.get('resultSet', []))
+    return [result_sets] if isinstance(result_sets, dict) else result_sets
+
+
+def result_set_names(payload: dict) -> List[str]:
+    """Names of the result sets in an nba_api response dictionary"""
+    return [result_set.get('name') for result_set in _result_sets(payload)]
+
+
+def decode_result_set(payload: dict, dtypes: Optional[Mapping[str, object]] = None,
+                      name: Optional[str] = None) -> pd.DataFrame:
+    """
+    Decodes one result set of an nba_api response into typed columns.
+
+    The row-major rowSet is transposed once and header positions are resolved
+    once per result set, so decoding costs one pass over the rows whatever
+    columns are selected.
+
+    Args:
+        payload (dict): Response dictionary, as returned by an endpoint's get_dict()
+        dtypes (Mapping[str, object]): Headers to decode and their dtype (e.g. 'int32',
+            'float64', 'datetime64[ns]', str); None decodes every header as returned.
+            Missing values in integer columns decode as 0, which is what the stats
+            endpoints mean by a null count
+        name (str): Result set name (e.g. 'LeagueGameFinderResults'), the first one by default
+
+    Returns:
+        pd.DataFrame: One column per selected header, one row per rowSet entry; empty
+        when the payload has no such result set
+
+    Raises:
+        KeyError: If a requested header is missing from the result set
+    """
+    result_sets = _result_sets(payload)
+    if name is not None:
+        result_sets = [result_set for result_set in result_sets if result_set.get('name') == name]
+    if not result_sets:
+        logger.info(f"No result set {name or ''} in payload")
+        return pd.DataFrame(columns=list(dtypes or []))
+
+    headers = result_sets[0]['headers']
+    rows = result_sets[0]['rowSet']
+    position_by_header = {header: position for position, header in enumerate(headers)}
+    if dtypes is None:
+        dtypes = dict.fromkeys(headers)
+
+    missing_headers = [header for header in dtypes if header not in position_by_header]
+    if missing_headers:
+        raise KeyError(f"Headers {missing_headers} not in result set {result_sets[0].get('name')}")
+
+    values_by_position = list(zip(*rows)) if rows else [()] * len(headers)
+    return pd.DataFrame({header: _decode_column(values_by_position[position_by_header[header]], dtype)
+                         for header, dtype in dtypes.items()})
+
+
+def _decode_column(values: tuple, dtype: object) -> pd.Series:
+    """Casts one transposed column to the requested dtype (None keeps pandas' inference)"""
+    if dtype is None:
+        return pd.Series(values)
+    if dtype is str:
+        column = pd.Series(values, dtype=object)
+        return column.where(column.isna(), column.astype(str))
+
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'M':
+        return pd.Series(pd.to_datetime(pd.Series(values, dtype=object)), dtype=dtype)
+    if dtype.kind in 'iu':
+        return pd.Series(pd.to_numeric(pd.Series(values, dtype=object)).fillna(0), dtype=dtype)
+    if dtype.kind == 'f':
+        return pd.Series(pd.to_numeric(pd.Series(values, dtype=object)), dtype=dtype)
+    return pd.Series(values, dtype=dtype)
@@ -0,0 +1,3 @@
+# Playoff seasons offered by the visualizer page and loaded by the ingestion
+# job by default, oldest first; NBA seasons span two years ("2024-25")
+PLAYOFF_SEASONS = [f"{year}-{str(year + 1)[-2:]}" for year in range(2015, 2025)]
@@ -0,0 +1,63 @@
+"""
+Shared fixtures.
+
+Most tests run on an in-memory SQLite database holding the ORM tables. Tests
+of Postgres-only behaviour (migrations, triggers, upserts, query plans) use
+the `postgres_database` fixture, which migrates a throwaway schema in the
+database given by TEST_DATABASE_URL and is skipped when it is not set:
+
+    TEST_DATABASE_URL=postgresql+psycopg2://localhost/betting_test pytest
+"""
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import StaticPool
+
+from database.base import Base
+from database.database import Database, create_shared_engine
+
+
+def _split_part(value: str, delimiter: str, position: int) -> str:
+    """Postgres' split_part, for the generated game_stats.team_abbreviation column"""
+    parts = value.split(delimiter)
+    return parts[position - 1] if position <= len(parts) else ''
+
+
+@pytest.fixture
+def sqlite_database() -> Database:
+    """Empty in-memory SQLite database with every ORM table"""
+    # Importing the models registers their tables on Base.metadata
+    from betting_odds.models import orm_models  # noqa: F401
+
+    engine = create_engine("sqlite://", poolclass=StaticPool,
+                           connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def register_functions(dbapi_connection, connection_record):
+        dbapi_connection.create_function("split_part", 3, _split_part, deterministic=True)
+
+    database = Database(engine=engine, schema="main")
+    Base.metadata.create_all(database.engine)
+    yield database
+    engine.dispose()
+
+
+@pytest.fixture
+def postgres_database() -> Database:
+    """Freshly migrated throwaway schema in the TEST_DATABASE_URL database"""
+    from database.migrations import migrate
+
+    connection_string = os.environ.get("TEST_DATABASE_URL")
+    if not connection_string:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    engine = create_shared_engine(connection_string, pool_size=2, max_overflow=0)
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    database = Database(engine=engine, schema=schema)
+    migrate(database)
+    yield database
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+    engine.dispose()
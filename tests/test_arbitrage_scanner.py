@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+from sqlalchemy import insert
+
+from betting_odds.data_access.arbitrage_repository import ArbitrageRepository
+from betting_odds.models.orm_models import EventORM, PlayerPropORM
+from betting_odds.services.arbitrage_scanner import (
+    find_arbitrages, find_middles, refresh_opportunities, scan_opportunities)
+
+JOB_START = datetime(2025, 5, 1, 12, tzinfo=timezone.utc)
+
+# (game, player, prop type, line, bookmaker, over odds, under odds)
+SNAPSHOT = [
+    # Best over at bet365 and best under at unibet imply less than 1
+    ('g1', 'A', 'Points', 20.5, 'bet365', 2.1, 1.8),
+    ('g1', 'A', 'Points', 20.5, 'unibet', 1.85, 2.05),
+    # Over 8.5 at bet365 and under 9.5 at unibet both win on 9 rebounds
+    ('g1', 'B', 'Rebounds', 8.5, 'bet365', 1.9, 1.9),
+    ('g1', 'B', 'Rebounds', 9.5, 'unibet', 1.7, 2.0),
+]
+
+
+@pytest.fixture
+def props_df() -> pd.DataFrame:
+    return pd.DataFrame(SNAPSHOT, columns=['game_id', 'player_name', 'prop_type', 'line', 'bookmaker',
+                                           'over_odds', 'under_odds']).assign(job_start_time_utc=JOB_START)
+
+
+def test_find_arbitrages_pairs_the_best_prices_of_each_side(props_df):
+    arbitrages = find_arbitrages(props_df)
+
+    assert len(arbitrages) == 1
+    arbitrage = arbitrages.iloc[0]
+    assert (arbitrage['player_name'], arbitrage['kind']) == ('A', 'arbitrage')
+    assert (arbitrage['over_bookmaker'], arbitrage['over_odds']) == ('bet365', 2.1)
+    assert (arbitrage['under_bookmaker'], arbitrage['under_odds']) == ('unibet', 2.05)
+    assert arbitrage['combined_implied_probability'] == pytest.approx(1 / 2.1 + 1 / 2.05)
+    assert arbitrage['job_start_time_utc'] == JOB_START
+
+
+def test_find_arbitrages_ignores_lines_priced_with_vig(props_df):
+    assert find_arbitrages(props_df[props_df['player_name'] == 'B']).empty
+
+
+def test_find_middles_pairs_a_lower_over_with_a_higher_under(props_df):
+    middles = find_middles(props_df)
+
+    assert len(middles) == 1
+    middle = middles.iloc[0]
+    assert (middle['player_name'], middle['kind']) == ('B', 'middle')
+    assert (middle['over_line'], middle['over_bookmaker'], middle['over_odds']) == (8.5, 'bet365', 1.9)
+    assert (middle['under_line'], middle['under_bookmaker'], middle['under_odds']) == (9.5, 'unibet', 2.0)
+    assert middle['combined_implied_probability'] == pytest.approx(1 / 1.9 + 1 / 2.0)
+
+
+def test_find_middles_respects_the_cost_limit(props_df):
+    assert find_middles(props_df, max_combined_implied_probability=1.02).empty
+
+
+def test_scan_opportunities_sorts_best_first(props_df):
+    assert list(scan_opportunities(props_df)['kind']) == ['arbitrage', 'middle']
+    assert scan_opportunities(props_df.iloc[:0]).empty
+
+
+def test_refresh_opportunities_replaces_the_stored_scan(postgres_database, props_df):
+    commence_time = datetime.now(timezone.utc) + timedelta(days=1)
+    with postgres_database.engine.begin() as conn:
+        conn.execute(insert(EventORM), [{'id': 'g1', 'sport_key': 'basketball_nba', 'commence_time_utc': commence_time,
+                                         'derived_game_name': 'Away @ Home'}])
+        conn.execute(insert(PlayerPropORM), props_df.assign(
+            game_start_time_utc=commence_time, odds_collection_time_utc=JOB_START).to_dict('records'))
+
+    assert refresh_opportunities(postgres_database) == 2
+    # A second scan replaces the first instead of adding to it
+    assert refresh_opportunities(postgres_database) == 2
+
+    stored = ArbitrageRepository(postgres_database).get_opportunities()
+    expected = scan_opportunities(props_df)
+    assert list(stored['kind']) == ['arbitrage', 'middle']
+    pd.testing.assert_frame_equal(stored.drop(columns='combined_implied_probability'),
+                                  expected.drop(columns='combined_implied_probability'), check_dtype=False)
+    # Stored with 4 decimals
+    assert stored['combined_implied_probability'].tolist() == pytest.approx(
+        expected['combined_implied_probability'].tolist(), abs=1e-4)
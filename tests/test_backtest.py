@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from betting_odds.models.player_stats_summary import STAT_TYPES
+from betting_odds.services.backtest import BACKTEST_METRICS, build_backtest_data, evaluate
+from betting_odds.services.stat_metrics import get_metric
+from betting_odds.services.value_prop_indicator import POSITIVE, VALUE_DIRECTIONS
+
+
+@pytest.fixture
+def stats_df() -> pd.DataFrame:
+    """A season of two players, oldest game first"""
+    rng = np.random.default_rng(3)
+    frames = []
+    for player_name, games in (('A', 18), ('B', 6)):
+        frames.append(pd.DataFrame({
+            'player_name': player_name,
+            'game_date': pd.date_range('2025-01-01', periods=games, freq='2D'),
+            **{stat_type: rng.integers(0, 30, games) for stat_type in STAT_TYPES},
+            'is_away': rng.random(games) < 0.5,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _prior_baselines(stats_df: pd.DataFrame, metric_type: str) -> np.ndarray:
+    """(games, stats) baselines as computed by build_backtest_data"""
+    player_codes = pd.factorize(stats_df['player_name'])[0]
+    return BACKTEST_METRICS[metric_type](stats_df[STAT_TYPES].astype(float), player_codes,
+                                         stats_df['is_away'].to_numpy()).to_numpy()
+
+
+@pytest.mark.parametrize('metric_type', list(BACKTEST_METRICS))
+def test_baselines_use_only_earlier_games(stats_df, metric_type):
+    baselines = _prior_baselines(stats_df, metric_type)
+
+    metric = get_metric(metric_type)
+    for row, game in stats_df.iterrows():
+        player_games = stats_df[(stats_df['player_name'] == game['player_name'])
+                                & (stats_df['game_date'] < game['game_date'])]
+        if player_games.empty:
+            assert np.isnan(baselines[row]).all()
+            continue
+        # stat_metrics take the games most recent first
+        player_games = player_games.iloc[::-1]
+        for stat_index, stat_type in enumerate(STAT_TYPES):
+            expected = metric(player_games[stat_type].to_numpy(dtype=float), None,
+                              player_games['is_away'].to_numpy())
+            assert baselines[row, stat_index] == pytest.approx(expected), (metric_type, row, stat_type)
+
+
+@pytest.mark.parametrize('metric_type', list(BACKTEST_METRICS))
+def test_later_games_do_not_change_baselines(stats_df, metric_type):
+    changed_df = stats_df.copy()
+    last_game_of_a = stats_df.index[stats_df['player_name'] == 'A'][-1]
+    changed_df.loc[last_game_of_a, STAT_TYPES] = 1000
+
+    np.testing.assert_array_equal(_prior_baselines(changed_df, metric_type),
+                                  _prior_baselines(stats_df, metric_type))
+
+
+def test_evaluate_settles_closing_lines_on_the_game():
+    stats_df = pd.DataFrame({
+        'player_name': 'A', 'game_date': pd.to_datetime(['2025-01-01', '2025-01-02', '2025-01-03']),
+        'points': [10, 20, 30], 'rebounds': 0, 'assists': 0, 'three_pointers_made': 0, 'is_away': False})
+    # 6 pm Eastern on the day of the third game
+    closing_props_df = pd.DataFrame({
+        'game_id': 'g3', 'game_start_time_utc': pd.Timestamp('2025-01-03 23:00', tz='UTC'),
+        'player_name': 'A', 'prop_type': 'Points', 'line': [14.5, 30.0], 'bookmaker': 'bet365',
+        'over_odds': 1.9, 'under_odds': 1.9})
+
+    data = build_backtest_data(stats_df, closing_props_df)
+    assert len(data) == 4
+
+    results = evaluate(data, metric_types=['Season Average']).set_index(['stat_type', 'value_direction'])
+    # Season average before the game is 15: over 14.5 is positive value and won at 1.9
+    over = results.loc[('points', VALUE_DIRECTIONS[POSITIVE])]
+    assert (over['bets'], over['wins'], over['pushes']) == (1, 1, 0)
+    assert over['roi'] == pytest.approx(0.9)
+    # The 30.0 line pushed on both sides: no profit and left out of the hit rate
+    assert results['pushes'].sum() == 2
+    assert results['bets'].sum() == 4
+    assert results['roi'].mul(results['bets']).sum() == pytest.approx(0.9 - 1)
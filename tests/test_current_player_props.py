@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, insert, select, text, update
+
+from betting_odds.models.orm_models import CurrentPlayerPropORM, EventORM, PlayerPropORM
+
+START = datetime(2025, 5, 1, 23, tzinfo=timezone.utc)
+
+
+def _job(game_id: str, hours_before_start: int, line: float) -> list[dict]:
+    job_start_time = START - timedelta(hours=hours_before_start)
+    return [{'game_id': game_id, 'game_start_time_utc': START, 'player_name': player_name,
+             'prop_type': 'Points', 'line': line, 'over_odds': 1.9, 'under_odds': 1.9,
+             'bookmaker': 'bet365', 'odds_collection_time_utc': job_start_time,
+             'job_start_time_utc': job_start_time}
+            for player_name in ('A', 'B')]
+
+
+def _current_jobs(database) -> dict[str, set]:
+    """Job start times held in current_player_props, per game"""
+    with database.engine.connect() as conn:
+        rows = conn.execute(select(CurrentPlayerPropORM.game_id, CurrentPlayerPropORM.job_start_time_utc)).all()
+    jobs = {}
+    for game_id, job_start_time in rows:
+        jobs.setdefault(game_id, set()).add(START - job_start_time)
+    return jobs
+
+
+@pytest.fixture
+def props_database(postgres_database):
+    """Two games with three collection jobs each"""
+    with postgres_database.engine.begin() as conn:
+        conn.execute(insert(EventORM), [{'id': game_id, 'sport_key': 'basketball_nba', 'commence_time_utc': START}
+                                        for game_id in ('g1', 'g2')])
+        for hours_before_start in (12, 6, 1):
+            conn.execute(insert(PlayerPropORM), _job('g1', hours_before_start, 20.5) + _job('g2', hours_before_start, 8.5))
+    return postgres_database
+
+
+def test_insert_keeps_the_latest_job(props_database):
+    assert _current_jobs(props_database) == {'g1': {timedelta(hours=1)}, 'g2': {timedelta(hours=1)}}
+
+
+def test_deleting_the_latest_job_falls_back_to_the_previous_one(props_database):
+    with props_database.engine.begin() as conn:
+        conn.execute(delete(PlayerPropORM).where(PlayerPropORM.game_id == 'g1',
+                                                 PlayerPropORM.job_start_time_utc == START - timedelta(hours=1)))
+    assert _current_jobs(props_database) == {'g1': {timedelta(hours=6)}, 'g2': {timedelta(hours=1)}}
+
+
+def test_pruning_history_keeps_the_snapshot(props_database):
+    with props_database.engine.begin() as conn:
+        conn.execute(delete(PlayerPropORM).where(PlayerPropORM.job_start_time_utc < START - timedelta(hours=2)))
+    assert _current_jobs(props_database) == {'g1': {timedelta(hours=1)}, 'g2': {timedelta(hours=1)}}
+
+
+def test_deleting_every_job_of_a_game_clears_its_snapshot(props_database):
+    with props_database.engine.begin() as conn:
+        conn.execute(delete(PlayerPropORM).where(PlayerPropORM.game_id == 'g2'))
+    assert _current_jobs(props_database) == {'g1': {timedelta(hours=1)}}
+
+
+def test_recollected_job_replaces_the_snapshot(props_database):
+    with props_database.engine.begin() as conn:
+        conn.execute(delete(PlayerPropORM).where(PlayerPropORM.game_id == 'g1',
+                                                 PlayerPropORM.job_start_time_utc == START - timedelta(hours=1)))
+        conn.execute(insert(PlayerPropORM), _job('g1', 1, 21.5))
+    with props_database.engine.connect() as conn:
+        lines = conn.execute(select(CurrentPlayerPropORM.line).where(CurrentPlayerPropORM.game_id == 'g1')).scalars()
+        assert {float(line) for line in lines} == {21.5}
+
+
+def test_updates_are_copied_to_the_snapshot(props_database):
+    with props_database.engine.begin() as conn:
+        conn.execute(update(PlayerPropORM).where(PlayerPropORM.game_id == 'g2').values(line=9.5))
+    with props_database.engine.connect() as conn:
+        lines = conn.execute(select(CurrentPlayerPropORM.line).where(CurrentPlayerPropORM.game_id == 'g2')).scalars()
+        assert {float(line) for line in lines} == {9.5}
+
+
+def test_truncate_clears_the_snapshot(props_database):
+    with props_database.engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {props_database.schema}.player_props"))
+    assert _current_jobs(props_database) == {}
@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import create_engine
+
+from database import utils
+
+
+@pytest.fixture
+def shared_engine(monkeypatch):
+    """A shared engine that was already created, as after the first get_engine call"""
+    engine = create_engine("sqlite:///first.db")
+    monkeypatch.setattr(utils, "_engine", engine)
+    monkeypatch.setattr(utils, "_db_instances", {})
+    return engine
+
+
+def test_get_engine_reuses_the_shared_engine(shared_engine):
+    assert utils.get_engine() is shared_engine
+    assert utils.get_engine("sqlite:///first.db") is shared_engine
+
+
+def test_get_engine_rejects_another_connection_string(shared_engine):
+    with pytest.raises(ValueError, match="already connected"):
+        utils.get_engine("sqlite:///second.db")
+
+
+def test_get_database_rejects_another_connection_string(shared_engine):
+    with pytest.raises(ValueError, match="already connected"):
+        utils.get_database("nba", "sqlite:///second.db")
+
+
+def test_get_engine_needs_a_connection_string_without_secrets(monkeypatch):
+    from database import config
+
+    monkeypatch.setattr(utils, "_engine", None)
+    monkeypatch.setattr(config, "DEFAULT_DB_CONNECTION_STRING", None)
+    with pytest.raises(ValueError, match="No connection string"):
+        utils.get_engine()
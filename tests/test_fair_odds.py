@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import insert
+
+from betting_odds.models.orm_models import CurrentPlayerPropORM
+from betting_odds.services.fair_odds import compute_fair_odds, remove_vig
+from betting_odds.services.matchup_service import MatchupService
+
+# (game, player, prop type, line, bookmaker, over odds, under odds)
+SNAPSHOT = [
+    ('g1', 'A', 'Points', 20.5, 'bet365', 1.9, 1.9),
+    ('g1', 'A', 'Points', 20.5, 'unibet', 2.1, 1.75),
+    ('g1', 'B', 'Rebounds', 8.5, 'bet365', 2.5, 1.6),
+    # Over only: no consensus for this line
+    ('g2', 'C', 'Assists', 4.5, 'unibet', 1.95, 0),
+]
+
+
+@pytest.fixture
+def props_df() -> pd.DataFrame:
+    return pd.DataFrame(SNAPSHOT, columns=['game_id', 'player_name', 'prop_type', 'line',
+                                           'bookmaker', 'over_odds', 'under_odds'])
+
+
+def _side(fair_odds_df: pd.DataFrame, player_name: str, over_under_bet: str) -> pd.Series:
+    rows = fair_odds_df[(fair_odds_df['player_name'] == player_name)
+                        & (fair_odds_df['over_under_bet'] == over_under_bet)]
+    assert len(rows) == 1
+    return rows.iloc[0]
+
+
+def test_remove_vig_scales_both_sides_to_one():
+    fair_over = remove_vig([2.1, 1.9], [1.75, 1.9])
+
+    np.testing.assert_allclose(fair_over, [(1 / 2.1) / (1 / 2.1 + 1 / 1.75), 0.5])
+    assert np.isnan(remove_vig([1.95], [0])).all()
+
+
+def test_best_price_is_measured_against_the_consensus(props_df):
+    fair_odds_df = compute_fair_odds(props_df)
+
+    consensus_over = np.mean([0.5, (1 / 2.1) / (1 / 2.1 + 1 / 1.75)])
+    over = _side(fair_odds_df, 'A', 'over')
+    assert (over['bookie'], over['best_odds'], over['bookmakers']) == ('unibet', 2.1, 2)
+    assert over['fair_probability'] == pytest.approx(consensus_over)
+    assert over['expected_value'] == pytest.approx(consensus_over * 2.1 - 1)
+
+    under = _side(fair_odds_df, 'A', 'under')
+    assert (under['bookie'], under['best_odds']) == ('bet365', 1.9)
+    assert under['expected_value'] == pytest.approx((1 - consensus_over) * 1.9 - 1)
+
+
+def test_a_single_bookmaker_gives_both_sides_its_vig(props_df):
+    fair_odds_df = compute_fair_odds(props_df)
+
+    vig_loss = 1 / (1 / 2.5 + 1 / 1.6) - 1
+    assert _side(fair_odds_df, 'B', 'over')['expected_value'] == pytest.approx(vig_loss)
+    assert _side(fair_odds_df, 'B', 'under')['expected_value'] == pytest.approx(vig_loss)
+
+
+def test_lines_are_ranked_by_expected_value_one_sided_lines_last(props_df):
+    fair_odds_df = compute_fair_odds(props_df)
+
+    assert list(zip(fair_odds_df['player_name'], fair_odds_df['over_under_bet']))[:2] == [('A', 'over'), ('A', 'under')]
+    assert set(zip(fair_odds_df['player_name'][2:4], fair_odds_df['over_under_bet'][2:4])) == {('B', 'over'),
+                                                                                              ('B', 'under')}
+    last = fair_odds_df.iloc[-1]
+    assert (last['player_name'], last['over_under_bet'], last['bookmakers']) == ('C', 'over', 0)
+    assert np.isnan(last['expected_value'])
+    # An under price of 0 is not offered
+    assert len(fair_odds_df) == 5
+
+
+def test_matchup_service_ranks_the_stored_snapshot(sqlite_database, props_df):
+    with sqlite_database.engine.begin() as conn:
+        conn.execute(insert(CurrentPlayerPropORM), [
+            {'id': prop_id, **prop} for prop_id, prop in enumerate(props_df.to_dict('records'))])
+
+    fair_odds_df = MatchupService(sqlite_database).get_matchups_fair_odds(['g1'])
+
+    expected = compute_fair_odds(props_df[props_df['game_id'] == 'g1'])
+    pd.testing.assert_frame_equal(fair_odds_df.iloc[:2], expected.iloc[:2], check_dtype=False)
+    assert len(fair_odds_df) == 4
@@ -0,0 +1,148 @@
+import json
+import logging
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from nba_api.live.nba.library.http import NBALiveHTTP
+from requests.exceptions import HTTPError
+
+from nba_playoff_stats_visualizer import playoff_stats_finder
+from nba_playoff_stats_visualizer.playoff_stats_finder import GAME_STATUS_FINAL, TeamGameFinder
+from nba_playoff_stats_visualizer.rate_limiter import TokenBucket
+from nba_playoff_stats_visualizer.response_cache import ResponseCache
+
+BACKOFF_SECONDS = 0.02
+
+
+class FakeLiveServer(ThreadingHTTPServer):
+    """
+    Serves /boxscore/boxscore_<game id>.json like cdn.nba.com
+
+    Each game answers its queued (status, body) responses in turn, then a
+    valid box score, after its configured delay.
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeLiveHandler)
+        self.delays = {}
+        self.responses = {}
+        self.requests = []  # (game id, start time)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/{{endpoint}}"
+
+    def attempts(self, game_id: str) -> int:
+        return sum(requested_game_id == game_id for requested_game_id, _ in self.requests)
+
+
+class FakeLiveHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        game_id = re.search(r'boxscore_(\w+)\.json', self.path).group(1)
+        server = self.server
+        with server.lock:
+            server.requests.append((game_id, time.monotonic()))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            queued = server.responses.get(game_id)
+            status, body = queued.pop(0) if queued else (200, json.dumps(
+                {'game': {'gameId': game_id, 'gameStatus': GAME_STATUS_FINAL}}))
+        try:
+            threading.Event().wait(server.delays.get(game_id, 0))
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(body.encode())
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def live_server(monkeypatch, tmp_path):
+    """Live endpoints pointed at a local server, with a fresh cache and a fast backoff"""
+    server = FakeLiveServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+
+    monkeypatch.setattr(NBALiveHTTP, 'base_url', server.base_url)
+    monkeypatch.setattr(playoff_stats_finder, 'NBA_API_CACHE', ResponseCache(tmp_path / 'responses.sqlite3'))
+    monkeypatch.setattr(playoff_stats_finder, 'NBA_API_RATE_LIMITER', TokenBucket(rate=1000, capacity=100))
+    monkeypatch.setattr(playoff_stats_finder, 'NBA_API_BACKOFF_SECONDS', BACKOFF_SECONDS)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _game_ids(box_scores) -> list:
+    return [box_score['game']['gameId'] for box_score in box_scores]
+
+
+def test_box_scores_come_back_in_game_order(live_server):
+    game_ids = [f'00424000{number:02d}' for number in range(12)]
+    live_server.delays = {game_id: random.Random(number).uniform(0, 0.15) for number, game_id in enumerate(game_ids)}
+
+    assert _game_ids(TeamGameFinder.fetch_box_scores(game_ids, max_workers=4)) == game_ids
+
+
+def test_concurrent_requests_are_bounded_by_the_workers(live_server):
+    game_ids = [f'00424000{number:02d}' for number in range(12)]
+    live_server.delays = dict.fromkeys(game_ids, 0.05)
+
+    TeamGameFinder.fetch_box_scores(game_ids, max_workers=3)
+
+    assert live_server.max_in_flight == 3
+
+
+def test_requests_are_spread_by_the_token_bucket(live_server, monkeypatch):
+    rate, capacity = 40.0, 2
+    started_at = time.monotonic()
+    monkeypatch.setattr(playoff_stats_finder, 'NBA_API_RATE_LIMITER', TokenBucket(rate=rate, capacity=capacity))
+    game_ids = [f'00424000{number:02d}' for number in range(10)]
+
+    TeamGameFinder.fetch_box_scores(game_ids, max_workers=4)
+
+    # A burst of `capacity` requests, then one every 1 / rate seconds
+    request_times = sorted(request_time - started_at for _, request_time in live_server.requests)
+    for index, request_time in enumerate(request_times):
+        assert request_time >= (index + 1 - capacity) / rate - 0.005
+
+
+@pytest.mark.parametrize('status, body', [(500, '<html>Internal Server Error</html>'),
+                                          (503, '{"message": "unavailable"}'),
+                                          (200, '{"game": ')])
+def test_server_errors_and_bad_json_are_retried_with_backoff(live_server, caplog, status, body):
+    live_server.responses = {'0042400001': [(status, body), (status, body)]}
+
+    with caplog.at_level(logging.WARNING, logger='nba_playoff_stats_visualizer.rate_limiter'):
+        assert _game_ids(TeamGameFinder.fetch_box_scores(['0042400001'])) == ['0042400001']
+
+    assert live_server.attempts('0042400001') == 3
+    assert len(re.findall('retrying in', caplog.text)) == 2
+    # Exponential backoff: at least 1x then 2x the base wait between attempts
+    request_times = [request_time for _, request_time in live_server.requests]
+    assert request_times[1] - request_times[0] >= BACKOFF_SECONDS
+    assert request_times[2] - request_times[1] >= 2 * BACKOFF_SECONDS
+
+
+def test_last_error_is_raised_after_max_attempts(live_server):
+    live_server.responses = {'0042400001': [(500, 'Internal Server Error')] * 10}
+
+    with pytest.raises(HTTPError, match='500'):
+        TeamGameFinder.fetch_box_scores(['0042400002', '0042400001'])
+
+    assert live_server.attempts('0042400001') == playoff_stats_finder.NBA_API_MAX_ATTEMPTS
+    # The failure is not cached: the next call asks the server again
+    live_server.responses = {}
+    assert _game_ids(TeamGameFinder.fetch_box_scores(['0042400001'])) == ['0042400001']
@@ -0,0 +1,53 @@
+import pytest
+
+from nba_playoff_stats_visualizer import playoff_stats_finder
+from nba_playoff_stats_visualizer.playoff_stats_finder import (
+    BOX_SCORE_STRATEGY, GAME_STATUS_FINAL, PLAYER_GAME_LOGS_STRATEGY, TEAM_IDS_BY_TEAM_ABBRV, TeamGameFinder,
+    parse_iso_minutes)
+
+DEN_ID = TEAM_IDS_BY_TEAM_ABBRV['DEN']
+
+
+def _result_set(headers: list, rows: list) -> dict:
+    return {'resultSets': [{'name': 'Results', 'headers': headers, 'rowSet': rows}]}
+
+
+def _player(name: str, points: int, minutes: str) -> dict:
+    return {'name': name, 'statistics': {'points': points, 'reboundsTotal': 5, 'assists': 3,
+                                         'threePointersMade': 1, 'minutes': minutes}}
+
+
+RESPONSES = {
+    'LeagueGameFinder': _result_set(['GAME_ID', 'GAME_DATE', 'MATCHUP'],
+                                    [['0042400301', '2025-05-20', 'DEN vs. OKC']]),
+    'BoxScore': {'game': {'gameStatus': GAME_STATUS_FINAL,
+                          'homeTeam': {'teamId': int(DEN_ID), 'players': [
+                              _player('Nikola Jokic', 30, 'PT40M30.00S'),
+                              _player('Bench Player', 0, 'PT00M00.00S')]},
+                          'awayTeam': {'teamId': 1610612760, 'players': []}}},
+    'PlayerGameLogs': _result_set(['PLAYER_NAME', 'GAME_DATE', 'MATCHUP', 'PTS', 'REB', 'AST', 'FG3M', 'MIN'],
+                                  [['Nikola Jokic', '2025-05-20T00:00:00', 'DEN vs. OKC', 30, 5, 3, 1, 40.5]]),
+}
+
+
+@pytest.fixture(autouse=True)
+def canned_responses(monkeypatch):
+    monkeypatch.setattr(playoff_stats_finder, 'fetch_nba_api',
+                        lambda endpoint, params, request, ttl_seconds=None: RESPONSES[endpoint])
+
+
+@pytest.mark.parametrize('duration, minutes', [('PT40M30.00S', 40.5), ('PT00M00.00S', 0), ('PT05M06S', 5.1),
+                                               ('', 0), (None, 0)])
+def test_parse_iso_minutes(duration, minutes):
+    assert parse_iso_minutes(duration) == pytest.approx(minutes)
+
+
+def test_both_strategies_report_decimal_minutes():
+    box_score_stats = TeamGameFinder.get_team_games('DEN', '2024-25', BOX_SCORE_STRATEGY)
+    game_log_stats = TeamGameFinder.get_team_games('DEN', '2024-25', PLAYER_GAME_LOGS_STRATEGY)
+
+    assert box_score_stats['Nikola Jokic'] == game_log_stats['Nikola Jokic']
+    assert box_score_stats['Nikola Jokic'][0].minutes == 40.5
+    # Only box scores list players who did not get on the floor
+    assert box_score_stats['Bench Player'][0].minutes == 0
+    assert 'Bench Player' not in game_log_stats
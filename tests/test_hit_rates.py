@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from betting_odds.models.player_stats_summary import HIT_RATE_WINDOW_GAMES, STAT_TYPES, HitRateWindow
+from betting_odds.services.player_stats_service import PlayerStatsService
+
+LINES = [0.5, 9.5, 10, 14.5, 20, 20.5, 35.5]
+
+
+@pytest.fixture
+def stats_df() -> pd.DataFrame:
+    """Random whole-number stats of players with 3, 7 and 25 games, rows shuffled"""
+    rng = np.random.default_rng(7)
+    frames = []
+    for player_id, games in enumerate((3, 7, 25), start=1):
+        frames.append(pd.DataFrame({
+            'player_name': f'player {player_id}', 'player_id': player_id,
+            'game_date': pd.date_range('2025-01-01', periods=games),
+            **{stat_type: rng.integers(0, 30, games) for stat_type in STAT_TYPES},
+        }))
+    return pd.concat(frames).sample(frac=1, random_state=0)
+
+
+def _brute_force_hit_rates(player_games: pd.DataFrame, stat_type: str, over_under_bet: str) -> np.ndarray:
+    """Count hits game by game, most recent first"""
+    values = player_games.sort_values('game_date', ascending=False)[stat_type].tolist()
+    hit_rates = np.empty((len(HitRateWindow), len(LINES)))
+    for window, last_n in enumerate(HIT_RATE_WINDOW_GAMES):
+        window_values = values[:last_n]
+        for column, line in enumerate(LINES):
+            if over_under_bet == 'over':
+                hits = sum(value > line for value in window_values)
+            else:
+                hits = sum(value < line for value in window_values)
+            hit_rates[window, column] = hits / len(window_values)
+    return hit_rates
+
+
+@pytest.mark.parametrize('over_under_bet', ['over', 'under'])
+def test_hit_rates_match_a_brute_force_count(stats_df, over_under_bet):
+    summaries = PlayerStatsService(database=None).summarize_player_stats_frame(stats_df)
+
+    for player_name, player_games in stats_df.groupby('player_name'):
+        for stat_type in STAT_TYPES:
+            np.testing.assert_allclose(
+                summaries[player_name].get_hit_rates(stat_type, LINES, over_under_bet),
+                _brute_force_hit_rates(player_games, stat_type, over_under_bet),
+                err_msg=f'{player_name} {stat_type}')
+
+
+def test_a_push_is_a_miss_for_both_sides():
+    stats_df = pd.DataFrame({'player_name': 'A', 'player_id': 1,
+                             'game_date': pd.date_range('2025-01-01', periods=4),
+                             'points': [10, 10, 12, 8], 'rebounds': 0, 'assists': 0, 'three_pointers_made': 0})
+    summary = PlayerStatsService(database=None).summarize_player_stats_frame(stats_df)['A']
+
+    assert summary.get_hit_rates('points', [10], 'over')[HitRateWindow.SEASON, 0] == 0.25
+    assert summary.get_hit_rates('points', [10], 'under')[HitRateWindow.SEASON, 0] == 0.25
+
+
+def test_unknown_stat_has_no_hit_rates(stats_df):
+    summary = PlayerStatsService(database=None).summarize_player_stats_frame(stats_df)['player 1']
+
+    assert np.isnan(summary.get_hit_rates('steals', LINES)).all()
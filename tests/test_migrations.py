@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import ProgrammingError
+
+from betting_odds.models import orm_models  # noqa: F401
+from database.base import Base
+from database.database import Database, create_shared_engine
+from database.migrations import LATEST_SCHEMA_VERSION, MIGRATIONS, get_schema_version, verify_schema_version
+
+
+def test_migrated_schema_is_at_latest_version(postgres_database):
+    assert get_schema_version(postgres_database) == LATEST_SCHEMA_VERSION
+    assert verify_schema_version(postgres_database) == LATEST_SCHEMA_VERSION
+
+
+def test_migrations_build_the_orm_tables(postgres_database):
+    inspector = inspect(postgres_database.engine)
+    schema = postgres_database.schema
+
+    assert set(inspector.get_table_names(schema=schema)) == set(Base.metadata.tables) | {'schema_version'}
+    for table in Base.metadata.sorted_tables:
+        columns = {column['name']: column['nullable']
+                   for column in inspector.get_columns(table.name, schema=schema)}
+        assert columns == {column.name: column.nullable for column in table.columns}, table.name
+        index_names = {index['name'] for index in inspector.get_indexes(table.name, schema=schema)}
+        assert index_names == {index.name for index in table.indexes}, table.name
+
+
+def test_first_migration_does_not_depend_on_the_models(postgres_database):
+    schema = f"{postgres_database.schema}_v1"
+    _, _, create_base_tables = MIGRATIONS[0]
+    with postgres_database.engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        create_base_tables(conn, schema)
+    try:
+        columns = [column['name']
+                   for column in inspect(postgres_database.engine).get_columns('game_stats', schema=schema)]
+        # Added by migrations 2 and 6
+        assert 'is_away' not in columns and 'team_abbreviation' not in columns
+    finally:
+        with postgres_database.engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+
+
+def test_unmigrated_schema_is_at_version_zero(postgres_database):
+    never_migrated = Database(engine=postgres_database.engine, schema=f"{postgres_database.schema}_empty")
+    assert get_schema_version(never_migrated) == 0
+    with pytest.raises(RuntimeError, match="python -m database.migrations"):
+        verify_schema_version(never_migrated)
+
+
+def test_permission_errors_are_not_reported_as_unmigrated(postgres_database):
+    role = f"{postgres_database.schema}_reader"
+    with postgres_database.engine.begin() as conn:
+        conn.execute(text(f"CREATE ROLE {role} LOGIN"))
+    restricted_engine = create_shared_engine(
+        postgres_database.engine.url.set(username=role).render_as_string(hide_password=False))
+    try:
+        with pytest.raises(ProgrammingError, match="permission denied"):
+            get_schema_version(Database(engine=restricted_engine, schema=postgres_database.schema))
+    finally:
+        restricted_engine.dispose()
+        with postgres_database.engine.begin() as conn:
+            conn.execute(text(f"DROP ROLE {role}"))
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from betting_odds.data_access.odds_repository import OddsRepository
+from betting_odds.models.orm_models import CurrentPlayerPropORM, EventORM
+
+JOB_START = datetime(2025, 5, 1, 12, tzinfo=timezone.utc)
+
+# (game, player, prop type, line, bookmaker, over odds, under odds)
+SNAPSHOT = [
+    # Best over at unibet; bet365 and betway tie on the under
+    ('g1', 'A', 'Points', 20.5, 'betway', 1.85, 1.9),
+    ('g1', 'A', 'Points', 20.5, 'bet365', 1.9, 1.9),
+    ('g1', 'A', 'Points', 20.5, 'unibet', 1.95, 1.8),
+    # Missing and zero prices are not offers
+    ('g1', 'B', 'Rebounds', 8.5, 'bet365', 1.8, None),
+    ('g1', 'B', 'Rebounds', 8.5, 'unibet', 0, 0),
+]
+
+
+@pytest.fixture
+def odds_repository(sqlite_database) -> OddsRepository:
+    with sqlite_database.engine.begin() as conn:
+        conn.execute(insert(EventORM), [{'id': game_id, 'sport_key': 'basketball_nba'} for game_id in ('g1', 'g2')])
+        conn.execute(insert(CurrentPlayerPropORM), [
+            {'id': index, 'game_id': game_id, 'player_name': player_name, 'prop_type': prop_type, 'line': line,
+             'bookmaker': bookmaker, 'over_odds': over_odds, 'under_odds': under_odds,
+             'job_start_time_utc': JOB_START}
+            for index, (game_id, player_name, prop_type, line, bookmaker, over_odds, under_odds)
+            in enumerate(SNAPSHOT)])
+    return OddsRepository(sqlite_database)
+
+
+def test_best_odds_keep_the_best_price_of_each_side(odds_repository):
+    best_odds = odds_repository.get_best_odds_for_games(['g1', 'g2'])
+
+    by_side = {(line_odds.player_name, line_odds.over_under_bet): line_odds for line_odds in best_odds}
+    assert sorted(by_side) == [('A', 'over'), ('A', 'under'), ('B', 'over')]
+    assert (by_side['A', 'over'].bookie, by_side['A', 'over'].best_odds) == ('unibet', 1.95)
+    # Equal prices: the first bookmaker by name
+    assert (by_side['A', 'under'].bookie, by_side['A', 'under'].best_odds) == ('bet365', 1.9)
+    assert (by_side['B', 'over'].bookie, by_side['B', 'over'].best_odds) == ('bet365', 1.8)
+
+
+def test_best_odds_are_floats(odds_repository):
+    for line_odds in odds_repository.get_best_odds_for_games(['g1']):
+        assert type(line_odds.line) is float and type(line_odds.best_odds) is float
+        assert line_odds.game_id == 'g1'
+
+
+def test_games_without_props_have_no_best_odds(odds_repository):
+    assert odds_repository.get_best_odds_for_games(['g2']) == []
+    assert odds_repository.get_best_odds_for_games([]) == []
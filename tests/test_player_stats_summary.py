@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from betting_odds.services.player_stats_service import PlayerStatsService
+from betting_odds.services import stat_metrics
+from betting_odds.services.stat_metrics import get_metric, metric_names
+
+POINTS = [30, 12, 25, 18, 22, 9, 27, 15, 20, 24, 11, 28]
+MINUTES = [36, 20, 34, 30, 33, 18, 35, 28, 31, 34, 22, 37]
+
+
+@pytest.fixture
+def stats_df() -> pd.DataFrame:
+    """Twelve games of one player, most recent first, and two games of another"""
+    game_dates = pd.date_range('2025-01-01', periods=len(POINTS))[::-1]
+    player = pd.DataFrame({
+        'player_name': 'A', 'player_id': 1, 'game_date': game_dates,
+        'points': POINTS, 'rebounds': 5, 'assists': 4, 'three_pointers_made': 2,
+        'minutes': MINUTES, 'is_away': [index % 2 == 0 for index in range(len(POINTS))],
+    })
+    other_player = pd.DataFrame({
+        'player_name': 'B', 'player_id': 2, 'game_date': game_dates[:2],
+        'points': [7, 3], 'rebounds': 1, 'assists': 1, 'three_pointers_made': 0,
+        'minutes': [15, 10], 'is_away': [False, False],
+    })
+    # Shuffled, as rows come back from the database
+    return pd.concat([player, other_player]).sample(frac=1, random_state=0)
+
+
+def test_registered_metrics_match_a_direct_computation(stats_df):
+    summary = PlayerStatsService(database=None).summarize_player_stats_frame(stats_df)['A']
+
+    points = np.array(POINTS, dtype=float)
+    minutes = np.array(MINUTES, dtype=float)
+    is_away = np.array([index % 2 == 0 for index in range(len(POINTS))])
+    for metric_type in metric_names():
+        expected = round(float(get_metric(metric_type)(points, minutes, is_away)), 2)
+        assert summary.get_stat_summary('points', metric_type) == pytest.approx(expected), metric_type
+
+
+def test_metrics_without_minutes_or_unknown_are_zero(stats_df):
+    summary = PlayerStatsService(database=None).summarize_player_stats_frame(stats_df.drop(columns='minutes'))['B']
+
+    assert summary.get_stat_summary('points', 'Per-Minute Rate x Last 5 Minutes') == 0
+    assert summary.get_stat_summary('points', 'Unknown Metric') == 0
+    # Player B never played away: the season average
+    assert summary.get_stat_summary('points', 'Away Games Average') == 5
+
+
+def test_metrics_are_computed_once_and_only_when_requested(stats_df, monkeypatch):
+    calls = []
+
+    def counting_metric(values, minutes, is_away):
+        calls.append(len(values))
+        return values.mean()
+
+    monkeypatch.setitem(stat_metrics._METRICS, 'Counting Average', counting_metric)
+    summaries = PlayerStatsService(database=None).summarize_player_stats_frame(stats_df)
+    assert calls == []
+
+    for _ in range(3):
+        assert summaries['A'].get_stat_summary('points', 'Counting Average') == round(np.mean(POINTS), 2)
+    # Once for player A's points; player B and the other stats are never computed
+    assert calls == [len(POINTS)]
+
+    summaries['A'].get_stat_summary('rebounds', 'Counting Average')
+    assert calls == [len(POINTS)] * 2
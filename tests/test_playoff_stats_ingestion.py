@@ -0,0 +1,109 @@
+import pandas as pd
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import DBAPIError
+
+from betting_odds.data_access.stats_repository import StatsRepository
+from betting_odds.models.orm_models import GameStatsORM, PlayerORM
+from nba_playoff_stats_visualizer import playoff_stats_ingestion
+from nba_playoff_stats_visualizer.playoff_stats_ingestion import fetch_season_playoff_stats, ingest_playoff_stats
+
+HEADERS = ['SEASON_YEAR', 'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID', 'TEAM_ABBREVIATION', 'GAME_ID', 'GAME_DATE',
+           'MATCHUP', 'WL', 'MIN', 'FG3M', 'REB', 'AST', 'PTS']
+
+
+def _game_logs(rows: list) -> dict:
+    """PlayerGameLogs response, as returned by get_dict()"""
+    return {'resource': 'playergamelogs', 'parameters': {},
+            'resultSets': [{'name': 'PlayerGameLogs', 'headers': HEADERS, 'rowSet': rows}]}
+
+
+GAME_1 = [
+    ['2023-24', 203999, 'Nikola Jokic', 1610612743, 'DEN', '0042300101', '2024-04-20T00:00:00', 'DEN vs. LAL', 'W',
+     40.55, 1, 16, 13, 32],
+    ['2023-24', 2544, 'LeBron James', 1610612747, 'LAL', '0042300101', '2024-04-20T00:00:00', 'LAL @ DEN', 'L',
+     39.1, 2, 7, 5, 27],
+]
+GAME_2 = [
+    ['2023-24', 203999, 'Nikola Jokic', 1610612743, 'DEN', '0042300102', '2024-04-22T00:00:00', 'DEN vs. LAL', 'W',
+     37.9, 0, 20, 7, 27],
+    # Did not play: null minutes and counts
+    ['2023-24', 1630192, 'Zeke Nnaji', 1610612743, 'DEN', '0042300102', '2024-04-22T00:00:00', 'DEN vs. LAL', 'W',
+     None, None, None, None, None],
+]
+
+
+@pytest.fixture
+def game_logs(monkeypatch) -> dict:
+    """PlayerGameLogs response per season, served instead of stats.nba.com"""
+    responses = {'2023-24': _game_logs(GAME_1 + GAME_2)}
+    monkeypatch.setattr(playoff_stats_ingestion, 'fetch_nba_api',
+                        lambda endpoint, params, request, ttl_seconds=None: responses[params['season']])
+    return responses
+
+
+def _stored_games(database) -> pd.DataFrame:
+    return (StatsRepository(database).query_team_stats('DEN', '2023-24', 'Playoffs')
+            .sort_values(['game_date', 'player_name'], ignore_index=True))
+
+
+def test_fetch_season_playoff_stats_decodes_the_game_logs(game_logs):
+    stats_df = fetch_season_playoff_stats('2023-24')
+
+    assert stats_df['minutes'].tolist()[:3] == [40.55, 39.1, 37.9]
+    assert stats_df['minutes'].isna().tolist() == [False, False, False, True]
+    # Null counts decode as 0
+    assert list(stats_df['points']) == [32, 27, 27, 0]
+    assert stats_df['game_date'].dtype == 'datetime64[ns]'
+
+
+def test_ingest_stores_each_team_and_player(postgres_database, game_logs):
+    assert ingest_playoff_stats(postgres_database, ['2023-24']) == 4
+
+    den_games = _stored_games(postgres_database)
+    assert list(zip(den_games['player_name'].astype(str), den_games['points'])) == [
+        ('Nikola Jokic', 32), ('Nikola Jokic', 27), ('Zeke Nnaji', 0)]
+    # Decimal minutes are stored as reported, missing minutes as NULL
+    assert den_games['minutes'].tolist()[:2] == [40.55, 37.9]
+    assert pd.isna(den_games['minutes'][2])
+    assert not den_games['is_away'].any()
+
+    lal_games = StatsRepository(postgres_database).query_team_stats('LAL', '2023-24', 'Playoffs')
+    assert list(lal_games['player_name'].astype(str)) == ['LeBron James']
+    assert lal_games['is_away'].all()
+
+
+def test_rerunning_replaces_the_season_and_keeps_other_rows(postgres_database, game_logs):
+    ingest_playoff_stats(postgres_database, ['2023-24'])
+    # A stat correction of game 2 after the first load; game 1 is not in the new response
+    corrected = [row[:-1] + [29] if row[2] == 'Nikola Jokic' else row for row in GAME_2]
+    game_logs['2023-24'] = _game_logs(corrected)
+
+    assert ingest_playoff_stats(postgres_database, ['2023-24']) == 2
+
+    den_games = _stored_games(postgres_database)
+    assert list(zip(den_games['game_id'], den_games['points'])) == [
+        ('0042300101', 32), ('0042300102', 29), ('0042300102', 0)]
+    with postgres_database.engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(GameStatsORM)).scalar() == 4
+        assert conn.execute(select(func.count()).select_from(PlayerORM)).scalar() == 3
+
+
+def test_an_empty_response_keeps_the_stored_season(postgres_database, game_logs):
+    ingest_playoff_stats(postgres_database, ['2023-24'])
+    game_logs['2023-24'] = _game_logs([])
+
+    assert ingest_playoff_stats(postgres_database, ['2023-24']) == 0
+    assert len(_stored_games(postgres_database)) == 3
+
+
+def test_a_failed_replace_leaves_the_stored_season_untouched(postgres_database, game_logs):
+    ingest_playoff_stats(postgres_database, ['2023-24'])
+    stats_df = fetch_season_playoff_stats('2023-24')
+    # Not an integer: the insert fails after the delete
+    stats_df['minutes'] = stats_df['minutes'].astype(object).where(stats_df['player_name'] != 'Zeke Nnaji', 'DNP')
+
+    with pytest.raises(DBAPIError):
+        StatsRepository(postgres_database).replace_season_game_stats('2023-24', 'Playoffs', stats_df)
+
+    assert len(_stored_games(postgres_database)) == 3
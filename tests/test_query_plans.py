@@ -0,0 +1,9 @@
+from benchmarks.query_plans import check_query_plans, hot_queries, load_synthetic_data
+
+
+def test_hot_queries_use_index_access_paths(postgres_database):
+    # Smaller than the benchmark's defaults, but large enough that the planner
+    # picks the same plans; on much less data sequential scans win
+    events, players = load_synthetic_data(postgres_database, players=100, games=20, events=50, jobs=6)
+
+    assert check_query_plans(postgres_database, hot_queries(postgres_database, events[:10], players[:30])) == []
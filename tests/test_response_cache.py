@@ -0,0 +1,69 @@
+import sqlite3
+
+import pytest
+
+from nba_playoff_stats_visualizer import response_cache
+from nba_playoff_stats_visualizer.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path) -> ResponseCache:
+    return ResponseCache(tmp_path / 'cache' / 'responses.sqlite3')
+
+
+def test_nothing_is_created_until_first_use(cache):
+    assert not cache.path.parent.exists()
+
+    assert cache.get_or_fetch('BoxScore', {'game_id': '1'}, lambda: {'game': 1}) == {'game': 1}
+    assert cache.path.exists()
+
+
+def test_default_path_does_not_depend_on_the_working_directory():
+    assert response_cache.DEFAULT_CACHE_PATH.is_absolute()
+
+
+def test_hits_do_not_fetch_and_expired_entries_do(cache):
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return {'fetch': len(fetches)}
+
+    assert cache.get_or_fetch('BoxScore', {'game_id': '1'}, fetch) == {'fetch': 1}
+    assert cache.get_or_fetch('BoxScore', {'game_id': '1'}, fetch) == {'fetch': 1}
+    assert cache.get_or_fetch('BoxScore', {'game_id': '2'}, fetch, ttl_seconds=-1) == {'fetch': 2}
+    assert cache.get_or_fetch('BoxScore', {'game_id': '2'}, fetch, ttl_seconds=-1) == {'fetch': 3}
+
+
+def test_an_unreadable_cache_is_a_miss(cache, monkeypatch):
+    def locked(*args, **kwargs):
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(cache, 'get', locked)
+    monkeypatch.setattr(cache, 'put', locked)
+
+    assert cache.get_or_fetch('BoxScore', {'game_id': '1'}, lambda: {'game': 1}) == {'game': 1}
+
+
+def test_a_corrupt_cache_file_is_a_miss(cache):
+    cache.path.parent.mkdir(parents=True)
+    cache.path.write_bytes(b'not a database' * 100)
+
+    assert cache.get_or_fetch('BoxScore', {'game_id': '1'}, lambda: {'game': 1}) == {'game': 1}
+
+
+def test_least_recently_read_entries_are_evicted(tmp_path):
+    cache = ResponseCache(tmp_path / 'responses.sqlite3')
+    for game_id in range(3):
+        cache.put('BoxScore', {'game_id': game_id}, {'rows': list(range(300)), 'game_id': game_id})
+    with sqlite3.connect(cache.path) as conn:
+        sizes = [size for size, in conn.execute("SELECT size FROM responses")]
+    # Room for three entries
+    cache.max_bytes = sum(sizes)
+
+    # Read the oldest entry so the second one is now the least recently read
+    cache.get('BoxScore', {'game_id': 0})
+    cache.put('BoxScore', {'game_id': 3}, {'rows': list(range(300)), 'game_id': 3})
+
+    assert [cache.get('BoxScore', {'game_id': game_id}) is not None for game_id in range(4)] == [
+        True, False, True, True]
@@ -0,0 +1,52 @@
+import pytest
+
+from nba_playoff_stats_visualizer.result_sets import decode_result_set, result_set_names
+
+HEADERS = ['GAME_ID', 'GAME_DATE', 'PTS', 'MIN']
+ROWS = [['0042400301', '2025-05-20T00:00:00', 30, 40.5],
+        ['0042400302', '2025-05-22T00:00:00', None, None]]
+DTYPES = {'GAME_ID': str, 'GAME_DATE': 'datetime64[ns]', 'PTS': 'int32', 'MIN': 'float64'}
+
+
+def _payload(rows: list = ROWS) -> dict:
+    return {'resultSets': [{'name': 'Results', 'headers': HEADERS, 'rowSet': rows},
+                           {'name': 'Totals', 'headers': ['PTS'], 'rowSet': [[57]]}]}
+
+
+def test_columns_are_decoded_to_their_dtypes():
+    decoded = decode_result_set(_payload(), DTYPES)
+
+    assert list(decoded.columns) == list(DTYPES)
+    assert decoded['GAME_ID'].tolist() == ['0042400301', '0042400302']
+    assert decoded['GAME_DATE'].dtype == 'datetime64[ns]'
+    # A null count is 0, a null float stays missing
+    assert (decoded['PTS'].dtype, decoded['PTS'].tolist()) == ('int32', [30, 0])
+    assert decoded['MIN'].isna().tolist() == [False, True]
+
+
+def test_single_result_set_payloads_are_decoded():
+    payload = {'resultSet': {'name': 'Results', 'headers': HEADERS, 'rowSet': ROWS}}
+
+    assert result_set_names(payload) == ['Results']
+    assert decode_result_set(payload, {'PTS': 'int32'})['PTS'].tolist() == [30, 0]
+
+
+def test_result_sets_are_selected_by_name():
+    assert decode_result_set(_payload(), {'PTS': 'int32'}, name='Totals')['PTS'].tolist() == [57]
+    assert decode_result_set(_payload(), {'PTS': 'int32'}, name='Missing').empty
+
+
+def test_missing_headers_raise_key_error():
+    with pytest.raises(KeyError, match='REB'):
+        decode_result_set(_payload(), {'PTS': 'int32', 'REB': 'int32'})
+
+
+def test_an_empty_row_set_keeps_the_columns_and_dtypes():
+    decoded = decode_result_set(_payload(rows=[]), DTYPES)
+
+    assert decoded.empty
+    assert list(decoded.columns) == list(DTYPES)
+    assert (decoded['GAME_DATE'].dtype, decoded['PTS'].dtype, decoded['MIN'].dtype) == (
+        'datetime64[ns]', 'int32', 'float64')
+    # Without dtypes, every header as returned
+    assert list(decode_result_set(_payload(rows=[]))) == HEADERS
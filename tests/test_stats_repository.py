@@ -0,0 +1,86 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import event, insert
+
+from betting_odds.data_access.stats_repository import GAME_STATS_COLUMNS, StatsRepository
+from betting_odds.models.orm_models import GameStatsORM, PlayerORM
+from betting_odds.services.player_stats_service import PlayerStatsService
+
+# (player id, game date, matchup, points, minutes)
+GAMES = [
+    (1, date(2025, 5, 1), 'LVA vs. NYL', 20, 30),
+    (1, date(2025, 5, 3), 'LVA @ NYL', 25, None),
+    (1, date(2025, 5, 5), 'LVA @ CON', 18, 8),
+    (1, date(2025, 5, 7), 'LVA vs. CON', 30, 34),
+    (2, date(2025, 5, 3), 'NYL vs. LVA', 12, 25),
+]
+
+
+@pytest.fixture
+def stats_database(sqlite_database):
+    """Two players of the 2025 regular season, and a third one without games"""
+    with sqlite_database.engine.begin() as conn:
+        conn.execute(insert(PlayerORM), [{'player_id': 1, 'name': 'A', 'team': 'LVA'},
+                                         {'player_id': 2, 'name': 'B', 'team': 'NYL'},
+                                         {'player_id': 3, 'name': 'C', 'team': 'CON'}])
+        conn.execute(insert(GameStatsORM), [
+            {'player_id': player_id, 'game_id': f'g{index}', 'game_date': game_date, 'matchup': matchup,
+             'season': '2025', 'season_type': 'Regular Season', 'points': points, 'assists': 0, 'rebounds': 0,
+             'three_pointers_made': 0, 'minutes': minutes}
+            for index, (player_id, game_date, matchup, points, minutes) in enumerate(GAMES)])
+    return sqlite_database
+
+
+def _points(stats_df: pd.DataFrame) -> list:
+    return stats_df.sort_values(['player_name', 'game_date'])['points'].tolist()
+
+
+def _query(database, **filters) -> pd.DataFrame:
+    return StatsRepository(database).query_players_stats(['A', 'B'], '2025', 'Regular Season', **filters)
+
+
+def test_date_bounds_are_inclusive(stats_database):
+    assert _points(_query(stats_database, date_from=date(2025, 5, 3), date_to=date(2025, 5, 5))) == [25, 18, 12]
+    assert _points(_query(stats_database, date_from=date(2025, 5, 7))) == [30]
+
+
+def test_min_minutes_excludes_games_without_minutes(stats_database):
+    assert _points(_query(stats_database, min_minutes=10)) == [20, 30, 12]
+
+
+def test_is_away_splits_on_the_matchup(stats_database):
+    assert _points(_query(stats_database, is_away=True)) == [25, 18]
+    assert _points(_query(stats_database, is_away=False)) == [20, 30, 12]
+    assert _query(stats_database, is_away=True)['is_away'].all()
+
+
+def test_columns_have_typed_dtypes(stats_database):
+    for stats_df in (_query(stats_database), _query(stats_database, date_from=date(2026, 1, 1))):
+        assert list(stats_df.columns) == list(GAME_STATS_COLUMNS)
+        dtypes = stats_df.dtypes
+        assert dtypes['player_id'] == np.int64 and dtypes['points'] == np.int64
+        assert dtypes['minutes'] == np.float64
+        assert dtypes['is_away'] == bool
+        assert pd.api.types.is_datetime64_dtype(dtypes['game_date'])
+        assert all(isinstance(dtypes[name], pd.CategoricalDtype)
+                   for name in ('player_name', 'matchup', 'season', 'season_type', 'team_abbreviation'))
+        assert pd.api.types.is_string_dtype(dtypes['game_id'])
+    # Missing minutes are NaN
+    assert _query(stats_database)['minutes'].isna().sum() == 1
+
+
+def test_players_are_queried_once_and_split_in_memory(stats_database):
+    statements = []
+    event.listen(stats_database.engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    player_stats_by_name = PlayerStatsService(stats_database).query_player_stats(['A', 'B', 'C'], '2025',
+                                                                                  'Regular Season')
+
+    assert len(statements) == 1
+    assert {name: len(stats_df) for name, stats_df in player_stats_by_name.items()} == {'A': 4, 'B': 1, 'C': 0}
+    assert player_stats_by_name['C'].empty
+    assert set(player_stats_by_name['B']['team_abbreviation']) == {'NYL'}
@@ -0,0 +1,93 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from betting_odds.models.player_stats_summary import STAT_TYPES
+from betting_odds.services.backtest import BACKTEST_METRICS, BacktestData
+from betting_odds.services.threshold_optimizer import (
+    GRID_COLUMNS, evaluate_grid, select_thresholds, threshold_pairs, write_value_thresholds)
+
+
+def _grid_row(season: str, metric_type: str, bets: int, wins: int, profit: float, league: str = 'nba',
+              season_type: str = 'Playoffs') -> dict:
+    return {'league': league, 'season': season, 'season_type': season_type, 'metric_type': metric_type, 'threshold': 0.1,
+            'lower_threshold': 0.03, 'stat_type': 'points', 'bets': bets, 'wins': wins, 'pushes': 0,
+            'profit': profit}
+
+
+@pytest.fixture
+def grid_df() -> pd.DataFrame:
+    return pd.DataFrame([
+        # Best on the training seasons, poor on the held-out one
+        _grid_row('2022-23', 'Season Average', 100, 60, 15.0),
+        _grid_row('2023-24', 'Season Average', 100, 58, 10.0),
+        _grid_row('2024-25', 'Season Average', 50, 20, -10.0),
+        # Best on the held-out season only
+        _grid_row('2022-23', 'Season Median', 100, 50, -5.0),
+        _grid_row('2023-24', 'Season Median', 100, 50, -5.0),
+        _grid_row('2024-25', 'Season Median', 50, 35, 20.0),
+        # Too few training bets
+        _grid_row('2022-23', 'Last 5 Games Average', 5, 5, 4.0),
+        _grid_row('2024-25', 'Last 5 Games Average', 5, 5, 4.0),
+    ])
+
+
+def test_settings_are_chosen_on_earlier_seasons_and_measured_on_the_latest(grid_df):
+    chosen = select_thresholds(grid_df, min_bets=100).iloc[0]
+
+    assert chosen['metric_type'] == 'Season Average'
+    assert (chosen['train_bets'], chosen['train_roi']) == (200, pytest.approx(25 / 200))
+    assert chosen['holdout_season'] == '2024-25'
+    assert (chosen['bets'], chosen['hit_rate'], chosen['roi']) == (50, 0.4, -0.2)
+
+
+def test_leagues_with_a_single_season_are_not_tuned(grid_df):
+    wnba_df = pd.DataFrame([_grid_row('2025', 'Season Average', 200, 120, 30.0, league='wnba',
+                                      season_type='Regular Season')])
+
+    chosen_df = select_thresholds(pd.concat([grid_df, wnba_df]), min_bets=100)
+
+    assert list(chosen_df['league']) == ['nba']
+
+
+def test_leagues_mixing_season_types_are_rejected(grid_df):
+    # A regular season held out against playoff training seasons
+    regular_df = pd.DataFrame([_grid_row('2025-26', 'Season Average', 300, 150, 0.0, season_type='Regular Season')])
+
+    with pytest.raises(ValueError, match='single season type'):
+        select_thresholds(pd.concat([grid_df, regular_df]), min_bets=100)
+
+
+def test_written_config_reports_out_of_sample_results(grid_df, tmp_path):
+    path = tmp_path / 'value_thresholds.json'
+    path.write_text('{"wnba": {}}')
+    # Nothing flagged in the held-out season
+    grid_df = grid_df[~((grid_df['season'] == '2024-25') & (grid_df['metric_type'] == 'Season Average'))]
+
+    write_value_thresholds(select_thresholds(grid_df, min_bets=100), path)
+
+    config = json.loads(path.read_text())
+    assert config['wnba'] == {}
+    assert config['nba']['points'] == {
+        'metric_type': 'Season Average', 'threshold': 0.1, 'lower_threshold': 0.03,
+        'train_bets': 200, 'train_roi': 0.125, 'holdout_season': '2024-25', 'bets': 0, 'hit_rate': None, 'roi': None}
+
+
+def test_evaluate_grid_counts_the_flagged_bets():
+    # Two over lines against a baseline of 20: 17.5 is strong value and won, 19.5 is only positive at 2% and lost
+    data = BacktestData(lines=np.array([17.5, 19.5]), sides=np.array(['over', 'over']),
+                        stat_indices=np.array([0, 0]), profits=np.array([0.9, -1.0]),
+                        wins=np.array([True, False]), pushes=np.array([False, False]),
+                        baselines_by_metric={metric_type: np.array([20.0, 20.0]) for metric_type in BACKTEST_METRICS})
+
+    grid_df = evaluate_grid(data, threshold_pairs([0.1], [0.02, 0.03]))
+
+    assert list(grid_df.columns) == GRID_COLUMNS
+    assert len(grid_df) == len(BACKTEST_METRICS) * 2 * len(STAT_TYPES)
+    points = grid_df[(grid_df['stat_type'] == 'points') & (grid_df['metric_type'] == 'Season Average')]
+    assert points.set_index('lower_threshold')[['bets', 'wins', 'profit']].to_dict('index') == {
+        0.02: {'bets': 2, 'wins': 1, 'profit': pytest.approx(-0.1)},
+        0.03: {'bets': 1, 'wins': 1, 'profit': pytest.approx(0.9)},
+    }
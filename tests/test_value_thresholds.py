@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from betting_odds.models.matchup import Matchup
+from betting_odds.models.matchup_props import BestLineOdds, MatchupBestOdds
+from betting_odds.services.player_stats_service import PlayerStatsService
+from betting_odds.services.value_leaderboard import top_value_props
+from betting_odds.services.value_prop_indicator import (
+    NEUTRAL, STRONG_POSITIVE, ValueThresholds, get_value_thresholds, load_value_thresholds)
+
+START = datetime(2025, 5, 1, 23, tzinfo=timezone.utc)
+
+# Tuned on the season average: strong value from 2% below the baseline
+TUNED = {'points': ValueThresholds(threshold=0.02, lower_threshold=0.01, metric_type='Season Average')}
+
+
+def test_tuned_thresholds_only_apply_to_their_metric():
+    assert get_value_thresholds(TUNED, 'points', 'Season Average') is TUNED['points']
+    assert get_value_thresholds(TUNED, 'points', 'Season Median') == ValueThresholds()
+    assert get_value_thresholds(TUNED, 'rebounds', 'Season Average') == ValueThresholds()
+
+
+def test_load_value_thresholds_reads_one_league(tmp_path):
+    path = tmp_path / 'value_thresholds.json'
+    path.write_text('{"nba": {"points": {"metric_type": "Season Average", "threshold": 0.02,'
+                    ' "lower_threshold": 0.01, "bets": 120, "hit_rate": 0.55, "roi": 0.04}}}')
+
+    assert load_value_thresholds('nba', path) == TUNED
+    assert load_value_thresholds('wnba', path) == {}
+    assert load_value_thresholds('nba', tmp_path / 'missing.json') == {}
+
+
+@pytest.mark.parametrize('metric_type, direction', [('Season Average', STRONG_POSITIVE),
+                                                    ('Season Median', NEUTRAL)])
+def test_leaderboard_uses_tuned_thresholds_only_for_their_metric(metric_type, direction):
+    stats_df = pd.DataFrame({'player_name': 'A', 'player_id': 1, 'game_date': pd.date_range('2025-01-01', periods=10),
+                             'points': 20, 'rebounds': 5, 'assists': 5, 'three_pointers_made': 1})
+    stats_summary_by_name = PlayerStatsService(database=None).summarize_player_stats_frame(stats_df)
+    over = BestLineOdds(game_id='g1', player_name='A', prop_type='Points', line=19.5, over_under_bet='over',
+                        bookie='bet365', best_odds=1.9, job_start_time_utc=START)
+
+    value_props = top_value_props(
+        {'g1': Matchup(game_id='g1', commence_time_utc=START, derived_game_name='Away @ Home',
+                       home_team='Home', away_team='Away')},
+        {'g1': MatchupBestOdds(latest_update_time_utc=START, best_odds_by_player_name={'A': [over]})},
+        stats_summary_by_name, metric_type, top_k=5, value_thresholds_by_stat=TUNED)
+
+    assert [value_prop.direction for value_prop in value_props] == [direction]
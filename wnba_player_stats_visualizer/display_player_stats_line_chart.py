@@ -24,8 +24,9 @@ stats_repository = StatsRepository(database)
 
 @st.cache_data(ttl=3600)
 def get_cached_player_stats_for_line_chart(player_name: str, season_type: str):
-    """Get all player data for line chart"""
-    return stats_repository.query_all_player_stats(player_name, season_type)
+    """Get all player data for line chart, limited to games with significant minutes"""
+    return stats_repository.query_all_player_stats(
+        player_name, season_type, min_minutes=MIN_MINUTES)
 
 
 def display_player_stats(player_name: str, selected_stat: str, seasons: list, season_type: str):
@@ -45,14 +46,9 @@ def display_player_stats(player_name: str, selected_stat: str, seasons: list, se
             f"No data available for {player_name} in the selected seasons: {', '.join(seasons)}")
         return
 
-    # Filter for games with significant minutes
-    filtered_stats = player_stats_df[player_stats_df['minutes'] >= MIN_MINUTES]
-
-    # Sort by date to ensure proper ordering
-    filtered_stats = filtered_stats.sort_values('game_date')
-
-    # Determine if games are away based on matchup
-    filtered_stats['is_away'] = filtered_stats['matchup'].str.contains('@')
+    # Games below MIN_MINUTES are already excluded by the query;
+    # sort by date to ensure proper ordering (is_away comes from the database)
+    filtered_stats = player_stats_df.sort_values('game_date')
 
     # Create plotly figure
     fig = go.Figure()
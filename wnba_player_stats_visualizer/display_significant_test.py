@@ -39,11 +39,12 @@ stats_repository = StatsRepository(database)
 # Cache the player stats query to avoid repeated database calls
 @st.cache_data(ttl=3600 * 24)  # Cache for 24 hours
 def get_cached_player_stats_for_home_away_analysis(player_name: str, season: str, season_type: str):
-    """Get cached player stats from the database."""
+    """Get cached player stats from the database, limited to games with significant minutes."""
     return stats_repository.query_player_stats(
         player_name=player_name,
         season=season,
-        season_type=season_type
+        season_type=season_type,
+        min_minutes=MIN_MINUTES
     )
 
 
@@ -80,19 +81,12 @@ def _analyze_player_home_away(player_name: str, stat_name: str, season: str, sea
         season_type=season_type
     )
 
-    if player_stats_df.empty:
+    # Games below MIN_MINUTES are already excluded by the query
+    if len(player_stats_df) < MIN_GAMES:
         return {}
 
-    # Filter games by minutes played
-    filtered_stats = player_stats_df[player_stats_df['minutes'] >= MIN_MINUTES]
-
-    if len(filtered_stats) < MIN_GAMES:
-        return {}
-
-    filtered_stats['is_away'] = filtered_stats['matchup'].str.contains('@')
-
-    home_stats = filtered_stats[~filtered_stats['is_away']][stat_name].values
-    away_stats = filtered_stats[filtered_stats['is_away']][stat_name].values
+    home_stats = player_stats_df[~player_stats_df['is_away']][stat_name].values
+    away_stats = player_stats_df[player_stats_df['is_away']][stat_name].values
 
     # Perform t-test
     t_stat, p_value = stats.ttest_ind(home_stats, away_stats)
@@ -167,13 +161,10 @@ def display_significant_test(player_name: str, stat_name: str, season: str, seas
             season=season,
             season_type=season_type
         )
-        filtered_stats = player_stats_df[player_stats_df['minutes']
-                                         >= MIN_MINUTES]
-        filtered_stats['is_away'] = filtered_stats['matchup'].str.contains('@')
-        home_stats = filtered_stats[~filtered_stats['is_away']
-                                    ][stat_name].values
-        away_stats = filtered_stats[filtered_stats['is_away']
-                                    ][stat_name].values
+        home_stats = player_stats_df[~player_stats_df['is_away']
+                                     ][stat_name].values
+        away_stats = player_stats_df[player_stats_df['is_away']
+                                     ][stat_name].values
 
         # Calculate the area under the curve for probability
         def calculate_probability(kde, x_min, x_max):